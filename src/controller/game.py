@@ -7,9 +7,13 @@ from src.controller.game_saver import GameSaver
 from src.controller.gui_controller import GuiController
 from src.controller.timer_thread import TimerThread
 from src.model.board import Board
+from src.model.engine.bitboard import piece_index, square_of
+from src.model.engine.move import (QUIET, DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, CAPTURE, EN_PASSANT,
+                                   encode_move, is_promotion, move_coordinates, promotion_flags, promotion_piece_type)
 from src.model.enums.color import Color
 from src.model.players.alpha_beta_player import AlphaBeta
 from src.model.players.greedy_player import GreedyPlayer
+from src.model.players.parallel_alpha_beta import ParallelAlphaBeta
 from src.model.players.random_player import RandomPlayer
 from src.model.enums.game_result import GameResult
 from src.model.pieces.pawn import Pawn
@@ -27,7 +31,8 @@ def initialize_player(player_name: str, player_type: PlayerType, color: Color, b
     elif player_type == PlayerType.GREEDY:
         return GreedyPlayer(player_name, color, board, _time)
     elif player_type == PlayerType.MINIMAX_WITH_ALPHABETA:
-        return AlphaBeta(player_name, color, board, _time)
+        # Root moves are searched on every core
+        return ParallelAlphaBeta(player_name, color, board, _time)
     else:
         return AlphaBeta(player_name, color, board, _time)
 
@@ -69,6 +74,9 @@ class Game:
     def start_game(self) -> None:
         self._white_player.init_pieces()
         self._black_player.init_pieces()
+        for player in (self._white_player, self._black_player):
+            if isinstance(player, AlphaBeta):
+                player.new_game()
 
         if self.timer is not None:
             self.timer.start()
@@ -80,7 +88,7 @@ class Game:
 
         if isinstance(self._current_player, RandomPlayer) or isinstance(self._current_player, GreedyPlayer):
             move = self._current_player.choose_move(self._opponent_player)
-            self.make_move(move[0], move[1])
+            self.make_computer_move(move)
 
     def next_turn(self) -> None:
         self._current_player, self._opponent_player = self._opponent_player, self._current_player
@@ -101,7 +109,7 @@ class Game:
                 isinstance(self._current_player, AlphaBeta)):
             move = self._current_player.choose_move(self._opponent_player)
             if move is not None:
-                self.make_move(move[0], move[1])
+                self.make_computer_move(move)
             else:
                 print("No possible moves.")
                 self.end_game(GameResult.DRAW_BY_STALEMATE)
@@ -128,6 +136,9 @@ class Game:
         self.is_game_over = True
         if self.timer is not None:
             self.timer.stop()
+        for player in (self._white_player, self._black_player):
+            if isinstance(player, AlphaBeta):
+                player.close()
         self._update_board()
         self._update_gui()
         try:
@@ -193,12 +204,7 @@ class Game:
 
 
     def top_left_button_click(self) -> None:
-        opponent_attacked_fields = set()
-
-        self._opponent_player.update_pieces_attacked_fields(self._current_player.piece_coordinates)
-        for piece in self._opponent_player._pieces:
-            for field in piece._attacked_fields:
-                opponent_attacked_fields.add(field)
+        opponent_attacked_fields = self._opponent_player.attacked_fields
 
         self._gui_controller.update_board_coloring(None, opponent_attacked_fields,
                                                    None, None)
@@ -232,46 +238,58 @@ class Game:
                 self._current_player.selected_piece = None
                 self._update_gui()
 
-    def make_move(self, row: int, col: int):
+    def make_computer_move(self, move: int) -> None:
+        # Computer players return encoded moves, the promotion piece is part of the move
+        from_row, from_col, to_row, to_col = move_coordinates(move)
+        self._current_player.selected_piece = self._current_player.get_piece_at(from_row, from_col)
+        self.make_move(to_row, to_col, promotion_piece_type(move) if is_promotion(move) else None)
+
+    def make_move(self, row: int, col: int, promotion_type: Optional[PieceType] = None):
         # If next_snapshots isn't an empty list that means that we see a previous state, so it is invalid to make a move
         # Or if we'd like to permit the change than the next_snapshots has to be deleted. TODO: decide
         if self.game_saver.is_current_state():
-            self._make_move(row, col)
+            self._make_move(row, col, promotion_type)
             self._current_player.selected_piece = None
             self.next_turn()
         else:
             print("Invalid move. You can't make a move in the past.")
 
-    def _make_move(self, to_row: int, to_col: int) -> None:
+    def _make_move(self, to_row: int, to_col: int, promotion_type: Optional[PieceType] = None) -> None:
         if self._current_player.selected_piece is None:
             print("Error: No piece is selected.")
 
         from_row = self._current_player.selected_piece.row
         from_col = self._current_player.selected_piece.col
+        flags = CAPTURE if self._opponent_player.has_piece_at(to_row, to_col) else QUIET
 
         # Set is_en_passant field if the pawn moves two squares
         self._current_player.reset_en_passant()
         if isinstance(self._current_player.selected_piece, Pawn):
             if abs(from_row - to_row) == 2:
                 self._current_player.selected_piece.is_en_passant = True
+                flags = DOUBLE_PAWN_PUSH
                 # print("En passant is possible.")
 
         # Check if the move is a promotion
         if self.is_promotion(to_row):
-            if isinstance(self._current_player, RandomPlayer) or isinstance(self._current_player, GreedyPlayer):
-                piece_type = PieceType.QUEEN
+            if promotion_type is not None:
+                piece_type = promotion_type
             else:
                 piece_type: PieceType = self._gui_controller.get_type_from_promotion_dialog(self._current_player.color)
-            self._current_player.do_promotion(to_row, to_col, piece_type)
+            flags |= promotion_flags(piece_index(piece_type))
+            # The captured piece is removed first so the square is free in the position
             if self._opponent_player.has_piece_at(to_row, to_col):
                 self._opponent_player.remove_piece_at(to_row, to_col)
+            self._current_player.do_promotion(to_row, to_col, piece_type)
 
         # Check if the move is a castling
         elif self.is_castling(to_col):
+            flags = KING_CASTLE if to_col == 6 else QUEEN_CASTLE
             self._current_player.do_castling(to_row, to_col)
 
         # Check if the move is an en passant
         elif self.is_en_passant(to_row, to_col):
+            flags = EN_PASSANT
             self._current_player.do_en_passant(to_row, to_col)
             if self._current_player.color == Color.WHITE:
                 self._opponent_player.remove_piece_at(to_row + 1, to_col)
@@ -280,11 +298,11 @@ class Game:
 
         # Normal move
         else:
-            self._current_player.move_piece(to_row, to_col)
             if self._opponent_player is not None and self._opponent_player.has_piece_at(to_row, to_col):
                 self._opponent_player.remove_piece_at(to_row, to_col)
+            self._current_player.move_piece(to_row, to_col)
 
-        self._current_player.last_move = (from_row, from_col, to_row, to_col)
+        self._current_player.last_move = encode_move(square_of(from_row, from_col), square_of(to_row, to_col), flags)
         # self.step_history.add_step(self._current_player.selected_piece.type.name,
         #                            self._current_player.selected_piece.color.name,
         #                            from_row, from_col, to_row, to_col)
@@ -309,12 +327,11 @@ class Game:
         # self._update_gui()
 
     def _update_player(self) -> None:
-        self._current_player.update_pieces_attacked_fields(self._opponent_player.piece_coordinates)
-        self._opponent_player.update_pieces_attacked_fields(self._current_player.piece_coordinates)
+        self._board.position.update_state(self._current_player, self._opponent_player)
         self._current_player.update_pieces_possible_fields(self._opponent_player)
 
     def _update_board(self) -> None:
-        self._board.update_piece_board(self._current_player.pieces, self._opponent_player.pieces)
+        self._board.update_piece_board()
         if self._current_player.selected_piece is not None:
             self._board.update_coloring_board(self._current_player.selected_piece)
 
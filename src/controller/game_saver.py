@@ -1,3 +1,4 @@
+from array import array
 from typing import List, Dict
 
 from src.controller.memento import Memento
@@ -10,12 +11,18 @@ from src.model.players.player import Player
 from src.model.pieces.queen import Queen
 from src.model.pieces.rook import Rook
 
+# Piece classes indexed by the integer piece codes
+PIECE_CLASSES = (Pawn, Rook, Knight, Bishop, Queen, King)
+
 
 class GameSaver:
     def __init__(self) -> None:
         self._memento_list: List[Memento] = []
         self._memento_index = 0
-        self._hashed_states: Dict[str, int] = dict()
+        # Number of times every position (by Zobrist key) occurred
+        self._position_counts: Dict[int, int] = dict()
+        # Encoded moves (see engine/move.py) that led to the saved states
+        self._moves: array = array('H')
         self.is_threefold_repetition = False
 
     def is_current_state(self) -> bool:
@@ -28,18 +35,23 @@ class GameSaver:
         return len(self._memento_list) - 1
 
     def save_game(self, current_player, opponent) -> None:
+        # The state of the board position (side to move, castling, en passant) is part of the key
+        current_player.position.update_state(current_player, opponent)
         memento = Memento(current_player, opponent)
 
-        hashed_state = memento.get_hashed_state()
-        if hashed_state not in self._hashed_states:
-            self._hashed_states[hashed_state] = 1
-        else:
-            self._hashed_states[hashed_state] += 1
-            if self._hashed_states[hashed_state] == 3:
-                self.is_threefold_repetition = True
+        position_key = memento.position_key
+        self._position_counts[position_key] = self._position_counts.get(position_key, 0) + 1
+        if self._position_counts[position_key] == 3:
+            self.is_threefold_repetition = True
 
         self._memento_list.append(memento)
         self._memento_index = len(self._memento_list) - 1
+        if opponent.last_move is not None:
+            self._moves.append(opponent.last_move)
+
+    @property
+    def moves(self) -> array:
+        return self._moves
 
     def load_last_state(self, current_player: Player, opponent: Player):
         self._load_state(current_player, opponent, self._memento_list[-1])
@@ -55,28 +67,21 @@ class GameSaver:
             self._load_state(current_player, opponent, self._memento_list[self._memento_index])
 
     def _load_state(self, current_player: Player, opponent: Player, memento: Memento):
-        current_player.pieces.clear()
+        # Both players have to be cleared before the colors are swapped, the position stores pieces by color
+        current_player.clear_pieces()
+        opponent.clear_pieces()
         current_player.color = memento.current_player_color
         opponent.color = memento.opponent_color
-        opponent.pieces.clear()
-
-        for piece in memento.current_player_pieces:
-            row, col = piece["coordinates"]
-            color = piece["color"]
-            _type = piece["type"]
-            is_en_passant = piece.get("is_en_passant", False)
-            new_piece = self.create_piece(_type, color, row, col, is_en_passant)
-            new_piece.is_moved = piece["is_moved"]
-            current_player.add_piece(new_piece)
-
-        for piece in memento.opponent_pieces:
-            row, col = piece["coordinates"]
-            color = piece["color"]
-            _type = piece["type"]
-            is_en_passant = piece.get("is_en_passant", False)
-            new_piece = self.create_piece(_type, color, row, col, is_en_passant)
-            new_piece.is_moved = piece["is_moved"]
-            opponent.add_piece(new_piece)
+
+        for player, pieces_info in ((current_player, memento.current_player_pieces),
+                                    (opponent, memento.opponent_pieces)):
+            color = player.color
+            for square, piece_idx, is_moved, is_en_passant in pieces_info:
+                new_piece = PIECE_CLASSES[piece_idx](color, square >> 3, square & 7)
+                new_piece.is_moved = is_moved
+                if is_en_passant:
+                    new_piece.is_en_passant = True
+                player.add_piece(new_piece)
 
         opponent.last_move = memento.opponent_last_move
 
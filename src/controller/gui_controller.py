@@ -1,6 +1,7 @@
 from typing import Dict, List, Tuple, Set, Optional
 from src.controller.custom_types_for_type_hinting import ByteArray8x8, BoolArray8x8
 import numpy as np
+from src.model.engine.move import move_coordinates
 from src.model.enums.color import Color
 from src.model.enums.game_result import GameResult
 from src.model.enums.piece_type import PieceType
@@ -91,7 +92,7 @@ class GuiController:
 
     def update_board_coloring(self, piece_coordinate: Optional[Tuple[int, int]],
                               possible_fields: Optional[Set[Tuple[int, int]]],
-                              last_move: Optional[Tuple[int, int, int, int]],
+                              last_move: Optional[int],
                               checked_king_coordinates: Optional[Tuple[int, int]]) -> None:
 
         # Reset the square colors
@@ -105,7 +106,7 @@ class GuiController:
             self.update_square_color([color], [[row, col]])
 
         if last_move is not None:
-            from_row, from_col, to_row, to_col = last_move
+            from_row, from_col, to_row, to_col = move_coordinates(last_move)
             if (from_row + from_col) % 2 == 0:
                 color = GuiController.LIGHT_LM_COLOR
             else:
@@ -1,53 +1,25 @@
-import hashlib
-from typing import List, Dict, Any, Tuple
+from typing import Optional, Tuple
 
+from src.model.engine.bitboard import PAWN
 from src.model.enums.color import Color
-from src.model.pieces.pawn import Pawn
 from src.model.players.player import Player
 
+PieceInfo = Tuple[int, int, bool, bool]
+
 
 class Memento:
     def __init__(self, current_player: Player, opponent: Player) -> None:
-        self.current_player_pieces: List[Dict[str, Any]] = self._get_pieces_info(current_player)
-        self.opponent_pieces: List[Dict[str, Any]] = self._get_pieces_info(opponent)
+        self.current_player_pieces: Tuple[PieceInfo, ...] = self._get_pieces_info(current_player)
+        self.opponent_pieces: Tuple[PieceInfo, ...] = self._get_pieces_info(opponent)
         self.current_player_color: Color = current_player.color
         self.opponent_color: Color = opponent.color
-        self.opponent_last_move: Tuple[int, int, int, int] = opponent.last_move
-
-    def _get_pieces_info(self, player) -> List[Dict[str, Any]]:
-        pieces_info = []
-        for piece in player.pieces:
-            piece_info = {
-                'coordinates': piece.coordinates,
-                'type': piece.type,
-                'color': piece.color,
-                'is_moved': piece.is_moved
-            }
-            if isinstance(piece, Pawn):
-                piece_info['is_en_passant'] = piece.is_en_passant
-            pieces_info.append(piece_info)
-        return pieces_info
-
-    def get_hashed_state(self) -> str:
-        game_state = ''
-
-        # Add information about each piece to the game state string
-        for player_pieces in [self.current_player_pieces, self.opponent_pieces]:
-            for piece in player_pieces:
-                game_state += str(piece['coordinates'])
-                game_state += str(piece['type'])
-                game_state += str(piece['color'])
-                game_state += str(piece['is_moved'])
-                if 'is_en_passant' in piece:
-                    game_state += str(piece['is_en_passant'])
-
-        # Add information about the current player's color to the game state string
-        game_state += str(self.current_player_color)
-
-        # Add information about the opponent's last move to the game state string
-        game_state += str(self.opponent_last_move)
-
-        # Generate a hash of the game state string
-        game_state_hash = hashlib.sha256(game_state.encode()).hexdigest()
-
-        return game_state_hash
+        self.opponent_last_move: Optional[int] = opponent.last_move
+        # Zobrist key of the position, equal positions have equal keys (see engine/zobrist.py)
+        self.position_key: int = current_player.position.zobrist_key
+
+    @staticmethod
+    def _get_pieces_info(player) -> Tuple[PieceInfo, ...]:
+        # (square, piece code, is moved, is en passant) for every piece, the color is the player's color
+        return tuple((piece.square, piece.piece_index, piece.is_moved,
+                      piece.piece_index == PAWN and piece.is_en_passant)
+                     for piece in player.pieces)
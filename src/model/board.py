@@ -1,7 +1,7 @@
-from typing import List
-
 from src.controller.custom_types_for_type_hinting import ByteArray8x8, CharArray8x8
 import numpy as np
+from src.model.engine.bitboard import WHITE, SQUARE_COORDINATES, iter_squares
+from src.model.engine.position import Position
 from src.model.pieces.piece import Piece
 
 
@@ -14,9 +14,11 @@ class Board:
     def __init__(self) -> None:
         self._piece_board: ByteArray8x8 = np.zeros((8, 8), dtype=np.byte)
         self._coloring_board: CharArray8x8 = np.zeros((8, 8), dtype=np.str_)
+        self._position: Position = Position()
+        self._position.enable_attack_map()
 
     def update(self, current_player, opponent) -> None:
-        self.update_piece_board(current_player, opponent)
+        self.update_piece_board()
         self.update_coloring_board(current_player.selected_piece)
 
     def update_coloring_board(self, selected_piece: Piece) -> None:
@@ -29,14 +31,15 @@ class Board:
                 for move in possible_moves:
                     self._coloring_board[move[0], move[1]] = self.NORMAL_MOVE_SYMBOL
 
-    def update_piece_board(self, current_player_pieces: List[Piece], opponent_pieces: List[Piece]) -> None:
+    def update_piece_board(self) -> None:
         self._piece_board.fill(0)
         # Update the board with the current piece positions
-        for piece in current_player_pieces:
-            self._piece_board[piece.row][piece.col] = piece.type.value * piece.color.value
-
-        for piece in opponent_pieces:
-            self._piece_board[piece.row][piece.col] = piece.type.value * piece.color.value
+        for color_idx in range(2):
+            sign = 1 if color_idx == WHITE else -1
+            for piece_idx in range(6):
+                for square in iter_squares(self._position.bitboard(color_idx, piece_idx)):
+                    row, col = SQUARE_COORDINATES[square]
+                    self._piece_board[row][col] = (piece_idx + 1) * sign
 
     def is_normal_move_at(self, row: int, col: int) -> bool:
         return self._coloring_board[row, col] == self.NORMAL_MOVE_SYMBOL
@@ -50,6 +53,10 @@ class Board:
     def get_piece_board(self) -> ByteArray8x8:
         return self._piece_board
 
+    @property
+    def position(self) -> Position:
+        return self._position
+
     def is_selected_piece_at(self, row: int, col: int) -> bool:
         return self._coloring_board[row, col] == self.SELECTED_PIECE_SYMBOL
 
@@ -0,0 +1,131 @@
+from typing import List
+
+from src.model.engine.attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+from src.model.engine.bitboard import (EMPTY_BOARD, SQUARE_BITS, NO_PIECE, PAWN, ROOK, KNIGHT, BISHOP, QUEEN,
+                                       KING)
+from src.model.engine.magic_bitboards import rook_attacks, bishop_attacks
+
+
+class AttackMap:
+    # Attacked squares of both sides (including squares of defended own pieces) and the number of attackers
+    # on every square, kept up to date while pieces are put, removed and moved on the position.
+    # A change on a square only affects the piece standing there and the sliders whose rays reach that square.
+
+    def __init__(self, position) -> None:
+        self._position = position
+        self._attack_counts: List[List[int]] = [[0] * 64, [0] * 64]
+        self._attacked: List[int] = [EMPTY_BOARD, EMPTY_BOARD]
+        # Piece code (color * 6 + piece) and attack bitboard of the piece standing on every square
+        self._piece_on: List[int] = [NO_PIECE] * 64
+        self._piece_attacks: List[int] = [EMPTY_BOARD] * 64
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self._attack_counts = [[0] * 64, [0] * 64]
+        self._attacked = [EMPTY_BOARD, EMPTY_BOARD]
+        self._piece_on = [NO_PIECE] * 64
+        self._piece_attacks = [EMPTY_BOARD] * 64
+        bitboards = self._position.bitboards
+        for code in range(12):
+            bitboard = bitboards[code]
+            while bitboard:
+                bit = bitboard & -bitboard
+                bitboard ^= bit
+                self._piece_on[bit.bit_length() - 1] = code
+        occupancy = self._position.all_occupancy
+        for square in range(64):
+            if self._piece_on[square] != NO_PIECE:
+                self._set_piece_attacks(square, self._attacks_of(self._piece_on[square], square, occupancy))
+
+    def on_put(self, color_idx: int, piece_idx: int, square: int) -> None:
+        code = color_idx * 6 + piece_idx
+        occupancy = self._position.all_occupancy
+        self._piece_on[square] = code
+        self._set_piece_attacks(square, self._attacks_of(code, square, occupancy))
+        self._refresh_sliders(square, occupancy)
+
+    def on_remove(self, square: int) -> None:
+        self._set_piece_attacks(square, EMPTY_BOARD)
+        self._piece_on[square] = NO_PIECE
+        self._refresh_sliders(square, self._position.all_occupancy)
+
+    def on_move(self, from_square: int, to_square: int) -> None:
+        code = self._piece_on[from_square]
+        occupancy = self._position.all_occupancy
+        self._set_piece_attacks(from_square, EMPTY_BOARD)
+        self._piece_on[from_square] = NO_PIECE
+        self._piece_on[to_square] = code
+        self._set_piece_attacks(to_square, self._attacks_of(code, to_square, occupancy))
+        self._refresh_sliders(from_square, occupancy)
+        self._refresh_sliders(to_square, occupancy)
+
+    def _refresh_sliders(self, square: int, occupancy: int) -> None:
+        # The first piece on every ray from the square is the only one that can see it
+        bitboards = self._position.bitboards
+        queens = bitboards[QUEEN] | bitboards[6 + QUEEN]
+        sliders = ((rook_attacks(square, occupancy) & (bitboards[ROOK] | bitboards[6 + ROOK] | queens)) |
+                   (bishop_attacks(square, occupancy) & (bitboards[BISHOP] | bitboards[6 + BISHOP] | queens)))
+        while sliders:
+            bit = sliders & -sliders
+            sliders ^= bit
+            slider_square = bit.bit_length() - 1
+            self._set_piece_attacks(slider_square,
+                                    self._attacks_of(self._piece_on[slider_square], slider_square, occupancy))
+
+    def _set_piece_attacks(self, square: int, attacks: int) -> None:
+        old_attacks = self._piece_attacks[square]
+        if old_attacks == attacks:
+            return
+        color_idx = self._piece_on[square] // 6
+        counts = self._attack_counts[color_idx]
+        attacked = self._attacked[color_idx]
+
+        removed = old_attacks & ~attacks
+        while removed:
+            bit = removed & -removed
+            removed ^= bit
+            target = bit.bit_length() - 1
+            counts[target] -= 1
+            if counts[target] == 0:
+                attacked ^= bit
+
+        added = attacks & ~old_attacks
+        while added:
+            bit = added & -added
+            added ^= bit
+            target = bit.bit_length() - 1
+            if counts[target] == 0:
+                attacked |= bit
+            counts[target] += 1
+
+        self._attacked[color_idx] = attacked
+        self._piece_attacks[square] = attacks
+
+    @staticmethod
+    def _attacks_of(code: int, square: int, occupancy: int) -> int:
+        color_idx, piece_idx = divmod(code, 6)
+        if piece_idx == PAWN:
+            return PAWN_ATTACKS[color_idx][square]
+        elif piece_idx == KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        elif piece_idx == BISHOP:
+            return bishop_attacks(square, occupancy)
+        elif piece_idx == ROOK:
+            return rook_attacks(square, occupancy)
+        elif piece_idx == QUEEN:
+            return rook_attacks(square, occupancy) | bishop_attacks(square, occupancy)
+        elif piece_idx == KING:
+            return KING_ATTACKS[square]
+        return EMPTY_BOARD
+
+    def attacked(self, color_idx: int) -> int:
+        return self._attacked[color_idx]
+
+    def attack_count(self, color_idx: int, square: int) -> int:
+        return self._attack_counts[color_idx][square]
+
+    def piece_attacks(self, square: int) -> int:
+        return self._piece_attacks[square]
+
+    def is_attacked(self, color_idx: int, square: int) -> bool:
+        return bool(self._attacked[color_idx] & SQUARE_BITS[square])
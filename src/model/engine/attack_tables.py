@@ -0,0 +1,49 @@
+from typing import Tuple
+
+from src.model.engine.bitboard import (SQUARE_BITS, SQUARE_COORDINATES, WHITE, BLACK, EMPTY_BOARD,
+                                       QUEEN_DIRECTIONS, knight_attacks, king_attacks, pawn_attacks)
+
+# The squares reachable by a knight, a king or a capturing pawn never depend on the other pieces,
+# so they are computed once for every square when the module is imported.
+KNIGHT_ATTACKS: Tuple[int, ...] = tuple(knight_attacks(SQUARE_BITS[square]) for square in range(64))
+KING_ATTACKS: Tuple[int, ...] = tuple(king_attacks(SQUARE_BITS[square]) for square in range(64))
+
+# PAWN_ATTACKS[color_idx][square]
+PAWN_ATTACKS: Tuple[Tuple[int, ...], Tuple[int, ...]] = (
+    tuple(pawn_attacks(SQUARE_BITS[square], WHITE) for square in range(64)),
+    tuple(pawn_attacks(SQUARE_BITS[square], BLACK) for square in range(64)),
+)
+
+
+def _line_tables() -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    between = [[EMPTY_BOARD] * 64 for _ in range(64)]
+    line = [[EMPTY_BOARD] * 64 for _ in range(64)]
+    for square in range(64):
+        row, col = SQUARE_COORDINATES[square]
+        for row_step, col_step in QUEEN_DIRECTIONS:
+            # The whole line through the square in this direction, both ways
+            full_line = SQUARE_BITS[square]
+            for sign in (1, -1):
+                to_row = row + sign * row_step
+                to_col = col + sign * col_step
+                while 0 <= to_row <= 7 and 0 <= to_col <= 7:
+                    full_line |= SQUARE_BITS[to_row * 8 + to_col]
+                    to_row += sign * row_step
+                    to_col += sign * col_step
+
+            passed = EMPTY_BOARD
+            to_row = row + row_step
+            to_col = col + col_step
+            while 0 <= to_row <= 7 and 0 <= to_col <= 7:
+                to_square = to_row * 8 + to_col
+                between[square][to_square] = passed
+                line[square][to_square] = full_line
+                passed |= SQUARE_BITS[to_square]
+                to_row += row_step
+                to_col += col_step
+    return tuple(tuple(row) for row in between), tuple(tuple(row) for row in line)
+
+
+# BETWEEN[a][b]: the squares strictly between two aligned squares, LINE[a][b]: the whole line through them.
+# Both are empty if the squares are not on a common rank, file or diagonal.
+BETWEEN, LINE = _line_tables()
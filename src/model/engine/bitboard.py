@@ -0,0 +1,157 @@
+from typing import Iterator, Set, Tuple
+
+from src.model.enums.color import Color
+from src.model.enums.piece_type import PieceType
+
+# A bitboard is a 64-bit integer where bit n is set if square n is occupied.
+# Squares are numbered in the same order as the (row, col) grid of the board:
+#
+#     square = row * 8 + col
+#
+# so square 0 is A8 (top left, black's side) and square 63 is H1 (bottom right, white's side).
+# White pawns move towards lower square numbers, black pawns towards higher ones.
+
+EMPTY_BOARD = 0
+FULL_BOARD = 0xFFFF_FFFF_FFFF_FFFF
+
+FILE_A = 0x0101_0101_0101_0101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+
+NOT_FILE_A = FULL_BOARD ^ FILE_A
+NOT_FILE_H = FULL_BOARD ^ FILE_H
+NOT_FILE_AB = FULL_BOARD ^ (FILE_A | FILE_B)
+NOT_FILE_GH = FULL_BOARD ^ (FILE_G | FILE_H)
+
+# Row 0 is the 8th rank, row 7 is the 1st rank
+ROW_0 = 0xFF
+ROW_1 = ROW_0 << 8
+ROW_2 = ROW_0 << 16
+ROW_5 = ROW_0 << 40
+ROW_6 = ROW_0 << 48
+ROW_7 = ROW_0 << 56
+
+NO_SQUARE = -1
+
+# Integer color codes used by the position core
+WHITE = 0
+BLACK = 1
+
+# Integer piece codes used by the position core, ordered like the PieceType values
+PAWN = 0
+ROOK = 1
+KNIGHT = 2
+BISHOP = 3
+QUEEN = 4
+KING = 5
+NO_PIECE = -1
+
+# Same values as Piece.value, indexed by the integer piece codes
+PIECE_VALUES = (1, 5, 3, 3, 9, 100)
+
+SQUARE_BITS: Tuple[int, ...] = tuple(1 << square for square in range(64))
+SQUARE_COORDINATES: Tuple[Tuple[int, int], ...] = tuple(divmod(square, 8) for square in range(64))
+
+
+def square_of(row: int, col: int) -> int:
+    return row * 8 + col
+
+
+def coordinates_of(square: int) -> Tuple[int, int]:
+    return SQUARE_COORDINATES[square]
+
+
+def color_index(color: Color) -> int:
+    return WHITE if color == Color.WHITE else BLACK
+
+
+def piece_index(piece_type: PieceType) -> int:
+    return piece_type.value - 1
+
+
+def bitboard_index(color_idx: int, piece_idx: int) -> int:
+    return color_idx * 6 + piece_idx
+
+
+def popcount(bitboard: int) -> int:
+    return bitboard.bit_count()
+
+
+def lsb(bitboard: int) -> int:
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def iter_squares(bitboard: int) -> Iterator[int]:
+    while bitboard:
+        low_bit = bitboard & -bitboard
+        yield low_bit.bit_length() - 1
+        bitboard ^= low_bit
+
+
+def coordinates_set(bitboard: int) -> Set[Tuple[int, int]]:
+    return {SQUARE_COORDINATES[square] for square in iter_squares(bitboard)}
+
+
+def bitboard_of(coordinates: Set[Tuple[int, int]]) -> int:
+    bitboard = EMPTY_BOARD
+    for row, col in coordinates:
+        bitboard |= SQUARE_BITS[row * 8 + col]
+    return bitboard
+
+
+# Shifts move every set bit one step in the given direction, dropping bits that would wrap around the board
+def shift_north(bitboard: int) -> int:
+    return bitboard >> 8
+
+
+def shift_south(bitboard: int) -> int:
+    return (bitboard << 8) & FULL_BOARD
+
+
+def shift_east(bitboard: int) -> int:
+    return (bitboard << 1) & NOT_FILE_A & FULL_BOARD
+
+
+def shift_west(bitboard: int) -> int:
+    return (bitboard >> 1) & NOT_FILE_H
+
+
+def knight_attacks(bitboard: int) -> int:
+    return ((((bitboard >> 17) | (bitboard << 15)) & NOT_FILE_H) |
+            (((bitboard >> 15) | (bitboard << 17)) & NOT_FILE_A) |
+            (((bitboard >> 10) | (bitboard << 6)) & NOT_FILE_GH) |
+            (((bitboard >> 6) | (bitboard << 10)) & NOT_FILE_AB)) & FULL_BOARD
+
+
+def king_attacks(bitboard: int) -> int:
+    row_neighbours = bitboard | shift_east(bitboard) | shift_west(bitboard)
+    return (row_neighbours | shift_north(row_neighbours) | shift_south(row_neighbours)) ^ bitboard
+
+
+def pawn_attacks(bitboard: int, color_idx: int) -> int:
+    forward = shift_north(bitboard) if color_idx == WHITE else shift_south(bitboard)
+    return shift_east(forward) | shift_west(forward)
+
+
+#                     (row, col)
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def ray_attacks(square: int, occupancy: int, directions: Tuple[Tuple[int, int], ...]) -> int:
+    # Walks each ray until the first occupied square, which is included in the result
+    attacks = EMPTY_BOARD
+    row, col = SQUARE_COORDINATES[square]
+    for row_step, col_step in directions:
+        to_row = row + row_step
+        to_col = col + col_step
+        while 0 <= to_row <= 7 and 0 <= to_col <= 7:
+            bit = SQUARE_BITS[to_row * 8 + to_col]
+            attacks |= bit
+            if occupancy & bit:
+                break
+            to_row += row_step
+            to_col += col_step
+    return attacks
@@ -0,0 +1,171 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.model.engine.bitboard import WHITE, BLACK, PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING, iter_squares, lsb
+from src.model.engine.pawn_structure import PawnTable, evaluate_pawns, pawn_shield
+
+# Tapered evaluation: material and piece-square tables, one set for the middlegame and one for the endgame. The
+# score is a blend of the two by the game phase, the non-pawn material left on the board:
+#
+#     score = (middlegame * phase + endgame * (MAX_PHASE - phase)) / MAX_PHASE
+#
+# Scores are in centipawns from the point of view of white. The position keeps the middlegame and endgame sums and
+# the phase up to date as pieces are put, removed and moved (see Position.put_piece), so they cost nothing to read.
+# compute_scores() sums them from scratch, like compute_key() does for the Zobrist key. The pawn structure terms
+# are added on top, cached by the pawn table (see pawn_structure.py).
+#
+# The tables are written from the point of view of white with a8 first, the square indexing of the bitboards, and
+# mirrored vertically for black.
+
+# Indexed by piece type: PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING
+MIDDLEGAME_VALUES = (82, 477, 337, 365, 1025, 0)
+ENDGAME_VALUES = (94, 512, 281, 297, 936, 0)
+# The most a piece is worth in any phase, for the margins of the search
+PIECE_SCORES = tuple(max(middlegame, endgame) for middlegame, endgame in zip(MIDDLEGAME_VALUES, ENDGAME_VALUES))
+
+# Phase contribution of every piece type, all pieces of the start position add up to MAX_PHASE. Promotions can
+# push the sum above it, the phase is capped.
+PHASE_WEIGHTS = (0, 2, 1, 1, 4, 0)
+MAX_PHASE = 24
+
+_PAWN = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_PAWN_ENDGAME = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_ROOK = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_QUEEN = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+# Behind the pawn shield in the middlegame, in the center in the endgame
+_KING = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+_KING_ENDGAME = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+# Piece-square bonuses by piece type, the minor and heavy pieces use the same table in both phases
+MIDDLEGAME_PST = np.array((_PAWN, _ROOK, _KNIGHT, _BISHOP, _QUEEN, _KING), dtype=np.int32)
+ENDGAME_PST = np.array((_PAWN_ENDGAME, _ROOK, _KNIGHT, _BISHOP, _QUEEN, _KING_ENDGAME), dtype=np.int32)
+
+
+def _signed_tables(values: Tuple[int, ...], pst: np.ndarray) -> np.ndarray:
+    # Value plus bonus of every piece code (color * 6 + piece) on every square, negative for black
+    white = pst + np.array(values, dtype=np.int32)[:, np.newaxis]
+    # Row r of black is row 7 - r of white
+    black = -white.reshape(6, 8, 8)[:, ::-1, :].reshape(6, 64)
+    return np.concatenate((white, black))
+
+
+MIDDLEGAME_TABLE = _signed_tables(MIDDLEGAME_VALUES, MIDDLEGAME_PST)
+ENDGAME_TABLE = _signed_tables(ENDGAME_VALUES, ENDGAME_PST)
+PHASE_TABLE = np.array(PHASE_WEIGHTS * 2, dtype=np.int32)
+
+# Python lists of the same tables for the incremental updates, indexing a NumPy array one element at a time is
+# several times slower than indexing a list
+MIDDLEGAME_SCORES = MIDDLEGAME_TABLE.tolist()
+ENDGAME_SCORES = ENDGAME_TABLE.tolist()
+PHASES = PHASE_TABLE.tolist()
+
+
+def taper(middlegame: int, endgame: int, phase: int) -> int:
+    phase = min(phase, MAX_PHASE)
+    score = middlegame * phase + endgame * (MAX_PHASE - phase)
+    # Rounded towards zero, floor division would favour black and a position and its mirror image would not score
+    # exactly opposite
+    return score // MAX_PHASE if score >= 0 else -(-score // MAX_PHASE)
+
+
+def compute_scores(position) -> Tuple[int, int, int]:
+    # (middlegame, endgame, phase) of the position, summed from scratch over its bitboards
+    middlegame = endgame = phase = 0
+    for color_idx in (WHITE, BLACK):
+        for piece_idx in (PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING):
+            code = color_idx * 6 + piece_idx
+            squares = list(iter_squares(position.bitboard(color_idx, piece_idx)))
+            if squares:
+                middlegame += int(MIDDLEGAME_TABLE[code, squares].sum())
+                endgame += int(ENDGAME_TABLE[code, squares].sum())
+                phase += PHASE_WEIGHTS[piece_idx] * len(squares)
+    return middlegame, endgame, phase
+
+
+def evaluate(position, pawn_table: Optional[PawnTable] = None) -> int:
+    # Centipawns, positive if white is better. Without a pawn table the pawn structure is evaluated every time.
+    white_pawns = position.bitboard(WHITE, PAWN)
+    black_pawns = position.bitboard(BLACK, PAWN)
+    if pawn_table is None:
+        pawn_middlegame, pawn_endgame = evaluate_pawns(white_pawns, black_pawns)
+    else:
+        pawn_middlegame, pawn_endgame = pawn_table.evaluate(position.pawn_key, white_pawns, black_pawns)
+    shield = pawn_shield(white_pawns, black_pawns, lsb(position.bitboard(WHITE, KING)),
+                         lsb(position.bitboard(BLACK, KING)))
+    return taper(position.middlegame_score + pawn_middlegame + shield, position.endgame_score + pawn_endgame,
+                 position.phase)
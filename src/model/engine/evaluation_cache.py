@@ -0,0 +1,61 @@
+from array import array
+from typing import Optional
+
+# Evaluation cache: static evaluations by Zobrist key (see zobrist.py). The same leaves are evaluated again and
+# again, by the quiescence search, by transpositions the transposition table did not keep and by every iteration
+# of iterative deepening.
+#
+# The cache is direct-mapped, every key has exactly one slot selected by its low bits, and a new evaluation always
+# replaces the old one. Keys and scores are kept in two preallocated arrays.
+
+# Bytes of one entry, the key and the score
+ENTRY_BYTES = 8 + 4
+
+
+class EvaluationCache:
+
+    def __init__(self, size_mb: int = 2) -> None:
+        # The number of entries is a power of two, the slot of a key is selected by its low bits
+        entry_count = 1
+        while entry_count * 2 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            entry_count *= 2
+        self._mask = entry_count - 1
+        self._keys = array('Q', bytes(entry_count * 8))
+        self._scores = array('i', bytes(entry_count * 4))
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entry_count(self) -> int:
+        return self._mask + 1
+
+    @property
+    def size_bytes(self) -> int:
+        return self.entry_count * ENTRY_BYTES
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def probe(self, key: int) -> Optional[int]:
+        index = key & self._mask
+        if self._keys[index] == key:
+            self.hits += 1
+            return self._scores[index]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, score: int) -> None:
+        index = key & self._mask
+        self._keys[index] = key
+        self._scores[index] = score
+
+    def clear(self) -> None:
+        # The evaluation of a position does not change during a game, the cache is only cleared between games
+        self._keys[:] = array('Q', bytes(self.entry_count * 8))
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,99 @@
+from array import array
+from typing import Tuple
+
+from src.model.engine.bitboard import KNIGHT, BISHOP, ROOK, QUEEN, SQUARE_COORDINATES
+from src.model.enums.piece_type import PieceType
+
+# A move is packed into 16 bits so it fits into an unsigned short (array('H')):
+#
+#     bits  0-5   from square
+#     bits  6-11  to square
+#     bits 12-15  flags
+#
+# Flags (the capture bit is set for en passant and capturing promotions too):
+#
+#     0000 quiet move                 1000 promotion to knight
+#     0001 double pawn push           1001 promotion to bishop
+#     0010 king side castling         1010 promotion to rook
+#     0011 queen side castling        1011 promotion to queen
+#     0100 capture                    1100-1111 capturing promotions
+#     0101 en passant capture
+
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8
+
+# A8 to A8 is never a legal move, so zero can mark a missing move in move tables
+NULL_MOVE = 0
+
+FILES = "abcdefgh"
+
+# Promotion piece codes in the order of the two lowest flag bits
+PROMOTION_PIECES = (KNIGHT, BISHOP, ROOK, QUEEN)
+
+
+def encode_move(from_square: int, to_square: int, flags: int = QUIET) -> int:
+    return from_square | (to_square << 6) | (flags << 12)
+
+
+def move_from(move: int) -> int:
+    return move & 63
+
+
+def move_to(move: int) -> int:
+    return (move >> 6) & 63
+
+
+def move_flags(move: int) -> int:
+    return move >> 12
+
+
+def is_capture(move: int) -> bool:
+    return bool(move & (CAPTURE << 12))
+
+
+def is_promotion(move: int) -> bool:
+    return bool(move & (PROMOTION << 12))
+
+
+def is_castling(move: int) -> bool:
+    return (move >> 12) in (KING_CASTLE, QUEEN_CASTLE)
+
+
+def is_en_passant(move: int) -> bool:
+    return (move >> 12) == EN_PASSANT
+
+
+def promotion_piece(move: int) -> int:
+    return PROMOTION_PIECES[(move >> 12) & 3]
+
+
+def promotion_flags(piece_idx: int) -> int:
+    return PROMOTION | PROMOTION_PIECES.index(piece_idx)
+
+
+def promotion_piece_type(move: int) -> PieceType:
+    return PieceType(promotion_piece(move) + 1)
+
+
+def move_coordinates(move: int) -> Tuple[int, int, int, int]:
+    from_row, from_col = SQUARE_COORDINATES[move & 63]
+    to_row, to_col = SQUARE_COORDINATES[(move >> 6) & 63]
+    return from_row, from_col, to_row, to_col
+
+
+def move_to_uci(move: int) -> str:
+    # Long algebraic notation, e.g. e2e4 or e7e8q
+    from_row, from_col, to_row, to_col = move_coordinates(move)
+    uci = f"{FILES[from_col]}{8 - from_row}{FILES[to_col]}{8 - to_row}"
+    if is_promotion(move):
+        uci += "nbrq"[(move >> 12) & 3]
+    return uci
+
+
+def new_move_list() -> array:
+    return array('H')
@@ -0,0 +1,459 @@
+from array import array
+
+from src.model.engine.attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, LINE
+from src.model.engine.bitboard import (SQUARE_BITS, FULL_BOARD, EMPTY_BOARD, NOT_FILE_A, NOT_FILE_H, ROW_2, ROW_5,
+                                       NO_SQUARE, NO_PIECE, WHITE, PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING,
+                                       iter_squares)
+from src.model.engine.magic_bitboards import rook_attacks, bishop_attacks
+from src.model.engine.move import (QUIET, DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, CAPTURE, EN_PASSANT,
+                                   PROMOTION, NULL_MOVE)
+from src.model.engine.position import (Position, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE,
+                                       BLACK_QUEENSIDE, PROMOTION_ROWS)
+
+# (castling right, king from, encoded move, squares that have to be empty,
+#  squares the king passes that must not be attacked)
+CASTLING_MOVES = (
+    (WHITE_KINGSIDE, 60, 60 | 62 << 6 | KING_CASTLE << 12,
+     SQUARE_BITS[61] | SQUARE_BITS[62], SQUARE_BITS[61] | SQUARE_BITS[62]),
+    (WHITE_QUEENSIDE, 60, 60 | 58 << 6 | QUEEN_CASTLE << 12,
+     SQUARE_BITS[57] | SQUARE_BITS[58] | SQUARE_BITS[59], SQUARE_BITS[59] | SQUARE_BITS[58]),
+    (BLACK_KINGSIDE, 4, 4 | 6 << 6 | KING_CASTLE << 12,
+     SQUARE_BITS[5] | SQUARE_BITS[6], SQUARE_BITS[5] | SQUARE_BITS[6]),
+    (BLACK_QUEENSIDE, 4, 4 | 2 << 6 | QUEEN_CASTLE << 12,
+     SQUARE_BITS[1] | SQUARE_BITS[2] | SQUARE_BITS[3], SQUARE_BITS[3] | SQUARE_BITS[2]),
+)
+
+CAPTURE_FLAG = CAPTURE << 12
+# Queen first, so the most likely promotion is tried first by a search
+PROMOTION_FLAGS = tuple((PROMOTION | index) << 12 for index in (3, 0, 2, 1))
+
+
+def attackers_to(position: Position, square: int, by_color: int, occupancy: int) -> int:
+    bitboards = position.bitboards
+    base = by_color * 6
+    queens = bitboards[base + QUEEN]
+    return ((PAWN_ATTACKS[by_color ^ 1][square] & bitboards[base + PAWN]) |
+            (KNIGHT_ATTACKS[square] & bitboards[base + KNIGHT]) |
+            (KING_ATTACKS[square] & bitboards[base + KING]) |
+            (rook_attacks(square, occupancy) & (bitboards[base + ROOK] | queens)) |
+            (bishop_attacks(square, occupancy) & (bitboards[base + BISHOP] | queens)))
+
+
+def is_square_attacked(position: Position, square: int, by_color: int) -> bool:
+    attack_map = position.attack_map
+    if attack_map is not None:
+        return attack_map.is_attacked(by_color, square)
+    return attackers_to(position, square, by_color, position.all_occupancy) != EMPTY_BOARD
+
+
+def checkers_of(position: Position, color_idx: int) -> int:
+    return attackers_to(position, position.king_square(color_idx), color_idx ^ 1, position.all_occupancy)
+
+
+def is_in_check(position: Position, color_idx: int) -> bool:
+    return checkers_of(position, color_idx) != EMPTY_BOARD
+
+
+def pinned_pieces(position: Position, color_idx: int) -> int:
+    # A piece is pinned if it is the only piece between its king and an enemy slider on the same line
+    bitboards = position.bitboards
+    them = color_idx ^ 1
+    king_square = position.king_square(color_idx)
+    own = position.occupancy(color_idx)
+    opponent = position.occupancy(them)
+    queens = bitboards[them * 6 + QUEEN]
+
+    # Sliders attacking the king with only the enemy pieces as blockers, i.e. seeing through own pieces
+    snipers = ((rook_attacks(king_square, opponent) & (bitboards[them * 6 + ROOK] | queens)) |
+               (bishop_attacks(king_square, opponent) & (bitboards[them * 6 + BISHOP] | queens)))
+    pinned = EMPTY_BOARD
+    while snipers:
+        sniper_bit = snipers & -snipers
+        snipers ^= sniper_bit
+        blockers = BETWEEN[king_square][sniper_bit.bit_length() - 1] & own
+        if blockers and not blockers & (blockers - 1):
+            pinned |= blockers
+    return pinned
+
+
+def _append_pawn_move(moves: array, from_square: int, to_square: int, flags: int) -> None:
+    move = from_square | to_square << 6 | flags
+    if SQUARE_BITS[to_square] & PROMOTION_ROWS:
+        for promotion_flags in PROMOTION_FLAGS:
+            moves.append(move | promotion_flags)
+    else:
+        moves.append(move)
+
+
+def generate_legal_moves(position: Position, color_idx: int = None) -> array:
+    # Checkers and pinned pieces are computed once, then every pseudo-legal move is filtered with masks.
+    # Only king moves and en passant need an explicit attack test.
+    # Moves are encoded as 16-bit integers, see move.py
+    if color_idx is None:
+        color_idx = position.side_to_move
+    them = color_idx ^ 1
+    bitboards = position.bitboards
+    base = color_idx * 6
+    own = position.occupancy(color_idx)
+    opponent = position.occupancy(them)
+    occupancy = own | opponent
+    empty = FULL_BOARD ^ occupancy
+    king_square = position.king_square(color_idx)
+    king_bit = SQUARE_BITS[king_square]
+    moves = array('H')
+
+    # King moves, the king itself is removed from the occupancy so it can't hide behind itself on a ray
+    occupancy_without_king = occupancy ^ king_bit
+    targets = KING_ATTACKS[king_square] & ~own
+    while targets:
+        to_bit = targets & -targets
+        targets ^= to_bit
+        to_square = to_bit.bit_length() - 1
+        if not attackers_to(position, to_square, them, occupancy_without_king):
+            moves.append(king_square | to_square << 6 | (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    checkers = attackers_to(position, king_square, them, occupancy)
+    if checkers & (checkers - 1):
+        # Double check, only the king can move
+        return moves
+
+    if checkers:
+        checker_square = checkers.bit_length() - 1
+        check_mask = BETWEEN[king_square][checker_square] | checkers
+    else:
+        check_mask = FULL_BOARD
+        castling_rights = position.castling_rights
+        attack_map = position.attack_map
+        for right, king_from, castling_move, empty_mask, safe_mask in CASTLING_MOVES:
+            if not (castling_rights & right and king_from == king_square and not occupancy & empty_mask):
+                continue
+            if attack_map is not None:
+                # The live attack map of the board position answers without walking any rays
+                is_safe = not attack_map.attacked(them) & safe_mask
+            else:
+                is_safe = not any(attackers_to(position, square, them, occupancy)
+                                  for square in iter_squares(safe_mask))
+            if is_safe:
+                moves.append(castling_move)
+
+    pinned = pinned_pieces(position, color_idx)
+
+    # Knights, pinned knights can never move
+    pieces = bitboards[base + KNIGHT] & ~pinned
+    while pieces:
+        from_bit = pieces & -pieces
+        pieces ^= from_bit
+        from_square = from_bit.bit_length() - 1
+        targets = KNIGHT_ATTACKS[from_square] & ~own & check_mask
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            moves.append(from_square | (to_bit.bit_length() - 1) << 6 |
+                         (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    # Sliders, pinned ones may only move along the pin line
+    queens = bitboards[base + QUEEN]
+    for sliders, attacks in ((bitboards[base + ROOK] | queens, rook_attacks),
+                             (bitboards[base + BISHOP] | queens, bishop_attacks)):
+        while sliders:
+            from_bit = sliders & -sliders
+            sliders ^= from_bit
+            from_square = from_bit.bit_length() - 1
+            targets = attacks(from_square, occupancy) & ~own & check_mask
+            if from_bit & pinned:
+                targets &= LINE[king_square][from_square]
+            while targets:
+                to_bit = targets & -targets
+                targets ^= to_bit
+                moves.append(from_square | (to_bit.bit_length() - 1) << 6 |
+                             (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    # Pawns that are not pinned are generated set-wise, every target is offset by a fixed amount
+    pawns = bitboards[base + PAWN]
+    free_pawns = pawns & ~pinned
+    if color_idx == WHITE:
+        single_pushes = (free_pawns >> 8) & empty
+        double_pushes = ((single_pushes & ROW_5) >> 8) & empty
+        left_captures = ((free_pawns & NOT_FILE_A) >> 9) & opponent
+        right_captures = ((free_pawns & NOT_FILE_H) >> 7) & opponent
+        push_offset, left_offset, right_offset = 8, 9, 7
+    else:
+        single_pushes = (free_pawns << 8) & empty
+        double_pushes = ((single_pushes & ROW_2) << 8) & empty
+        left_captures = ((free_pawns & NOT_FILE_A) << 7) & opponent
+        right_captures = ((free_pawns & NOT_FILE_H) << 9) & opponent
+        push_offset, left_offset, right_offset = -8, -7, -9
+
+    for targets, offset, flags in ((single_pushes & check_mask, push_offset, QUIET),
+                                   (double_pushes & check_mask, push_offset * 2, DOUBLE_PAWN_PUSH << 12),
+                                   (left_captures & check_mask, left_offset, CAPTURE_FLAG),
+                                   (right_captures & check_mask, right_offset, CAPTURE_FLAG)):
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            to_square = to_bit.bit_length() - 1
+            _append_pawn_move(moves, to_square + offset, to_square, flags)
+
+    # Pinned pawns one by one, restricted to the pin line
+    pinned_pawns = pawns & pinned
+    while pinned_pawns:
+        from_bit = pinned_pawns & -pinned_pawns
+        pinned_pawns ^= from_bit
+        from_square = from_bit.bit_length() - 1
+        targets = PAWN_ATTACKS[color_idx][from_square] & opponent
+        push_square = from_square - push_offset
+        if SQUARE_BITS[push_square] & empty:
+            targets |= SQUARE_BITS[push_square]
+            double_square = push_square - push_offset
+            if (from_square >> 3) == (6 if color_idx == WHITE else 1) and SQUARE_BITS[double_square] & empty:
+                targets |= SQUARE_BITS[double_square]
+        targets &= check_mask & LINE[king_square][from_square]
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            to_square = to_bit.bit_length() - 1
+            if to_bit & opponent:
+                flags = CAPTURE_FLAG
+            elif abs(to_square - from_square) == 16:
+                flags = DOUBLE_PAWN_PUSH << 12
+            else:
+                flags = QUIET
+            _append_pawn_move(moves, from_square, to_square, flags)
+
+    # En passant, tested by looking at the king's attackers after both pawns have left their squares
+    en_passant_square = position.en_passant_square
+    if en_passant_square != NO_SQUARE and position.side_to_move == color_idx:
+        captured_square = en_passant_square + push_offset
+        captured_bit = SQUARE_BITS[captured_square]
+        candidates = PAWN_ATTACKS[them][en_passant_square] & pawns
+        while candidates:
+            from_bit = candidates & -candidates
+            candidates ^= from_bit
+            occupancy_after = (occupancy ^ from_bit ^ captured_bit) | SQUARE_BITS[en_passant_square]
+            their_pawns = bitboards[them * 6 + PAWN]
+            bitboards[them * 6 + PAWN] = their_pawns ^ captured_bit
+            is_legal = not attackers_to(position, king_square, them, occupancy_after)
+            bitboards[them * 6 + PAWN] = their_pawns
+            if is_legal:
+                moves.append((from_bit.bit_length() - 1) | en_passant_square << 6 | EN_PASSANT << 12)
+
+    return moves
+
+
+def generate_pseudo_legal_moves(position: Position, color_idx: int = None) -> array:
+    # Moves that follow the piece rules but may leave the own king in check. The search tests legality only
+    # for the moves it actually plays (see is_legal), most moves are never played after a cutoff.
+    # Castling is still fully tested here, it is rare and its legality is not covered by a king check test.
+    return _generate_pseudo_legal(position, color_idx, True, True)
+
+
+def generate_captures(position: Position, color_idx: int = None) -> array:
+    # Pseudo-legal captures, en passant and all promotions
+    return _generate_pseudo_legal(position, color_idx, True, False)
+
+
+def generate_quiet_moves(position: Position, color_idx: int = None) -> array:
+    # Pseudo-legal moves that are not generated by generate_captures, castling included
+    return _generate_pseudo_legal(position, color_idx, False, True)
+
+
+def _castling_moves(position: Position, color_idx: int, king_square: int) -> list:
+    castling_rights = position.castling_rights
+    them = color_idx ^ 1
+    occupancy = position.all_occupancy
+    return [castling_move for right, king_from, castling_move, empty_mask, safe_mask in CASTLING_MOVES
+            if castling_rights & right and king_from == king_square and not occupancy & empty_mask and
+            not attackers_to(position, king_square, them, occupancy) and
+            not any(attackers_to(position, square, them, occupancy) for square in iter_squares(safe_mask))]
+
+
+def _generate_pseudo_legal(position: Position, color_idx: int, captures: bool, quiets: bool) -> array:
+    if color_idx is None:
+        color_idx = position.side_to_move
+    them = color_idx ^ 1
+    bitboards = position.bitboards
+    base = color_idx * 6
+    own = position.occupancy(color_idx)
+    opponent = position.occupancy(them)
+    occupancy = own | opponent
+    empty = FULL_BOARD ^ occupancy
+    not_own = (opponent if captures else EMPTY_BOARD) | (empty if quiets else EMPTY_BOARD)
+    moves = array('H')
+
+    king_square = position.king_square(color_idx)
+    targets = KING_ATTACKS[king_square] & not_own
+    while targets:
+        to_bit = targets & -targets
+        targets ^= to_bit
+        moves.append(king_square | (to_bit.bit_length() - 1) << 6 | (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    if quiets and position.castling_rights:
+        moves.extend(_castling_moves(position, color_idx, king_square))
+
+    pieces = bitboards[base + KNIGHT]
+    while pieces:
+        from_bit = pieces & -pieces
+        pieces ^= from_bit
+        from_square = from_bit.bit_length() - 1
+        targets = KNIGHT_ATTACKS[from_square] & not_own
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            moves.append(from_square | (to_bit.bit_length() - 1) << 6 |
+                         (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    queens = bitboards[base + QUEEN]
+    for sliders, attacks in ((bitboards[base + ROOK] | queens, rook_attacks),
+                             (bitboards[base + BISHOP] | queens, bishop_attacks)):
+        while sliders:
+            from_bit = sliders & -sliders
+            sliders ^= from_bit
+            from_square = from_bit.bit_length() - 1
+            targets = attacks(from_square, occupancy) & not_own
+            while targets:
+                to_bit = targets & -targets
+                targets ^= to_bit
+                moves.append(from_square | (to_bit.bit_length() - 1) << 6 |
+                             (CAPTURE_FLAG if to_bit & opponent else QUIET))
+
+    pawns = bitboards[base + PAWN]
+    if color_idx == WHITE:
+        single_pushes = (pawns >> 8) & empty
+        double_pushes = ((single_pushes & ROW_5) >> 8) & empty
+        left_captures = ((pawns & NOT_FILE_A) >> 9) & opponent
+        right_captures = ((pawns & NOT_FILE_H) >> 7) & opponent
+        push_offset, left_offset, right_offset = 8, 9, 7
+    else:
+        single_pushes = (pawns << 8) & empty
+        double_pushes = ((single_pushes & ROW_2) << 8) & empty
+        left_captures = ((pawns & NOT_FILE_A) << 7) & opponent
+        right_captures = ((pawns & NOT_FILE_H) << 9) & opponent
+        push_offset, left_offset, right_offset = -8, -7, -9
+
+    # Promotions belong to the captures, they change the material just like a capture does
+    if not captures:
+        single_pushes &= ~PROMOTION_ROWS
+        left_captures = right_captures = EMPTY_BOARD
+    if not quiets:
+        single_pushes &= PROMOTION_ROWS
+        double_pushes = EMPTY_BOARD
+
+    for targets, offset, flags in ((single_pushes, push_offset, QUIET),
+                                   (double_pushes, push_offset * 2, DOUBLE_PAWN_PUSH << 12),
+                                   (left_captures, left_offset, CAPTURE_FLAG),
+                                   (right_captures, right_offset, CAPTURE_FLAG)):
+        while targets:
+            to_bit = targets & -targets
+            targets ^= to_bit
+            to_square = to_bit.bit_length() - 1
+            _append_pawn_move(moves, to_square + offset, to_square, flags)
+
+    en_passant_square = position.en_passant_square
+    if captures and en_passant_square != NO_SQUARE and position.side_to_move == color_idx:
+        candidates = PAWN_ATTACKS[them][en_passant_square] & pawns
+        while candidates:
+            from_bit = candidates & -candidates
+            candidates ^= from_bit
+            moves.append((from_bit.bit_length() - 1) | en_passant_square << 6 | EN_PASSANT << 12)
+
+    return moves
+
+
+def is_pseudo_legal(position: Position, move: int) -> bool:
+    # Validates a move that was stored for another position (hash move, killer moves) without generating
+    # the moves of the current one
+    color_idx = position.side_to_move
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    flags = move >> 12
+    squares = position.squares
+    code = squares[from_square]
+    if move == NULL_MOVE or code == NO_PIECE or code // 6 != color_idx:
+        return False
+    piece_idx = code % 6
+    to_bit = SQUARE_BITS[to_square]
+
+    if flags in (KING_CASTLE, QUEEN_CASTLE):
+        return piece_idx == KING and move in _castling_moves(position, color_idx, from_square)
+
+    if flags == EN_PASSANT:
+        return (piece_idx == PAWN and to_square == position.en_passant_square and
+                bool(PAWN_ATTACKS[color_idx][from_square] & to_bit))
+
+    target = squares[to_square]
+    if flags & CAPTURE:
+        if target == NO_PIECE or target // 6 == color_idx:
+            return False
+    elif target != NO_PIECE:
+        return False
+
+    if piece_idx == PAWN:
+        # A pawn move onto the last row has to be a promotion and no other move may be one
+        if bool(flags & PROMOTION) != bool(to_bit & PROMOTION_ROWS):
+            return False
+        if flags & CAPTURE:
+            # 6 and 7 are not move flags, make_move would misread them
+            if flags != CAPTURE and not flags & PROMOTION:
+                return False
+            return bool(PAWN_ATTACKS[color_idx][from_square] & to_bit)
+        push = -8 if color_idx == WHITE else 8
+        if flags == DOUBLE_PAWN_PUSH:
+            return (to_square == from_square + 2 * push and squares[from_square + push] == NO_PIECE and
+                    from_square >> 3 == (6 if color_idx == WHITE else 1))
+        return to_square == from_square + push
+
+    if flags not in (QUIET, CAPTURE):
+        return False
+    if piece_idx == KNIGHT:
+        return bool(KNIGHT_ATTACKS[from_square] & to_bit)
+    if piece_idx == KING:
+        return bool(KING_ATTACKS[from_square] & to_bit)
+    occupancy = position.all_occupancy
+    attacks = EMPTY_BOARD
+    if piece_idx in (ROOK, QUEEN):
+        attacks |= rook_attacks(from_square, occupancy)
+    if piece_idx in (BISHOP, QUEEN):
+        attacks |= bishop_attacks(from_square, occupancy)
+    return bool(attacks & to_bit)
+
+
+def is_legal(position: Position, move: int, pinned: int, checkers: int) -> bool:
+    # Deferred legality test of a pseudo-legal move of the side to move. Pinned pieces and checkers are computed
+    # once per node, so the common case (no check, piece not pinned) needs no work at all.
+    color_idx = position.side_to_move
+    them = color_idx ^ 1
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    king_square = position.king_square(color_idx)
+
+    if from_square == king_square:
+        # Castling was fully tested by the generator
+        if (move >> 12) in (KING_CASTLE, QUEEN_CASTLE):
+            return True
+        return not attackers_to(position, to_square, them, position.all_occupancy ^ SQUARE_BITS[king_square])
+
+    if (move >> 12) == EN_PASSANT:
+        # Both pawns leave their rank at once, the only safe test is to try it
+        if not try_make_move(position, move):
+            return False
+        position.unmake_move()
+        return True
+
+    if checkers:
+        if checkers & (checkers - 1):
+            return False
+        if not SQUARE_BITS[to_square] & (BETWEEN[king_square][checkers.bit_length() - 1] | checkers):
+            return False
+
+    return not SQUARE_BITS[from_square] & pinned or bool(SQUARE_BITS[to_square] & LINE[king_square][from_square])
+
+
+def try_make_move(position: Position, move: int) -> bool:
+    # Deferred legality check of a pseudo-legal move by playing it: the move is taken back if it leaves the king
+    # of the moving side attacked
+    position.make_move(move)
+    mover = position.side_to_move ^ 1
+    if attackers_to(position, position.king_square(mover), mover ^ 1, position.all_occupancy):
+        position.unmake_move()
+        return False
+    return True
@@ -0,0 +1,97 @@
+from array import array
+from typing import List
+
+from src.model.engine.bitboard import PAWN, PIECE_VALUES
+from src.model.engine.move import NULL_MOVE, CAPTURE, EN_PASSANT, PROMOTION, PROMOTION_PIECES
+
+# Move ordering heuristics used by the move picker (see move_picker.py):
+#
+#     MVV-LVA          captures of the most valuable victim by the least valuable attacker first
+#     killer moves     two quiet moves per ply that caused a beta cutoff in a sibling node
+#     history          butterfly table (side, from, to) of quiet moves that caused cutoffs, weighted by depth
+#     counter moves    the quiet move that refuted a move of the opponent, by the (from, to) of that move
+#
+# All tables are preallocated. Between searches the killers and counter moves are cleared and the history is
+# halved, so it keeps a memory of the previous moves without drowning the new information.
+
+MAX_PLY = 64
+
+# Captured piece value first, the attacker decides between equal victims
+MVV_LVA = tuple(tuple(PIECE_VALUES[victim] * 100 - PIECE_VALUES[attacker] for attacker in range(6))
+                for victim in range(6))
+
+CAPTURE_FLAG = CAPTURE << 12
+PROMOTION_FLAG = PROMOTION << 12
+# A history score beyond this in either direction halves the whole table, so old cutoffs fade and the values
+# stay small
+HISTORY_LIMIT = 1 << 20
+
+
+def capture_score(squares: List[int], move: int) -> int:
+    score = 0
+    if move & CAPTURE_FLAG:
+        victim = PAWN if move >> 12 == EN_PASSANT else squares[(move >> 6) & 63] % 6
+        score = MVV_LVA[victim][squares[move & 63] % 6]
+    if move & PROMOTION_FLAG:
+        score += PIECE_VALUES[PROMOTION_PIECES[(move >> 12) & 3]] * 100
+    return score
+
+
+class MoveOrdering:
+
+    def __init__(self) -> None:
+        self.killers: List[List[int]] = [[NULL_MOVE, NULL_MOVE] for _ in range(MAX_PLY)]
+        # Indexed by side * 4096 + the from and to squares of the move (its 12 lowest bits)
+        self.history = array('l', bytes(2 * 4096 * array('l').itemsize))
+        self.counter_moves = array('H', bytes(4096 * 2))
+
+    def new_search(self) -> None:
+        for killers in self.killers:
+            killers[0] = killers[1] = NULL_MOVE
+        self.counter_moves[:] = array('H', bytes(4096 * 2))
+        self._age_history()
+
+    def clear(self) -> None:
+        self.new_search()
+        self.history[:] = array('l', bytes(len(self.history) * self.history.itemsize))
+
+    def _age_history(self) -> None:
+        # In place, the table keeps its buffer. Halved towards zero, floor division would keep -1 forever.
+        self.history[:] = array('l', (int(score / 2) for score in self.history))
+
+    def killers_at(self, ply: int) -> List[int]:
+        return self.killers[ply]
+
+    def counter_move(self, previous_move: int) -> int:
+        return self.counter_moves[previous_move & 0xFFF] if previous_move != NULL_MOVE else NULL_MOVE
+
+    def history_score(self, side: int, move: int) -> int:
+        return self.history[side << 12 | move & 0xFFF]
+
+    def on_cutoff(self, side: int, ply: int, depth: int, move: int, previous_move: int,
+                  searched_quiets: List[int]) -> None:
+        # Only quiet moves are remembered, captures are ordered by MVV-LVA anyway
+        if move & (CAPTURE_FLAG | PROMOTION_FLAG):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        if previous_move != NULL_MOVE:
+            self.counter_moves[previous_move & 0xFFF] = move
+
+        # The quiet moves searched before the cutoff move failed, they lose what the cutoff move gains
+        history = self.history
+        bonus = depth * depth
+        base = side << 12
+        index = base | move & 0xFFF
+        history[index] += bonus
+        is_full = history[index] > HISTORY_LIMIT
+        for failed_move in searched_quiets:
+            if failed_move != move:
+                failed_index = base | failed_move & 0xFFF
+                history[failed_index] -= bonus
+                if history[failed_index] < -HISTORY_LIMIT:
+                    is_full = True
+        if is_full:
+            self._age_history()
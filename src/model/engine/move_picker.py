@@ -0,0 +1,54 @@
+from typing import Iterator, Optional, Sequence
+
+from src.model.engine.move import NULL_MOVE, CAPTURE, PROMOTION
+from src.model.engine.move_generator import generate_captures, generate_quiet_moves, is_pseudo_legal
+from src.model.engine.move_ordering import MoveOrdering, capture_score
+from src.model.engine.position import Position
+
+# Staged move picker. The moves of a node are handed out in the order they are most likely to cause a cutoff:
+#
+#     1. hash move      the best move found for this position earlier
+#     2. captures       captures, en passant and promotions, by MVV-LVA
+#     3. killer moves   quiet moves that caused a cutoff in a sibling node
+#     4. counter move   the quiet move that refuted the previous move of the opponent before
+#     5. quiet moves    everything else, by history score
+#
+# Every stage is generated only once the previous one is exhausted, so a cutoff on the hash move or a capture
+# skips the generation of the quiet moves, which are most of the moves of a position. The moves are pseudo-legal,
+# the search tests their legality with is_legal.
+
+# Stored moves of these kinds come back as captures, killers are quiet moves only
+TACTICAL_FLAGS = (CAPTURE | PROMOTION) << 12
+
+
+def pick_moves(position: Position, hash_move: int = NULL_MOVE, killers: Sequence[int] = (),
+               counter_move: int = NULL_MOVE, ordering: Optional[MoveOrdering] = None) -> Iterator[int]:
+    # Hash, killer and counter moves may come from another position, they are checked before they are handed out
+    if hash_move != NULL_MOVE and is_pseudo_legal(position, hash_move):
+        yield hash_move
+    else:
+        hash_move = NULL_MOVE
+
+    captures = generate_captures(position)
+    if len(captures) > 1:
+        squares = position.squares
+        captures = sorted(captures, key=lambda capture: capture_score(squares, capture), reverse=True)
+    for move in captures:
+        if move != hash_move:
+            yield move
+
+    picked_quiets = [hash_move]
+    for quiet_move in (*killers, counter_move):
+        if (quiet_move != NULL_MOVE and not quiet_move & TACTICAL_FLAGS and quiet_move not in picked_quiets and
+                is_pseudo_legal(position, quiet_move)):
+            picked_quiets.append(quiet_move)
+            yield quiet_move
+
+    quiet_moves = generate_quiet_moves(position)
+    if ordering is not None:
+        history = ordering.history
+        base = position.side_to_move << 12
+        quiet_moves = sorted(quiet_moves, key=lambda quiet: history[base | quiet & 0xFFF], reverse=True)
+    for move in quiet_moves:
+        if move not in picked_quiets:
+            yield move
@@ -0,0 +1,179 @@
+from array import array
+from typing import Optional, Tuple
+
+from src.model.engine.bitboard import SQUARE_BITS, WHITE, BLACK, FILE_A, pawn_attacks, iter_squares
+
+# Pawn structure evaluation. Every term depends on the pawns only, so the result is cached by the pawn key of the
+# position (see zobrist.py) in the pawn table. Pawns move or get captured in a small share of the moves, most
+# probes are hits.
+#
+#     doubled     every pawn behind another pawn of the same color on its file
+#     isolated    no pawn of the same color on the adjacent files
+#     backward    no pawn of the same color beside or behind it on the adjacent files to support its advance,
+#                 and its stop square is attacked by an enemy pawn
+#     passed      no enemy pawn in front of it on its own or the adjacent files, more the further it advanced
+#
+# The pawn shield in front of the king depends on the king square as well, it is not cached. It is a handful of
+# mask tests, cheaper than a probe.
+#
+# Scores are (middlegame, endgame) pairs in centipawns from the point of view of white, tapered by the evaluation
+# (see evaluation.py).
+
+DOUBLED_PENALTY = (10, 20)
+ISOLATED_PENALTY = (10, 15)
+BACKWARD_PENALTY = (8, 10)
+# By the rank of the pawn counted from its own side, 1 is the start rank
+PASSED_BONUS_MIDDLEGAME = (0, 5, 10, 15, 25, 40, 60, 0)
+PASSED_BONUS_ENDGAME = (0, 10, 20, 35, 60, 100, 150, 0)
+# Middlegame only, per pawn one and two ranks in front of the king
+SHIELD_BONUS = (10, 5)
+
+FILE_MASKS: Tuple[int, ...] = tuple(FILE_A << col for col in range(8))
+ADJACENT_FILE_MASKS: Tuple[int, ...] = tuple((FILE_MASKS[col - 1] if col > 0 else 0) |
+                                             (FILE_MASKS[col + 1] if col < 7 else 0) for col in range(8))
+
+
+def _rows_mask(rows) -> int:
+    mask = 0
+    for row in rows:
+        mask |= 0xFF << (row * 8)
+    return mask
+
+
+def _rows_in_front(color_idx: int, row: int) -> int:
+    # White pawns advance towards row 0, black pawns towards row 7
+    return _rows_mask(range(row) if color_idx == WHITE else range(row + 1, 8))
+
+
+def _rows_level_or_behind(color_idx: int, row: int) -> int:
+    return _rows_mask(range(row, 8) if color_idx == WHITE else range(row + 1))
+
+
+def _shield_masks(color_idx: int, square: int) -> Tuple[int, int]:
+    # Only a king on its first two ranks hides behind its pawns
+    row, col = divmod(square, 8)
+    if (7 - row if color_idx == WHITE else row) > 1:
+        return 0, 0
+    step = -1 if color_idx == WHITE else 1
+    files = FILE_MASKS[col] | ADJACENT_FILE_MASKS[col]
+    masks = []
+    for distance in (1, 2):
+        shield_row = row + step * distance
+        masks.append(files & _rows_mask((shield_row,)) if 0 <= shield_row < 8 else 0)
+    return masks[0], masks[1]
+
+
+# Indexed by color and square
+PASSED_MASKS = tuple(tuple((FILE_MASKS[square & 7] | ADJACENT_FILE_MASKS[square & 7]) &
+                           _rows_in_front(color_idx, square >> 3) for square in range(64))
+                     for color_idx in (WHITE, BLACK))
+SUPPORT_MASKS = tuple(tuple(ADJACENT_FILE_MASKS[square & 7] & _rows_level_or_behind(color_idx, square >> 3)
+                            for square in range(64)) for color_idx in (WHITE, BLACK))
+SHIELD_MASKS = tuple(tuple(_shield_masks(color_idx, square) for square in range(64)) for color_idx in (WHITE, BLACK))
+
+
+def _evaluate_side(color_idx: int, own_pawns: int, enemy_pawns: int) -> Tuple[int, int]:
+    middlegame = endgame = 0
+    enemy_attacks = pawn_attacks(enemy_pawns, color_idx ^ 1)
+    passed_masks = PASSED_MASKS[color_idx]
+    support_masks = SUPPORT_MASKS[color_idx]
+    for col in range(8):
+        count = (own_pawns & FILE_MASKS[col]).bit_count()
+        if count > 1:
+            middlegame -= DOUBLED_PENALTY[0] * (count - 1)
+            endgame -= DOUBLED_PENALTY[1] * (count - 1)
+
+    for square in iter_squares(own_pawns):
+        col = square & 7
+        if not own_pawns & ADJACENT_FILE_MASKS[col]:
+            middlegame -= ISOLATED_PENALTY[0]
+            endgame -= ISOLATED_PENALTY[1]
+        elif not own_pawns & support_masks[square]:
+            stop_square = square - 8 if color_idx == WHITE else square + 8
+            if enemy_attacks & SQUARE_BITS[stop_square]:
+                middlegame -= BACKWARD_PENALTY[0]
+                endgame -= BACKWARD_PENALTY[1]
+        if not enemy_pawns & passed_masks[square]:
+            rank = 7 - (square >> 3) if color_idx == WHITE else square >> 3
+            middlegame += PASSED_BONUS_MIDDLEGAME[rank]
+            endgame += PASSED_BONUS_ENDGAME[rank]
+    return middlegame, endgame
+
+
+def evaluate_pawns(white_pawns: int, black_pawns: int) -> Tuple[int, int]:
+    # (middlegame, endgame) of the pawn structure
+    white_middlegame, white_endgame = _evaluate_side(WHITE, white_pawns, black_pawns)
+    black_middlegame, black_endgame = _evaluate_side(BLACK, black_pawns, white_pawns)
+    return white_middlegame - black_middlegame, white_endgame - black_endgame
+
+
+def pawn_shield(white_pawns: int, black_pawns: int, white_king: int, black_king: int) -> int:
+    # Middlegame score of the pawns in front of both kings, by the king squares
+    score = 0
+    for sign, pawns, masks in ((1, white_pawns, SHIELD_MASKS[WHITE][white_king]),
+                               (-1, black_pawns, SHIELD_MASKS[BLACK][black_king])):
+        score += sign * ((pawns & masks[0]).bit_count() * SHIELD_BONUS[0] +
+                         (pawns & masks[1]).bit_count() * SHIELD_BONUS[1])
+    return score
+
+
+# Bytes of one entry, the key and the two scores
+ENTRY_BYTES = 8 + 2 * 4
+
+
+class PawnTable:
+
+    def __init__(self, size_mb: int = 1) -> None:
+        # Direct-mapped like the evaluation cache, the number of entries is a power of two
+        entry_count = 1
+        while entry_count * 2 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            entry_count *= 2
+        self._mask = entry_count - 1
+        self._keys = array('Q', bytes(entry_count * 8))
+        self._middlegame = array('i', bytes(entry_count * 4))
+        self._endgame = array('i', bytes(entry_count * 4))
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entry_count(self) -> int:
+        return self._mask + 1
+
+    @property
+    def size_bytes(self) -> int:
+        return self.entry_count * ENTRY_BYTES
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int]]:
+        # Without pawns the key is zero, empty entries match it with the right scores of zero
+        index = key & self._mask
+        if self._keys[index] == key:
+            self.hits += 1
+            return self._middlegame[index], self._endgame[index]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, middlegame: int, endgame: int) -> None:
+        index = key & self._mask
+        self._keys[index] = key
+        self._middlegame[index] = middlegame
+        self._endgame[index] = endgame
+
+    def evaluate(self, key: int, white_pawns: int, black_pawns: int) -> Tuple[int, int]:
+        scores = self.probe(key)
+        if scores is None:
+            scores = evaluate_pawns(white_pawns, black_pawns)
+            self.store(key, *scores)
+        return scores
+
+    def clear(self) -> None:
+        self._keys[:] = array('Q', bytes(self.entry_count * 8))
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
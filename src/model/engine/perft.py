@@ -0,0 +1,163 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.model.engine.move import move_to_uci
+from src.model.engine.move_generator import generate_legal_moves
+from src.model.engine.position import Position, START_FEN
+
+# Perft counts the leaf nodes of the legal move tree to a fixed depth. The counts of the standard positions are
+# published, so any difference points to a move generation (or make/unmake) bug.
+#
+#     python -m src.model.engine.perft                      # every standard position to depth 3
+#     python -m src.model.engine.perft --position kiwipete --depth 4 --divide
+#     python -m src.model.engine.perft --fen "<fen>" --depth 5 --workers 4 --hash
+
+# Name -> (FEN, node counts for depth 1, 2, ...)
+PERFT_POSITIONS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    'start': (START_FEN, (20, 400, 8902, 197281, 4865609)),
+    'kiwipete': ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 (48, 2039, 97862, 4085603)),
+    'position3': ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", (14, 191, 2812, 43238, 674624)),
+    'position4': ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", (6, 264, 9467, 422333)),
+    'position5': ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", (44, 1486, 62379, 2103487)),
+    'position6': ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  (46, 2079, 89890, 3894594)),
+}
+
+
+class PerftResult(NamedTuple):
+    nodes: int
+    seconds: float
+    divide: Dict[int, int]
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+
+def _transposition_key(position: Position, depth: int):
+    return position.zobrist_key, depth
+
+
+def perft(position: Position, depth: int, hash_table: Optional[Dict] = None) -> int:
+    if depth == 0:
+        return 1
+    moves = generate_legal_moves(position)
+    # The moves of the last ply are counted, not played
+    if depth == 1:
+        return len(moves)
+
+    if hash_table is not None:
+        key = _transposition_key(position, depth)
+        nodes = hash_table.get(key)
+        if nodes is not None:
+            return nodes
+
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1, hash_table)
+        position.unmake_move()
+
+    if hash_table is not None:
+        hash_table[key] = nodes
+    return nodes
+
+
+def divide(position: Position, depth: int, hash_table: Optional[Dict] = None) -> Dict[int, int]:
+    # Node count below every root move
+    result: Dict[int, int] = {}
+    for move in generate_legal_moves(position):
+        position.make_move(move)
+        result[move] = perft(position, depth - 1, hash_table)
+        position.unmake_move()
+    return result
+
+
+def _perft_root_moves(fen: str, moves: List[int], depth: int, use_hash: bool) -> Dict[int, int]:
+    # Runs in a worker process, the position is sent as FEN instead of pickling any objects
+    position = Position.from_fen(fen)
+    hash_table = {} if use_hash else None
+    result: Dict[int, int] = {}
+    for move in moves:
+        position.make_move(move)
+        result[move] = perft(position, depth - 1, hash_table)
+        position.unmake_move()
+    return result
+
+
+def parallel_divide(position: Position, depth: int, workers: int, use_hash: bool = False) -> Dict[int, int]:
+    # The root moves are dealt out round-robin, every worker gets one batch
+    moves = list(generate_legal_moves(position))
+    batches = [moves[index::workers] for index in range(workers) if moves[index::workers]]
+    fen = position.to_fen()
+    result: Dict[int, int] = {}
+    with ProcessPoolExecutor(max_workers=len(batches) or 1) as executor:
+        futures = [executor.submit(_perft_root_moves, fen, batch, depth, use_hash) for batch in batches]
+        for future in futures:
+            result.update(future.result())
+    # Same order as the move generator, so the output does not depend on the scheduling
+    return {move: result[move] for move in moves}
+
+
+def run_perft(position: Position, depth: int, workers: int = 1, use_hash: bool = False) -> PerftResult:
+    start_time = time.perf_counter()
+    if depth < 1:
+        return PerftResult(1, 0.0, {})
+    if workers > 1:
+        root_counts = parallel_divide(position, depth, workers, use_hash)
+    else:
+        root_counts = divide(position, depth, {} if use_hash else None)
+    return PerftResult(sum(root_counts.values()), time.perf_counter() - start_time, root_counts)
+
+
+def print_divide(result: PerftResult) -> None:
+    for move, nodes in result.divide.items():
+        print(f"{move_to_uci(move)}: {nodes}")
+    print(f"Moves: {len(result.divide)}")
+    print(f"Nodes: {result.nodes}")
+
+
+def run_suite(max_depth: int = 3, workers: int = 1, use_hash: bool = False) -> bool:
+    all_passed = True
+    for name, (fen, expected_counts) in PERFT_POSITIONS.items():
+        position = Position.from_fen(fen)
+        for depth, expected_nodes in enumerate(expected_counts[:max_depth], start=1):
+            result = run_perft(position, depth, workers, use_hash)
+            passed = result.nodes == expected_nodes
+            all_passed = all_passed and passed
+            print(f"{name:<10} depth {depth}: {result.nodes:>10} nodes, expected {expected_nodes:>10} "
+                  f"{'OK' if passed else 'FAIL'}  {result.seconds:7.3f} s  {result.nodes_per_second:>10.0f} nps")
+    return all_passed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Perft move generation benchmark")
+    parser.add_argument('--fen', help="position to count, the standard positions are used if missing")
+    parser.add_argument('--position', choices=PERFT_POSITIONS.keys(), help="one of the standard positions")
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1, help="processes the root moves are split across")
+    parser.add_argument('--hash', action='store_true', help="cache the node counts of transpositions")
+    parser.add_argument('--divide', action='store_true', help="print the node count of every root move")
+    args = parser.parse_args(argv)
+
+    if args.fen is None and args.position is None:
+        if not run_suite(args.depth, args.workers, args.hash):
+            raise SystemExit(1)
+        return
+
+    fen = args.fen if args.fen is not None else PERFT_POSITIONS[args.position][0]
+    result = run_perft(Position.from_fen(fen), args.depth, args.workers, args.hash)
+    if args.divide:
+        print_divide(result)
+    print(f"Depth {args.depth}: {result.nodes} nodes in {result.seconds:.3f} s "
+          f"({result.nodes_per_second:.0f} nodes/s)")
+    if args.position is not None and args.depth <= len(PERFT_POSITIONS[args.position][1]):
+        expected_nodes = PERFT_POSITIONS[args.position][1][args.depth - 1]
+        print(f"Expected {expected_nodes}: {'OK' if result.nodes == expected_nodes else 'FAIL'}")
+
+
+if __name__ == '__main__':
+    main()
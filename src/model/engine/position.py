@@ -0,0 +1,444 @@
+from typing import List, Optional, Tuple
+
+from src.model.engine.attack_map import AttackMap
+from src.model.engine.attack_tables import PAWN_ATTACKS
+from src.model.engine.bitboard import (SQUARE_BITS, WHITE, BLACK, ROOK, KNIGHT, BISHOP, QUEEN, PAWN, KING,
+                                       NO_SQUARE, NO_PIECE, EMPTY_BOARD, ROW_0, ROW_7, PIECE_VALUES, bitboard_index)
+from src.model.engine.move import (DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, EN_PASSANT, PROMOTION,
+                                   PROMOTION_PIECES, FILES, NULL_MOVE)
+from src.model.engine.evaluation import MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASES
+from src.model.engine.zobrist import PIECE_KEYS, state_key, compute_key
+from src.model.enums.color import Color
+from src.model.pieces.piece import Piece
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING_RIGHTS = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+# Castling rights that survive a move from or to the given square
+CASTLING_RIGHTS_MASK = tuple(
+    ALL_CASTLING_RIGHTS & ~{60: WHITE_KINGSIDE | WHITE_QUEENSIDE, 63: WHITE_KINGSIDE, 56: WHITE_QUEENSIDE,
+                            4: BLACK_KINGSIDE | BLACK_QUEENSIDE, 7: BLACK_KINGSIDE, 0: BLACK_QUEENSIDE}.get(square, 0)
+    for square in range(64))
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+# FEN piece letters in the order of the integer piece codes, upper case for white
+FEN_PIECES = "prnbqk"
+FEN_CASTLING = ((WHITE_KINGSIDE, "K"), (WHITE_QUEENSIDE, "Q"), (BLACK_KINGSIDE, "k"), (BLACK_QUEENSIDE, "q"))
+
+# King destination square -> (rook from, rook to)
+CASTLING_ROOK_MOVES = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+PROMOTION_ROWS = ROW_0 | ROW_7
+
+
+class Position:
+
+    def __init__(self) -> None:
+        # One bitboard for every (color, piece type) pair, see bitboard_index()
+        self._bitboards: List[int] = [EMPTY_BOARD] * 12
+        self._occupancy: List[int] = [EMPTY_BOARD, EMPTY_BOARD]
+        self._side_to_move: int = WHITE
+        self._castling_rights: int = 0
+        self._en_passant_square: int = NO_SQUARE
+        # Piece code (color * 6 + piece) on every square, NO_PIECE if the square is empty
+        self._squares: List[int] = [NO_PIECE] * 64
+        # Zobrist key, updated with every change of the pieces or the state (see zobrist.py)
+        self._key: int = 0
+        self._pawn_key: int = 0
+        # Evaluation terms, updated with every change of the pieces (see evaluation.py)
+        self._material: List[int] = [0, 0]
+        self._middlegame_score: int = 0
+        self._endgame_score: int = 0
+        self._phase: int = 0
+        # (move, captured piece, castling rights, en passant square, key) for every made move
+        self._undo_stack: List[Tuple[int, int, int, int, int]] = []
+        # Only the position of the board keeps an attack map, copies used for searching go without it
+        self._attack_map: Optional[AttackMap] = None
+
+    @classmethod
+    def from_players(cls, current_player, opponent) -> 'Position':
+        position = cls()
+        for player in (current_player, opponent):
+            for piece in player.pieces:
+                position.put_piece_object(piece)
+        position.update_state(current_player, opponent)
+        return position
+
+    @classmethod
+    def from_fen(cls, fen: str) -> 'Position':
+        # FEN ranks go from the 8th to the 1st, the same order as the rows of the board
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"Invalid FEN: {fen}")
+        position = cls()
+        rows = fields[0].split('/')
+        if len(rows) != 8:
+            raise ValueError(f"Invalid FEN: {fen}")
+        for row, row_text in enumerate(rows):
+            col = 0
+            for char in row_text:
+                if char.isdigit():
+                    col += int(char)
+                else:
+                    position.put_piece(WHITE if char.isupper() else BLACK, FEN_PIECES.index(char.lower()),
+                                       row * 8 + col)
+                    col += 1
+
+        position._side_to_move = WHITE if fields[1] == 'w' else BLACK
+        for right, char in FEN_CASTLING:
+            if char in fields[2]:
+                position._castling_rights |= right
+        if fields[3] != '-':
+            position._en_passant_square = position._capturable_en_passant(
+                (8 - int(fields[3][1])) * 8 + FILES.index(fields[3][0]), position._side_to_move)
+        position._key = compute_key(position)
+        return position
+
+    def to_fen(self) -> str:
+        rows = []
+        for row in range(8):
+            row_text = ''
+            empty_squares = 0
+            for square in range(row * 8, row * 8 + 8):
+                code = self._squares[square]
+                if code == NO_PIECE:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    row_text += str(empty_squares)
+                    empty_squares = 0
+                char = FEN_PIECES[code % 6]
+                row_text += char.upper() if code < 6 else char
+            if empty_squares:
+                row_text += str(empty_squares)
+            rows.append(row_text)
+
+        castling = ''.join(char for right, char in FEN_CASTLING if self._castling_rights & right) or '-'
+        if self._en_passant_square == NO_SQUARE:
+            en_passant = '-'
+        else:
+            row, col = divmod(self._en_passant_square, 8)
+            en_passant = FILES[col] + str(8 - row)
+        return f"{'/'.join(rows)} {'w' if self._side_to_move == WHITE else 'b'} {castling} {en_passant} 0 1"
+
+    def copy(self) -> 'Position':
+        position = Position()
+        position._bitboards = self._bitboards.copy()
+        position._occupancy = self._occupancy.copy()
+        position._side_to_move = self._side_to_move
+        position._castling_rights = self._castling_rights
+        position._en_passant_square = self._en_passant_square
+        position._squares = self._squares.copy()
+        position._key = self._key
+        position._pawn_key = self._pawn_key
+        position._material = self._material.copy()
+        position._middlegame_score = self._middlegame_score
+        position._endgame_score = self._endgame_score
+        position._phase = self._phase
+        return position
+
+    def clear(self) -> None:
+        self._bitboards = [EMPTY_BOARD] * 12
+        self._occupancy = [EMPTY_BOARD, EMPTY_BOARD]
+        self._side_to_move = WHITE
+        self._castling_rights = 0
+        self._en_passant_square = NO_SQUARE
+        self._squares = [NO_PIECE] * 64
+        self._key = 0
+        self._pawn_key = 0
+        self._material = [0, 0]
+        self._middlegame_score = 0
+        self._endgame_score = 0
+        self._phase = 0
+        self._undo_stack = []
+        if self._attack_map is not None:
+            self._attack_map.rebuild()
+
+    def enable_attack_map(self) -> AttackMap:
+        if self._attack_map is None:
+            self._attack_map = AttackMap(self)
+        return self._attack_map
+
+    @property
+    def attack_map(self) -> Optional[AttackMap]:
+        return self._attack_map
+
+    def put_piece(self, color_idx: int, piece_idx: int, square: int) -> None:
+        bit = SQUARE_BITS[square]
+        self._bitboards[color_idx * 6 + piece_idx] |= bit
+        self._occupancy[color_idx] |= bit
+        code = color_idx * 6 + piece_idx
+        self._squares[square] = code
+        self._key ^= PIECE_KEYS[code][square]
+        if piece_idx == PAWN:
+            self._pawn_key ^= PIECE_KEYS[code][square]
+        self._material[color_idx] += PIECE_VALUES[piece_idx]
+        self._middlegame_score += MIDDLEGAME_SCORES[code][square]
+        self._endgame_score += ENDGAME_SCORES[code][square]
+        self._phase += PHASES[code]
+        if self._attack_map is not None:
+            self._attack_map.on_put(color_idx, piece_idx, square)
+
+    def remove_piece(self, color_idx: int, piece_idx: int, square: int) -> None:
+        bit = SQUARE_BITS[square]
+        self._bitboards[color_idx * 6 + piece_idx] &= ~bit
+        self._occupancy[color_idx] &= ~bit
+        self._squares[square] = NO_PIECE
+        code = color_idx * 6 + piece_idx
+        self._key ^= PIECE_KEYS[code][square]
+        if piece_idx == PAWN:
+            self._pawn_key ^= PIECE_KEYS[code][square]
+        self._material[color_idx] -= PIECE_VALUES[piece_idx]
+        self._middlegame_score -= MIDDLEGAME_SCORES[code][square]
+        self._endgame_score -= ENDGAME_SCORES[code][square]
+        self._phase -= PHASES[code]
+        if self._attack_map is not None:
+            self._attack_map.on_remove(square)
+
+    def move_piece(self, color_idx: int, piece_idx: int, from_square: int, to_square: int) -> None:
+        from_to = SQUARE_BITS[from_square] | SQUARE_BITS[to_square]
+        self._bitboards[color_idx * 6 + piece_idx] ^= from_to
+        self._occupancy[color_idx] ^= from_to
+        self._squares[to_square] = self._squares[from_square]
+        self._squares[from_square] = NO_PIECE
+        code = color_idx * 6 + piece_idx
+        piece_keys = PIECE_KEYS[code]
+        self._key ^= piece_keys[from_square] ^ piece_keys[to_square]
+        if piece_idx == PAWN:
+            self._pawn_key ^= piece_keys[from_square] ^ piece_keys[to_square]
+        middlegame_scores = MIDDLEGAME_SCORES[code]
+        endgame_scores = ENDGAME_SCORES[code]
+        self._middlegame_score += middlegame_scores[to_square] - middlegame_scores[from_square]
+        self._endgame_score += endgame_scores[to_square] - endgame_scores[from_square]
+        if self._attack_map is not None:
+            self._attack_map.on_move(from_square, to_square)
+
+    def make_move(self, move: int) -> None:
+        # Plays a legal encoded move (see move.py) including captures, castling, en passant and promotion.
+        # Everything needed to take it back is pushed to the undo stack, see unmake_move()
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        flags = move >> 12
+        squares = self._squares
+        color_idx, piece_idx = divmod(squares[from_square], 6)
+        captured = squares[to_square]
+        self._undo_stack.append((move, captured, self._castling_rights, self._en_passant_square, self._key))
+        # The pieces update the key as they are moved, the state part is swapped as a whole
+        self._key ^= state_key(self._side_to_move, self._castling_rights, self._en_passant_square)
+
+        if captured != NO_PIECE:
+            self.remove_piece(color_idx ^ 1, captured % 6, to_square)
+
+        if flags & PROMOTION:
+            self.remove_piece(color_idx, PAWN, from_square)
+            self.put_piece(color_idx, PROMOTION_PIECES[flags & 3], to_square)
+        else:
+            if flags == EN_PASSANT:
+                self.remove_piece(color_idx ^ 1, PAWN, to_square + (8 if color_idx == WHITE else -8))
+            elif flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+                self.move_piece(color_idx, ROOK, rook_from, rook_to)
+            self.move_piece(color_idx, piece_idx, from_square, to_square)
+
+        self._castling_rights &= CASTLING_RIGHTS_MASK[from_square] & CASTLING_RIGHTS_MASK[to_square]
+        self._en_passant_square = (self._capturable_en_passant((from_square + to_square) // 2, color_idx ^ 1)
+                                   if flags == DOUBLE_PAWN_PUSH else NO_SQUARE)
+        self._side_to_move ^= 1
+        self._key ^= state_key(self._side_to_move, self._castling_rights, self._en_passant_square)
+
+    def unmake_move(self) -> None:
+        move, captured, castling_rights, en_passant_square, key = self._undo_stack.pop()
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        flags = move >> 12
+        self._side_to_move ^= 1
+        self._castling_rights = castling_rights
+        self._en_passant_square = en_passant_square
+        color_idx, piece_idx = divmod(self._squares[to_square], 6)
+
+        if flags & PROMOTION:
+            self.remove_piece(color_idx, piece_idx, to_square)
+            self.put_piece(color_idx, PAWN, from_square)
+        else:
+            self.move_piece(color_idx, piece_idx, to_square, from_square)
+            if flags == EN_PASSANT:
+                self.put_piece(color_idx ^ 1, PAWN, to_square + (8 if color_idx == WHITE else -8))
+            elif flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+                self.move_piece(color_idx, ROOK, rook_to, rook_from)
+
+        if captured != NO_PIECE:
+            self.put_piece(color_idx ^ 1, captured % 6, to_square)
+        self._key = key
+
+    def make_null_move(self) -> None:
+        # Passes the turn, used by the null-move pruning of the search. Never made while in check.
+        self._undo_stack.append((NULL_MOVE, NO_PIECE, self._castling_rights, self._en_passant_square, self._key))
+        self._key ^= self._state_key()
+        self._en_passant_square = NO_SQUARE
+        self._side_to_move ^= 1
+        self._key ^= self._state_key()
+
+    def unmake_null_move(self) -> None:
+        _, _, _, self._en_passant_square, self._key = self._undo_stack.pop()
+        self._side_to_move ^= 1
+
+    @property
+    def last_move(self) -> Optional[int]:
+        return self._undo_stack[-1][0] if self._undo_stack else None
+
+    @property
+    def ply(self) -> int:
+        return len(self._undo_stack)
+
+    def material(self, color_idx: int) -> int:
+        return self._material[color_idx]
+
+    @property
+    def middlegame_score(self) -> int:
+        return self._middlegame_score
+
+    @property
+    def endgame_score(self) -> int:
+        return self._endgame_score
+
+    @property
+    def phase(self) -> int:
+        return self._phase
+
+    def has_non_pawn_material(self, color_idx: int) -> bool:
+        # Positions with king and pawns only are where passing would be an illegal advantage (zugzwang)
+        bitboards = self._bitboards
+        base = color_idx * 6
+        return bool(bitboards[base + ROOK] | bitboards[base + KNIGHT] | bitboards[base + BISHOP] |
+                    bitboards[base + QUEEN])
+
+    def put_piece_object(self, piece: Piece) -> None:
+        self.put_piece(piece.color_index, piece.piece_index, piece.square)
+
+    def remove_piece_object(self, piece: Piece) -> None:
+        self.remove_piece(piece.color_index, piece.piece_index, piece.square)
+
+    def piece_at(self, square: int) -> Optional[Tuple[int, int]]:
+        code = self._squares[square]
+        return None if code == NO_PIECE else divmod(code, 6)
+
+    @property
+    def squares(self) -> List[int]:
+        return self._squares
+
+    def update_state(self, current_player, opponent) -> None:
+        # Side to move, castling rights and en passant square are derived from the piece objects of the players
+        self._key ^= self._state_key()
+        self._side_to_move = current_player.color_index
+
+        self._castling_rights = 0
+        for player in (current_player, opponent):
+            king = player.king
+            if king is None or king.is_moved:
+                continue
+            home_square = 60 if player.color_index == WHITE else 4
+            if king.square != home_square:
+                continue
+            kingside, queenside = ((WHITE_KINGSIDE, WHITE_QUEENSIDE) if player.color_index == WHITE else
+                                   (BLACK_KINGSIDE, BLACK_QUEENSIDE))
+            for col, right in ((7, kingside), (0, queenside)):
+                rook = player.get_piece_at(home_square >> 3, col)
+                if rook is not None and rook.piece_index == ROOK and not rook.is_moved:
+                    self._castling_rights |= right
+
+        self._en_passant_square = NO_SQUARE
+        last_moved_piece = opponent.last_moved_piece
+        if (last_moved_piece is not None and last_moved_piece.piece_index == PAWN and
+                last_moved_piece.is_en_passant and last_moved_piece.color_index == opponent.color_index):
+            # The square behind the pawn, seen from the side that moved it
+            self._en_passant_square = self._capturable_en_passant(
+                last_moved_piece.square + (8 if opponent.color_index == WHITE else -8), current_player.color_index)
+        self._key ^= self._state_key()
+
+    def _state_key(self) -> int:
+        return state_key(self._side_to_move, self._castling_rights, self._en_passant_square)
+
+    def _capturable_en_passant(self, square: int, color_idx: int) -> int:
+        # The en passant square is only kept if a pawn of color_idx can capture onto it. It is part of the Zobrist
+        # key, positions that differ by an en passant square nobody can use would get different keys.
+        if PAWN_ATTACKS[color_idx ^ 1][square] & self._bitboards[color_idx * 6 + PAWN]:
+            return square
+        return NO_SQUARE
+
+    @property
+    def zobrist_key(self) -> int:
+        return self._key
+
+    @property
+    def pawn_key(self) -> int:
+        return self._pawn_key
+
+    @property
+    def bitboards(self) -> List[int]:
+        return self._bitboards
+
+    def bitboard(self, color_idx: int, piece_idx: int) -> int:
+        return self._bitboards[bitboard_index(color_idx, piece_idx)]
+
+    def occupancy(self, color_idx: int) -> int:
+        return self._occupancy[color_idx]
+
+    @property
+    def all_occupancy(self) -> int:
+        return self._occupancy[WHITE] | self._occupancy[BLACK]
+
+    def is_occupied(self, square: int) -> bool:
+        return bool((self._occupancy[WHITE] | self._occupancy[BLACK]) & SQUARE_BITS[square])
+
+    def is_occupied_by(self, color_idx: int, square: int) -> bool:
+        return bool(self._occupancy[color_idx] & SQUARE_BITS[square])
+
+    def king_square(self, color_idx: int) -> int:
+        king_bitboard = self._bitboards[color_idx * 6 + KING]
+        return (king_bitboard & -king_bitboard).bit_length() - 1
+
+    @property
+    def side_to_move(self) -> int:
+        return self._side_to_move
+
+    @side_to_move.setter
+    def side_to_move(self, value: int) -> None:
+        self._key ^= self._state_key()
+        self._side_to_move = value
+        self._key ^= self._state_key()
+
+    @property
+    def side_to_move_color(self) -> Color:
+        return Color.WHITE if self._side_to_move == WHITE else Color.BLACK
+
+    @property
+    def castling_rights(self) -> int:
+        return self._castling_rights
+
+    @castling_rights.setter
+    def castling_rights(self, value: int) -> None:
+        self._key ^= self._state_key()
+        self._castling_rights = value
+        self._key ^= self._state_key()
+
+    @property
+    def en_passant_square(self) -> int:
+        return self._en_passant_square
+
+    @en_passant_square.setter
+    def en_passant_square(self, value: int) -> None:
+        self._key ^= self._state_key()
+        self._en_passant_square = value
+        self._key ^= self._state_key()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (self._bitboards == other._bitboards and
+                self._side_to_move == other._side_to_move and
+                self._castling_rights == other._castling_rights and
+                self._en_passant_square == other._en_passant_square)
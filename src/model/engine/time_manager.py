@@ -0,0 +1,78 @@
+import time
+from typing import Optional
+
+# Time budget of a single move, computed from the clock of the player:
+#
+#     soft deadline   no new iteration is started after it, it grows while the best move keeps changing
+#                     between iterations and shrinks while it stays the same
+#     hard deadline   the running iteration is aborted, the search polls it every CHECK_INTERVAL nodes
+#
+# Without a clock (time is None) both deadlines are infinite and the search is limited by its depth only.
+
+# Moves the remaining time is expected to last for, at least MIN_MOVES_TO_GO
+EXPECTED_GAME_LENGTH = 50
+MIN_MOVES_TO_GO = 20
+# Share of the increment spent on the current move
+INCREMENT_SHARE = 0.8
+# The hard deadline is a multiple of the soft one but never more than a share of the remaining time
+HARD_LIMIT_FACTOR = 4.0
+MAX_REMAINING_SHARE = 0.3
+# Reserved for the overhead of playing the move, the clock only counts whole seconds
+MOVE_OVERHEAD = 0.5
+MIN_TIME = 0.05
+# Soft deadline scale by the number of iterations the best move stayed the same
+STABILITY_SCALES = (1.6, 1.2, 1.0, 0.8, 0.6)
+# Nodes between two clock polls, a power of two so the check is a mask test
+CHECK_INTERVAL = 512
+
+
+class TimeManager:
+
+    def __init__(self) -> None:
+        self._start_time = 0.0
+        self._soft_limit = float('inf')
+        self._hard_limit = float('inf')
+        self._best_move: Optional[int] = None
+        self._stable_iterations = 0
+
+    def start(self, remaining: Optional[float], increment: float = 0.0, moves_played: int = 0) -> None:
+        self._start_time = time.perf_counter()
+        self._best_move = None
+        self._stable_iterations = 0
+        if remaining is None:
+            self._soft_limit = self._hard_limit = float('inf')
+            return
+
+        available = max(MIN_TIME, remaining - MOVE_OVERHEAD)
+        moves_to_go = max(MIN_MOVES_TO_GO, EXPECTED_GAME_LENGTH - moves_played)
+        soft_limit = available / moves_to_go + increment * INCREMENT_SHARE
+        self._hard_limit = max(MIN_TIME, min(soft_limit * HARD_LIMIT_FACTOR, available * MAX_REMAINING_SHARE,
+                                             available))
+        self._soft_limit = min(soft_limit, self._hard_limit)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_time
+
+    @property
+    def soft_limit(self) -> float:
+        # Never past the hard deadline, an iteration started after it would only be aborted
+        scale = STABILITY_SCALES[min(self._stable_iterations, len(STABILITY_SCALES) - 1)]
+        return min(self._soft_limit * scale, self._hard_limit)
+
+    @property
+    def hard_limit(self) -> float:
+        return self._hard_limit
+
+    def on_iteration_complete(self, best_move: int) -> None:
+        if best_move == self._best_move:
+            self._stable_iterations += 1
+        else:
+            self._best_move = best_move
+            self._stable_iterations = 0
+
+    def can_start_iteration(self) -> bool:
+        return self.elapsed < self.soft_limit
+
+    def is_hard_limit_reached(self) -> bool:
+        return self.elapsed >= self._hard_limit
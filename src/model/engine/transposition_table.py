@@ -0,0 +1,159 @@
+from array import array
+from typing import Optional, Tuple
+
+from src.model.engine.move import NULL_MOVE
+
+# Transposition table: results of earlier searches by Zobrist key (see zobrist.py), so positions reached by a
+# different move order, or searched again for the next move, are not searched from scratch.
+#
+# The table is a preallocated array of unsigned 64-bit words. Every bucket holds two entries of two words each,
+# the key XOR the packed data and the packed data:
+#
+#     bits  0-15  best move (see move.py)
+#     bits 16-47  score + 2^31
+#     bits 48-55  remaining depth of the search that stored the entry
+#     bits 56-57  bound (EXACT, LOWER_BOUND, UPPER_BOUND)
+#     bits 58-63  age (search generation modulo 64)
+#
+# The first entry of a bucket is replaced only by a deeper search or when it is stale (an earlier generation),
+# the second one is always replaced.
+#
+# The table can be placed in a buffer shared by several processes (Lazy SMP, see parallel_alpha_beta.py), which
+# read and write it without locks. The two words of an entry are written one after the other, so a reader can see
+# the key word of one entry with the data word of another. Storing the key XOR the data makes such a torn entry
+# fail the key check, it is a miss instead of a wrong move or score.
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+ENTRY_WORDS = 2
+BUCKET_WORDS = 2 * ENTRY_WORDS
+BUCKET_BYTES = BUCKET_WORDS * 8
+
+SCORE_OFFSET = 1 << 31
+AGE_MASK = 63
+
+
+def table_bytes(size_mb: int) -> int:
+    # The number of buckets is a power of two, the bucket of a key is selected by its low bits
+    bucket_count = 1
+    while bucket_count * 2 * BUCKET_BYTES <= size_mb * 1024 * 1024:
+        bucket_count *= 2
+    return bucket_count * BUCKET_BYTES
+
+
+def _pack(move: int, score: int, depth: int, bound: int, age: int) -> int:
+    return move | (score + SCORE_OFFSET) << 16 | depth << 48 | bound << 56 | age << 58
+
+
+class TranspositionTable:
+
+    def __init__(self, size_mb: int = 16, buffer=None) -> None:
+        # With a buffer (of at least table_bytes(size_mb) bytes, zeroed) the table lives in it instead of an array
+        # of its own, the buffer is not copied
+        size_bytes = table_bytes(size_mb)
+        self._bucket_mask = size_bytes // BUCKET_BYTES - 1
+        if buffer is None:
+            self._table = array('Q', bytes(size_bytes))
+        else:
+            self._table = memoryview(buffer)[:size_bytes].cast('Q')
+        self._age = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._table) * 8
+
+    @property
+    def bucket_count(self) -> int:
+        return self._bucket_mask + 1
+
+    @property
+    def age(self) -> int:
+        return self._age
+
+    @age.setter
+    def age(self, age: int) -> None:
+        # Processes sharing the table search the same generation
+        self._age = age & AGE_MASK
+
+    def new_search(self) -> None:
+        # Entries of earlier searches stay usable but are replaced first
+        self._age = (self._age + 1) & AGE_MASK
+
+    def clear(self) -> None:
+        # In place, a shared buffer stays shared
+        words = memoryview(self._table).cast('B')
+        words[:] = bytes(len(words))
+        words.release()
+        self._age = 0
+        self.reset_stats()
+
+    def close(self) -> None:
+        # Releases a shared buffer, the table can't be used afterwards
+        if isinstance(self._table, memoryview):
+            self._table.release()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        # (move, score, depth, bound) of the position, None if it is not in the table
+        table = self._table
+        index = (key & self._bucket_mask) * BUCKET_WORDS
+        data = table[index + 1]
+        if table[index] ^ data != key:
+            data = table[index + 3]
+            if table[index + 2] ^ data != key:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return data & 0xFFFF, ((data >> 16) & 0xFFFFFFFF) - SCORE_OFFSET, (data >> 48) & 0xFF, (data >> 56) & 3
+
+    def store(self, key: int, move: int, score: int, depth: int, bound: int) -> None:
+        table = self._table
+        index = (key & self._bucket_mask) * BUCKET_WORDS
+        age = self._age
+        depth = max(0, min(depth, 0xFF))
+
+        old_data = table[index + 1]
+        if table[index] ^ old_data == key:
+            # Keep the best move of the position if the new search did not find one
+            if move == NULL_MOVE:
+                move = old_data & 0xFFFF
+        else:
+            is_stale = (old_data >> 58) != age
+            if old_data != 0 and not is_stale and depth < (old_data >> 48) & 0xFF:
+                # The depth-preferred entry stays, the new one goes to the always-replace slot
+                index += ENTRY_WORDS
+                old_data = table[index + 1]
+                if table[index] ^ old_data == key:
+                    if move == NULL_MOVE:
+                        move = old_data & 0xFFFF
+                elif old_data != 0 and (old_data >> 58) == age:
+                    self.collisions += 1
+            elif old_data != 0 and not is_stale:
+                self.collisions += 1
+
+        data = _pack(move, score, depth, bound, age)
+        table[index] = key ^ data
+        table[index + 1] = data
+
+    def usage(self, sample_buckets: int = 1000) -> float:
+        # Fraction of the entries of the current search in the first buckets, like the UCI hashfull
+        table = self._table
+        age = self._age
+        buckets = min(sample_buckets, self.bucket_count)
+        used = sum(1 for index in range(0, buckets * BUCKET_WORDS, ENTRY_WORDS)
+                   if table[index + 1] != 0 and (table[index + 1] >> 58) == age)
+        return used / (buckets * 2)
@@ -0,0 +1,66 @@
+import random
+from typing import Tuple
+
+from src.model.engine.bitboard import NO_SQUARE, WHITE, BLACK, PAWN
+
+# Zobrist keys: every (piece code, square) pair, the side to move, every castling right and every en passant file
+# gets a random 64-bit number. The key of a position is the XOR of the numbers of everything that is on it, so a
+# move changes the key with a handful of XORs (see Position.make_move) instead of hashing the whole position.
+#
+# The pawn key is the XOR of the numbers of the pawns only, it keys the pawn structure evaluation (see
+# pawn_structure.py), which changes with a small share of the moves.
+
+# A fixed seed keeps the keys equal between runs and processes
+_random = random.Random(0x5EED)
+
+PIECE_KEYS: Tuple[Tuple[int, ...], ...] = tuple(tuple(_random.getrandbits(64) for _ in range(64)) for _ in range(12))
+SIDE_KEY: int = _random.getrandbits(64)
+_CASTLING_RIGHT_KEYS = tuple(_random.getrandbits(64) for _ in range(4))
+EN_PASSANT_KEYS: Tuple[int, ...] = tuple(_random.getrandbits(64) for _ in range(8))
+
+
+def _castling_key(castling_rights: int) -> int:
+    key = 0
+    for bit, right_key in enumerate(_CASTLING_RIGHT_KEYS):
+        if castling_rights & (1 << bit):
+            key ^= right_key
+    return key
+
+
+# Key of every combination of the castling right bits, no rights hash to zero
+CASTLING_KEYS: Tuple[int, ...] = tuple(_castling_key(castling_rights) for castling_rights in range(16))
+
+
+def state_key(side_to_move: int, castling_rights: int, en_passant_square: int) -> int:
+    # Everything but the pieces
+    key = CASTLING_KEYS[castling_rights]
+    if side_to_move == BLACK:
+        key ^= SIDE_KEY
+    if en_passant_square != NO_SQUARE:
+        key ^= EN_PASSANT_KEYS[en_passant_square & 7]
+    return key
+
+
+def compute_key(position) -> int:
+    # Key computed from scratch, the position keeps its key up to date incrementally
+    key = state_key(position.side_to_move, position.castling_rights, position.en_passant_square)
+    for code, bitboard in enumerate(position.bitboards):
+        piece_keys = PIECE_KEYS[code]
+        while bitboard:
+            bit = bitboard & -bitboard
+            bitboard ^= bit
+            key ^= piece_keys[bit.bit_length() - 1]
+    return key
+
+
+def compute_pawn_key(position) -> int:
+    # Pawn key computed from scratch, the position keeps it up to date incrementally
+    key = 0
+    for color_idx in (WHITE, BLACK):
+        piece_keys = PIECE_KEYS[color_idx * 6 + PAWN]
+        bitboard = position.bitboard(color_idx, PAWN)
+        while bitboard:
+            bit = bitboard & -bitboard
+            bitboard ^= bit
+            key ^= piece_keys[bit.bit_length() - 1]
+    return key
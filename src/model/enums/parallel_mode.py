@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ParallelMode(Enum):
+    ROOT_SPLIT = 1
+    LAZY_SMP = 2
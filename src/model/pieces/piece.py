@@ -1,87 +1,57 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from typing import Tuple, Set
+from src.model.engine.bitboard import (EMPTY_BOARD, SQUARE_BITS, PIECE_VALUES, bitboard_of, color_index,
+                                       coordinates_set, piece_index)
 from src.model.enums.color import Color
 from src.model.enums.piece_type import PieceType
 
 
 class Piece(ABC):
+    # Pieces are slotted and keep integer color and type codes next to the enums,
+    # the engine and the players only use the integer codes
+    __slots__ = ('_type', '_color', '_color_idx', '_piece_idx', '_col', '_row', '_possible_mask', '_is_moved')
+
     def __init__(self, piece_type: PieceType, color: Color, row: int, col: int):
         self._type = piece_type
         self._color = color
+        self._color_idx: int = color_index(color)
+        self._piece_idx: int = piece_index(piece_type)
         self._col = col
         self._row = row
-        self._value = self._init_value()
-        self._attacked_fields = set()
-        self._possible_fields = set()
+        # Squares the piece can legally move to
+        self._possible_mask: int = EMPTY_BOARD
 
         self._is_moved = False
 
-    def _init_value(self):
-        if self._type == PieceType.PAWN:
-            return 1
-        elif self._type == PieceType.KNIGHT:
-            return 3
-        elif self._type == PieceType.BISHOP:
-            return 3
-        elif self._type == PieceType.ROOK:
-            return 5
-        elif self._type == PieceType.QUEEN:
-            return 9
-        elif self._type == PieceType.KING:
-            return 100
-
     @property
     def possible_fields(self) -> Set[Tuple[int, int]]:
-        return self._possible_fields
+        return coordinates_set(self._possible_mask)
 
     @possible_fields.setter
     def possible_fields(self, value: Set[Tuple[int, int]]):
-        self._possible_fields = value
-
-    @abstractmethod
-    def update_attacked_fields(self, current_player_piece_coordinates: Set[Tuple[int, int]],
-                               opponent_piece_coordinates: Set[Tuple[int, int]]):
-        pass
-
-    def is_movable(self):
-        return len(self._possible_fields) > 0
-
-    def update_possible_fields(self, current_player, opponent):
-        self._possible_fields.clear()
-        for move in self._attacked_fields:
-            if not self.king_in_check_after_move(move, current_player, opponent):
-                self._possible_fields.add(move)
-
-    def king_in_check_after_move(self, move, current_player, opponent) -> bool:
-        result = False
-
-        from_row = self.row
-        from_col = self.col
+        self._possible_mask = bitboard_of(value)
 
-        self.row = move[0]
-        self.col = move[1]
-
-        captured_piece = None
-        if opponent.has_piece_at(move[0], move[1]):
-            captured_piece = opponent.get_piece_at(move[0], move[1])
-            opponent.remove_piece_at(move[0], move[1])
+    @property
+    def possible_mask(self) -> int:
+        return self._possible_mask
 
-        opponent.update_pieces_attacked_fields(current_player.piece_coordinates)
-        if current_player.king.coordinates in opponent._attacked_fields:
-            result = True
+    @possible_mask.setter
+    def possible_mask(self, value: int):
+        self._possible_mask = value
 
-        if captured_piece is not None:
-            opponent.add_piece(captured_piece)
+    def can_move_to(self, row: int, col: int) -> bool:
+        return bool(self._possible_mask & SQUARE_BITS[row * 8 + col])
 
-        # opponent.update_pieces_attacked_fields(current_player.piece_coordinates)
-        self.row = from_row
-        self.col = from_col
+    @property
+    def square(self) -> int:
+        return self._row * 8 + self._col
 
-        return result
+    def is_movable(self):
+        return self._possible_mask != EMPTY_BOARD
 
     @property
     def value(self) -> int:
-        return self._value
+        return PIECE_VALUES[self._piece_idx]
 
     @property
     def is_moved(self):
@@ -95,6 +65,10 @@ class Piece(ABC):
     def type(self):
         return self._type
 
+    @property
+    def piece_index(self) -> int:
+        return self._piece_idx
+
     @property
     def col(self) -> int:
         return self._col
@@ -118,6 +92,11 @@ class Piece(ABC):
     @color.setter
     def color(self, value: Color):
         self._color = value
+        self._color_idx = color_index(value)
+
+    @property
+    def color_index(self) -> int:
+        return self._color_idx
 
     @property
     def coordinates(self):
@@ -125,4 +104,4 @@ class Piece(ABC):
 
     @coordinates.setter
     def coordinates(self, value):
-        self.row, self.col = value
+        self._row, self._col = value
@@ -1,4 +1,17 @@
+from typing import List, NamedTuple, Optional, Tuple
+
 from src.controller.game_saver import GameSaver
+from src.model.engine.bitboard import SQUARE_COORDINATES, WHITE, PAWN, QUEEN
+from src.model.engine.evaluation import PIECE_SCORES, evaluate
+from src.model.engine.evaluation_cache import EvaluationCache
+from src.model.engine.pawn_structure import PawnTable
+from src.model.engine.move import NULL_MOVE, EN_PASSANT, PROMOTION_PIECES, move_from, move_to, move_to_uci
+from src.model.engine.move_generator import (generate_captures, is_legal, is_pseudo_legal, pinned_pieces,
+                                             checkers_of)
+from src.model.engine.move_ordering import MoveOrdering, MAX_PLY, CAPTURE_FLAG, PROMOTION_FLAG, capture_score
+from src.model.engine.move_picker import pick_moves, TACTICAL_FLAGS
+from src.model.engine.time_manager import TimeManager, CHECK_INTERVAL
+from src.model.engine.transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
 from src.model.players.player import Player
 
 import time
@@ -12,109 +25,505 @@ def timer_decorator(func):
         return result
     return wrapper
 
+QUEEN_PROMOTION = PROMOTION_PIECES.index(QUEEN)
+
+
+class SearchAborted(Exception):
+    pass
+
+
+class PruningOptions(NamedTuple):
+    # Each technique can be switched off on its own, to compare node counts or to rule it out when a search goes
+    # wrong
+    null_move: bool = True
+    late_move_reductions: bool = True
+    futility: bool = True
+    # Null move: searched this many plies less deep, only with at least null_move_min_depth plies left
+    null_move_reduction: int = 2
+    null_move_min_depth: int = 3
+    # Late move reductions: quiet moves after the first late_move_index ones, with enough depth left
+    late_move_index: int = 3
+    late_move_min_depth: int = 3
+    # Futility: margin per remaining ply, in centipawns, up to futility_depth plies from the leaves
+    futility_margin: int = 150
+    futility_depth: int = 2
+
+
 class AlphaBeta(Player):
-    def __init__(self, name: str, color, board, time: int):
+    CHECKMATE_SCORE = 100000
+    # Scores beyond this are mate scores
+    MATE_BOUND = CHECKMATE_SCORE - 1000
+    # Two pawns, a capture that can't lift the evaluation to alpha by this margin is not searched
+    DELTA_MARGIN = 200
+
+    # Aspiration windows: half a pawn around the score of the previous iteration, widened by this factor on
+    # every failure and opened once they are wider than ASPIRATION_MAX_WINDOW
+    ASPIRATION_WINDOW = 50
+    ASPIRATION_WIDENING = 2
+    ASPIRATION_MAX_WINDOW = 1000
+    ASPIRATION_MIN_DEPTH = 3
+
+    DEFAULT_DEPTH = 3
+    # Depth limit of timed searches, the clock stops them long before
+    MAX_TIMED_DEPTH = 32
+
+    def __init__(self, name: str, color, board, time: Optional[int], max_depth: Optional[int] = None,
+                 hash_size_mb: int = 16, increment: int = 0, pruning: PruningOptions = PruningOptions(),
+                 evaluation_cache_mb: int = 2, pawn_table_mb: int = 1):
         super().__init__(name, color, board, time)
         self.selected_piece = None
         self.chosen_move = None
         self.state_counter = 0
+        # Without a clock the search goes to a fixed depth, with one it goes as deep as its time allows
+        if max_depth is None:
+            max_depth = self.DEFAULT_DEPTH if time is None else self.MAX_TIMED_DEPTH
+        # The killer moves are kept per ply, the search can't go deeper than they reach
+        self.max_depth = min(max_depth, MAX_PLY - 1)
+        self.increment = increment
+        self.moves_played = 0
+        self.time_manager = TimeManager()
         self.game_saver = GameSaver()
+        # Killer, history and counter-move tables, kept between moves
+        self.ordering = MoveOrdering()
+        # Kept between moves, entries of earlier moves are aged out
+        self.transposition_table = TranspositionTable(hash_size_mb)
+        # Static evaluations and pawn structure scores, kept for the whole game
+        self.evaluation_cache = EvaluationCache(evaluation_cache_mb)
+        self.pawn_table = PawnTable(pawn_table_mb)
+        # Expected line of play and depth of the last completed iteration
+        self.principal_variation: List[int] = []
+        self.completed_depth = 0
+        self.pruning = pruning
+        self._following_pv = False
+        self._stop_requested = False
 
     @timer_decorator
     def choose_move(self, opponent):
+        # Iterative deepening: depth 1, 2, ... up to max_depth, every iteration orders its moves by the principal
+        # variation and the transposition table entries of the previous one. If the search is stopped the best
+        # move of the last completed iteration is played.
+        # The search plays moves on a copy of the board position with make/unmake, the pieces are left untouched
         self.state_counter = 0
+        self.ordering.new_search()
+        self.transposition_table.new_search()
+        self.transposition_table.reset_stats()
+        self.evaluation_cache.reset_stats()
+        self.pawn_table.reset_stats()
+        self.principal_variation = []
+        self.completed_depth = 0
+        self._stop_requested = False
+        self.time_manager.start(self.time, self.increment, self.moves_played)
+        position = self._board.position.copy()
         best_move = None
-        max_value = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
-        selected_piece = None
-        maximizing_player = self
-        minimizing_player = opponent
-
-        for piece in self.get_movable_pieces():
-            for move in piece.possible_fields:
-                score = self.alpha_beta(0, 2, alpha, beta, True, move, piece,
-                                        maximizing_player, minimizing_player)  # depth, max_depth, alpha, beta, is_maximizing_player
-
-                if score > max_value:
-                    max_value = score
-                    selected_piece = piece
-                    best_move = move
+        max_value = None
+
+        for iteration_depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self.search_aspiration(position, iteration_depth, max_value)
+            except SearchAborted:
+                print(f"Depth {iteration_depth} aborted")
+                break
+            if move is None:
+                break
+            best_move, max_value = move, score
+            self.completed_depth = iteration_depth
+            self.principal_variation = self.read_principal_variation(position, iteration_depth)
+            print(f"Depth {iteration_depth}: score {score}, states {self.state_counter}, "
+                  f"time {self.time_manager.elapsed:.2f} s, "
+                  f"pv {' '.join(move_to_uci(pv_move) for pv_move in self.principal_variation)}")
+            self.time_manager.on_iteration_complete(move)
+            if not self.time_manager.can_start_iteration():
+                break
+
+        self.moves_played += 1
 
+        table = self.transposition_table
         print(f"State counter: {self.state_counter}")
-        self.selected_piece = selected_piece
-        print(f"Best move: {best_move}"
+        print(f"Transposition table: {table.hits} hits, {table.misses} misses, {table.collisions} collisions, "
+              f"{table.usage():.0%} used")
+        print(f"Evaluation cache: {self.evaluation_cache.hits} hits, {self.evaluation_cache.misses} misses, "
+              f"{self.evaluation_cache.hit_rate:.0%} hit rate")
+        print(f"Pawn table: {self.pawn_table.hits} hits, {self.pawn_table.misses} misses, "
+              f"{self.pawn_table.hit_rate:.0%} hit rate")
+        if best_move is None:
+            self.selected_piece = None
+            return None
+
+        self.selected_piece = self.get_piece_at(*SQUARE_COORDINATES[move_from(best_move)])
+        print(f"Best move: {SQUARE_COORDINATES[move_to(best_move)]}"
               f"\nMax value: {max_value}")
-        if self.selected_piece is not None:
-            print(f"Selected piece: {self.selected_piece.coordinates}")
+        print(f"Selected piece: {self.selected_piece.coordinates}")
         return best_move
 
-    def alpha_beta(self, depth, max_depth, alpha, beta, is_maximizing_player, move, piece, maximizing_player, minimizing_player):
-        self.state_counter += 1
-        from_row, from_col = piece.coordinates
-
-        if depth == max_depth or self.is_game_over():
-            return self.get_state_score(maximizing_player, minimizing_player)
-
-        if is_maximizing_player:
-            max_eval = float('-inf')
-            captured_piece = self.simulate_move(move, piece, maximizing_player, minimizing_player)
-            for next_piece in maximizing_player.get_movable_pieces():
-                for next_move in next_piece.possible_fields:
-                    eval = self.alpha_beta(depth + 1, max_depth, alpha, beta, False, next_move,
-                                           next_piece, maximizing_player, minimizing_player)
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        break
-
-            if captured_piece is not None:
-                minimizing_player.add_piece(captured_piece)
-            piece.coordinates = (from_row, from_col)
-
-            return max_eval
+    def search_root(self, position, max_depth, alpha=float('-inf'),
+                    beta=float('inf')) -> Tuple[float, Optional[int]]:
+        # A score at or below alpha is an upper bound and its move may not be the best one, a score at or above
+        # beta a lower bound
+        best_move = None
+        max_value = float('-inf')
+        original_alpha = alpha
+
+        self._following_pv = bool(self.principal_variation)
+        for move_count, move in enumerate(self.root_moves(position), start=1):
+            position.make_move(move)
+            score = self.search_move(position, 1, max_depth, alpha, beta, True, move_count == 1)
+            position.unmake_move()
+            self._following_pv = False
+
+            if score > max_value:
+                max_value = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_move is not None:
+            self.store_root(position, max_depth, best_move, max_value, original_alpha, beta)
+        return max_value, best_move
+
+    def root_moves(self, position) -> List[int]:
+        # Legal moves of the root, the best move of the previous iteration first
+        side_to_move = position.side_to_move
+        pinned = pinned_pieces(position, side_to_move)
+        checkers = checkers_of(position, side_to_move)
+        hash_move = self.principal_variation[0] if self.principal_variation else NULL_MOVE
+        if hash_move == NULL_MOVE:
+            entry = self.transposition_table.probe(position.zobrist_key)
+            if entry is not None:
+                hash_move = entry[0]
+        return [move for move in pick_moves(position, hash_move, ordering=self.ordering)
+                if is_legal(position, move, pinned, checkers)]
+
+    def store_root(self, position, max_depth, best_move, max_value, alpha, beta) -> None:
+        if max_value <= alpha:
+            bound = UPPER_BOUND
+        elif max_value >= beta:
+            bound = LOWER_BOUND
         else:
-            min_eval = float('inf')
-            captured_piece = self.simulate_move(move, piece, minimizing_player, maximizing_player)
-            for next_piece in minimizing_player.get_movable_pieces():
-                for next_move in next_piece.possible_fields:
-                    eval = self.alpha_beta(depth + 1, max_depth, alpha, beta, True, next_move,
-                                           next_piece, maximizing_player, minimizing_player)
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        break
-            if captured_piece is not None:
-                maximizing_player.add_piece(captured_piece)
-            piece.coordinates = (from_row, from_col)
-            return min_eval
-
-
-    def is_game_over(self):
-        return False
-
-    def get_state_score(self, maximizing_player, minimizing_player) -> int:
-        score = (maximizing_player.get_score() - minimizing_player.get_score()) * 10
-        if maximizing_player.king.coordinates in minimizing_player._attacked_fields:
-            score -= 1000
-
-        if minimizing_player.king.coordinates in maximizing_player._attacked_fields:
-            score += 1000
+            bound = EXACT
+        self.transposition_table.store(position.zobrist_key, best_move, self.score_to_table(max_value, 0),
+                                       max_depth, bound)
 
-        return score
+    def search_aspiration(self, position, max_depth, previous_score) -> Tuple[float, Optional[int]]:
+        # The score rarely moves far between iterations, a narrow window around the previous one prunes more.
+        # A score outside of it is only a bound, the window is widened on that side and the depth searched again,
+        # wider at every failure until it is open.
+        if (max_depth < self.ASPIRATION_MIN_DEPTH or previous_score is None or
+                abs(previous_score) >= self.MATE_BOUND):
+            return self.search_root(position, max_depth)
+        delta = self.ASPIRATION_WINDOW
+        alpha, beta = previous_score - delta, previous_score + delta
+        while True:
+            score, move = self.search_root(position, max_depth, alpha, beta)
+            if move is None:
+                return score, move
+            if score <= alpha:
+                print(f"Depth {max_depth}: fail low at {score}")
+                alpha = score - delta if delta < self.ASPIRATION_MAX_WINDOW else float('-inf')
+            elif score >= beta:
+                print(f"Depth {max_depth}: fail high at {score}")
+                beta = score + delta if delta < self.ASPIRATION_MAX_WINDOW else float('inf')
+            else:
+                return score, move
+            delta *= self.ASPIRATION_WIDENING
 
-    def simulate_move(self, move, piece, current_player, opponent):
-        piece.coordinates = move
-        captured_piece = None
-        if opponent.has_piece_at(*move):
-            captured_piece = opponent.get_piece_at(*move)
-            opponent.remove_piece_at(*move)
+    def search_move(self, position, depth, max_depth, alpha, beta, is_maximizing_player, is_first_move,
+                    reduction=0):
+        # Principal variation search: the first move of a node is expected to be the best one and is searched
+        # with the full window. The other moves only have to be proven worse, with a null window around the bound
+        # of the side to move, and are searched again with the full window if they turn out better.
+        # is_maximizing_player is the side that played the move, the searched position belongs to the opponent
+        bound = alpha if is_maximizing_player else beta
+        if is_first_move or bound in (float('-inf'), float('inf')):
+            null_alpha, null_beta = alpha, beta
+        elif is_maximizing_player:
+            null_alpha, null_beta = alpha, alpha + 1
+        else:
+            null_alpha, null_beta = beta - 1, beta
 
-        return captured_piece
+        eval = self.alpha_beta(position, depth, max_depth - reduction, null_alpha, null_beta, not is_maximizing_player)
+        if reduction and (eval > alpha if is_maximizing_player else eval < beta):
+            eval = self.alpha_beta(position, depth, max_depth, null_alpha, null_beta, not is_maximizing_player)
+        if (null_alpha, null_beta) != (alpha, beta) and alpha < eval < beta:
+            eval = self.alpha_beta(position, depth, max_depth, alpha, beta, not is_maximizing_player)
+        return eval
 
-    def restore_state(self):
-        pass
+    def read_principal_variation(self, position, max_length: int) -> List[int]:
+        # The expected line of play, following the best moves stored in the transposition table
+        principal_variation = []
+        seen_keys = set()
+        while len(principal_variation) < max_length and position.zobrist_key not in seen_keys:
+            seen_keys.add(position.zobrist_key)
+            entry = self.transposition_table.probe(position.zobrist_key)
+            if entry is None or not is_pseudo_legal(position, entry[0]):
+                break
+            side_to_move = position.side_to_move
+            if not is_legal(position, entry[0], pinned_pieces(position, side_to_move),
+                            checkers_of(position, side_to_move)):
+                break
+            position.make_move(entry[0])
+            principal_variation.append(entry[0])
+        for _ in principal_variation:
+            position.unmake_move()
+        return principal_variation
+
+    def new_game(self) -> None:
+        # Nothing learned in an earlier game applies to the next one
+        self.ordering.clear()
+        self.transposition_table.clear()
+        self.evaluation_cache.clear()
+        self.pawn_table.clear()
+        self.principal_variation = []
+        self.moves_played = 0
 
-    def save_state(self):
+    def close(self) -> None:
+        # Releases what the player holds on to between moves, the serial search holds nothing outside the process
         pass
 
+    def stop(self) -> None:
+        # Can be called from another thread, the search returns the best move of the last completed iteration
+        self._stop_requested = True
+
+    def count_state(self) -> None:
+        self.state_counter += 1
+        # The clock is polled every few nodes, the first iteration always completes so there is a move to play
+        if (not self.state_counter & (CHECK_INTERVAL - 1) and self.completed_depth and
+                self.time_manager.is_hard_limit_reached()):
+            self._stop_requested = True
+        if self._stop_requested:
+            raise SearchAborted()
+
+    def alpha_beta(self, position, depth, max_depth, alpha, beta, is_maximizing_player, allow_null_move=True):
+        # Reduced searches (null move, late move reductions) lower max_depth, depth is always the distance from
+        # the root
+        if depth >= max_depth:
+            return self.quiescence(position, depth, alpha, beta, is_maximizing_player)
+        self.count_state()
+
+        # Scores are stored from the point of view of this player, the side to move is part of the key
+        key = position.zobrist_key
+        remaining_depth = max_depth - depth
+        hash_move = NULL_MOVE
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            hash_move, score, entry_depth, bound = entry
+            if entry_depth >= remaining_depth:
+                score = self.score_from_table(score, depth)
+                if (bound == EXACT or (bound == LOWER_BOUND and score >= beta) or
+                        (bound == UPPER_BOUND and score <= alpha)):
+                    return score
+        original_alpha, original_beta = alpha, beta
+
+        side_to_move = position.side_to_move
+        checkers = checkers_of(position, side_to_move)
+        pruning = self.pruning
+        static_eval = None
+        if not checkers and (pruning.null_move or (pruning.futility and remaining_depth <= pruning.futility_depth)):
+            static_eval = self.get_state_score(position)
+
+        if not checkers and static_eval is not None and not self._following_pv:
+            # Reverse futility: the static evaluation beats the window by a margin no quiet move can undo
+            if pruning.futility and remaining_depth <= pruning.futility_depth:
+                margin = pruning.futility_margin * remaining_depth
+                if is_maximizing_player and static_eval - margin >= beta and beta > -self.MATE_BOUND:
+                    return static_eval - margin
+                if not is_maximizing_player and static_eval + margin <= alpha and alpha < self.MATE_BOUND:
+                    return static_eval + margin
+
+            # Null move: if passing still fails high, a real move would too. Not with king and pawns only, where
+            # passing can be an advantage (zugzwang), and never twice in a row.
+            if (pruning.null_move and allow_null_move and remaining_depth >= pruning.null_move_min_depth and
+                    position.has_non_pawn_material(side_to_move) and
+                    (static_eval >= beta if is_maximizing_player else static_eval <= alpha)):
+                reduction = pruning.null_move_reduction + (1 if remaining_depth > 6 else 0)
+                position.make_null_move()
+                if is_maximizing_player:
+                    null_eval = self.alpha_beta(position, depth + 1, max_depth - reduction, beta - 1, beta,
+                                                False, False)
+                else:
+                    null_eval = self.alpha_beta(position, depth + 1, max_depth - reduction, alpha, alpha + 1,
+                                                True, False)
+                position.unmake_null_move()
+                # Mate scores of a null move search are not trusted, the side to move can't really pass
+                if is_maximizing_player and null_eval >= beta:
+                    return beta if null_eval > self.MATE_BOUND else null_eval
+                if not is_maximizing_player and null_eval <= alpha:
+                    return alpha if null_eval < -self.MATE_BOUND else null_eval
+
+        # Pseudo-legal moves are picked stage by stage and checked for legality right before they are searched
+        if self._following_pv:
+            # Still on the principal variation of the previous iteration, its move is searched first
+            if depth < len(self.principal_variation):
+                hash_move = self.principal_variation[depth]
+            else:
+                self._following_pv = False
+        ordering = self.ordering
+        previous_move = position.last_move or NULL_MOVE
+        killers = ordering.killers[depth]
+        moves = pick_moves(position, hash_move, killers, ordering.counter_move(previous_move), ordering)
+        pinned = pinned_pieces(position, side_to_move)
+        # Frontier nodes: quiet moves that can't lift the static evaluation into the window are skipped
+        futility_eval = None
+        if (pruning.futility and static_eval is not None and remaining_depth <= pruning.futility_depth and
+                not self._following_pv):
+            futility_eval = static_eval + (pruning.futility_margin * remaining_depth if is_maximizing_player else
+                                           -pruning.futility_margin * remaining_depth)
+        best_move = NULL_MOVE
+        best_eval = float('-inf') if is_maximizing_player else float('inf')
+        has_legal_move = False
+        searched_quiets = []
+        move_count = 0
+        for move in moves:
+            if not is_legal(position, move, pinned, checkers):
+                continue
+            has_legal_move = True
+            move_count += 1
+            is_quiet = not move & TACTICAL_FLAGS
+            position.make_move(move)
+            gives_check = is_quiet and bool(checkers_of(position, side_to_move ^ 1))
+
+            if (futility_eval is not None and is_quiet and not gives_check and move_count > 1 and
+                    (futility_eval <= alpha if is_maximizing_player else futility_eval >= beta)):
+                position.unmake_move()
+                best_eval = max(best_eval, futility_eval) if is_maximizing_player else min(best_eval, futility_eval)
+                continue
+
+            # Late move reductions: quiet moves late in the ordering are searched less deep first and only
+            # searched fully if they turn out better than expected
+            reduction = 0
+            if (pruning.late_move_reductions and is_quiet and not checkers and not gives_check and
+                    move_count > pruning.late_move_index and remaining_depth >= pruning.late_move_min_depth and
+                    move not in killers):
+                reduction = 1 if move_count <= 2 * pruning.late_move_index else 2
+                reduction = min(reduction, remaining_depth - 1)
+            eval = self.search_move(position, depth + 1, max_depth, alpha, beta, is_maximizing_player,
+                                    move_count == 1, reduction)
+            position.unmake_move()
+            self._following_pv = False
+
+            if is_maximizing_player:
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = move
+                alpha = max(alpha, eval)
+            else:
+                if eval < best_eval:
+                    best_eval = eval
+                    best_move = move
+                beta = min(beta, eval)
+            if beta <= alpha:
+                ordering.on_cutoff(side_to_move, depth, remaining_depth, move, previous_move, searched_quiets)
+                break
+            if is_quiet:
+                searched_quiets.append(move)
+
+        if not has_legal_move:
+            # Checkmate is scored by distance so that faster mates are preferred, stalemate is a draw
+            if checkers:
+                score = self.CHECKMATE_SCORE - depth
+                return -score if is_maximizing_player else score
+            return 0
+
+        if best_eval <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_eval >= original_beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.transposition_table.store(key, best_move, self.score_to_table(best_eval, depth), remaining_depth, bound)
+        return best_eval
+
+    def quiescence(self, position, depth, alpha, beta, is_maximizing_player):
+        # Leaves are extended with captures and queen promotions until the position is quiet, so the evaluation
+        # never lands in the middle of an exchange. The side to move may stand pat (keep the static evaluation)
+        # unless it is in check, then every evasion is searched.
+        self.count_state()
+        side_to_move = position.side_to_move
+        checkers = checkers_of(position, side_to_move)
+        if depth >= MAX_PLY - 1:
+            return self.get_state_score(position)
+
+        if checkers:
+            best_eval = float('-inf') if is_maximizing_player else float('inf')
+            moves = pick_moves(position, ordering=self.ordering)
+            stand_pat = None
+        else:
+            stand_pat = self.get_state_score(position)
+            if is_maximizing_player:
+                if stand_pat >= beta:
+                    return stand_pat
+                alpha = max(alpha, stand_pat)
+            else:
+                if stand_pat <= alpha:
+                    return stand_pat
+                beta = min(beta, stand_pat)
+            best_eval = stand_pat
+            moves = generate_captures(position)
+            squares = position.squares
+            moves = sorted(moves, key=lambda capture: capture_score(squares, capture), reverse=True)
+
+        pinned = pinned_pieces(position, side_to_move)
+        has_legal_move = False
+        for move in moves:
+            if stand_pat is not None:
+                if move & PROMOTION_FLAG and (move >> 12) & 3 != QUEEN_PROMOTION:
+                    continue
+                # Delta pruning: even winning the captured piece for free would not reach the window
+                gain = self.capture_gain(position, move)
+                if (stand_pat + gain + self.DELTA_MARGIN <= alpha if is_maximizing_player else
+                        stand_pat - gain - self.DELTA_MARGIN >= beta):
+                    continue
+            if not is_legal(position, move, pinned, checkers):
+                continue
+            has_legal_move = True
+            position.make_move(move)
+            eval = self.quiescence(position, depth + 1, alpha, beta, not is_maximizing_player)
+            position.unmake_move()
+            if is_maximizing_player:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break
+
+        if checkers and not has_legal_move:
+            score = self.CHECKMATE_SCORE - depth
+            return -score if is_maximizing_player else score
+        return best_eval
+
+    @staticmethod
+    def capture_gain(position, move: int) -> int:
+        # Material won by a capture or promotion, in centipawns
+        gain = 0
+        if move & CAPTURE_FLAG:
+            gain = PIECE_SCORES[PAWN if move >> 12 == EN_PASSANT else position.squares[(move >> 6) & 63] % 6]
+        if move & PROMOTION_FLAG:
+            gain += PIECE_SCORES[QUEEN] - PIECE_SCORES[PAWN]
+        return gain
+
+    def score_to_table(self, score: int, depth: int) -> int:
+        # Mate scores are stored as the distance from the stored position, not from the root
+        if score > self.MATE_BOUND:
+            return score + depth
+        if score < -self.MATE_BOUND:
+            return score - depth
+        return score
+
+    def score_from_table(self, score: int, depth: int) -> int:
+        if score > self.MATE_BOUND:
+            return score - depth
+        if score < -self.MATE_BOUND:
+            return score + depth
+        return score
+
+    def get_state_score(self, position) -> int:
+        # Checks are resolved by the quiescence search, the leaves are scored by material, piece placement and
+        # pawn structure
+        key = position.zobrist_key
+        score = self.evaluation_cache.probe(key)
+        if score is None:
+            score = evaluate(position, self.pawn_table)
+            self.evaluation_cache.store(key, score)
+        return score if self._color_index == WHITE else -score
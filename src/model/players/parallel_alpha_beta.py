@@ -0,0 +1,321 @@
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.model.board import Board
+from src.model.engine.position import Position
+from src.model.engine.time_manager import CHECK_INTERVAL
+from src.model.engine.transposition_table import TranspositionTable, table_bytes
+from src.model.enums.color import Color
+from src.model.enums.parallel_mode import ParallelMode
+from src.model.players.alpha_beta_player import AlphaBeta, PruningOptions, SearchAborted
+
+# AlphaBeta searching in parallel on a pool of worker processes. Threads can't run the search in parallel under
+# the GIL, processes can. The pool is created with the first parallel search and lives until close(), the position
+# is sent to the workers as FEN, the Player and piece objects never leave the main process.
+#
+# Root split (ParallelMode.ROOT_SPLIT):
+#
+#     - every worker keeps its own transposition table and move ordering tables between the searches of a game
+#     - the first root move is searched alone, its score is the alpha bound the other moves are searched against
+#       with a null window (principal variation search)
+#     - the bound lives in shared memory, every worker raises it as it finds better moves and every move starts
+#       from the best bound found so far
+#     - the results are merged in the order of the root moves, so the move played does not depend on which worker
+#       finished first. A move that started after another one raised the bound to its own score only returns an
+#       upper bound of that score, if it comes first in the order it is searched again with a window that does not
+#       depend on the timing before it can win the tie
+#
+# Shallow iterations are searched serially, they are over before the moves reach the workers.
+#
+# Lazy SMP (ParallelMode.LAZY_SMP):
+#
+#     - the main process and workers - 1 helper processes run iterative deepening on the same position, the helpers
+#       start at staggered depths so they don't all search the same tree at the same time
+#     - all of them read and write one transposition table in shared memory, without locks (see
+#       transposition_table.py), the helpers only feed the table: the main process finds their results there, as
+#       cutoffs and better ordered moves, and plays its own best move
+#     - the helpers are stopped when the main process has chosen its move
+#
+# Root splitting runs out of root moves to share at deeper depths, Lazy SMP keeps every process busy.
+
+
+class RootMoveResult(NamedTuple):
+    move: int
+    # None if the search was stopped before it completed
+    score: Optional[float]
+    # False if the score is only an upper bound, the move was not better than the bound it was searched against
+    exact: bool
+    nodes: int
+    principal_variation: List[int]
+
+
+class _WorkerSearch(AlphaBeta):
+    # The search of a worker process, it is stopped through a flag shared with the main process
+
+    def __init__(self, color: Color, hash_size_mb: int, pruning: PruningOptions, stop_flag) -> None:
+        super().__init__("Worker", color, Board(), None, hash_size_mb=hash_size_mb, pruning=pruning)
+        self.search_id = -1
+        self._stop_flag = stop_flag
+
+    def count_state(self) -> None:
+        self.state_counter += 1
+        if not self.state_counter & (CHECK_INTERVAL - 1) and self._stop_flag.value:
+            self._stop_requested = True
+        if self._stop_requested:
+            raise SearchAborted()
+
+
+# State of a worker process, set up once by _init_worker
+_worker_search: Optional[_WorkerSearch] = None
+_shared_alpha = None
+_shared_table: Optional[SharedMemory] = None
+
+
+def _init_worker(shared_alpha, stop_flag, color: Color, hash_size_mb: int, pruning: PruningOptions,
+                 shared_table_name: Optional[str] = None) -> None:
+    global _worker_search, _shared_alpha, _shared_table
+    _worker_search = _WorkerSearch(color, hash_size_mb, pruning, stop_flag)
+    _shared_alpha = shared_alpha
+    if shared_table_name is not None:
+        _shared_table = SharedMemory(name=shared_table_name)
+        _worker_search.transposition_table = TranspositionTable(hash_size_mb, _shared_table.buf)
+
+
+def _new_worker_search(search_id: int) -> _WorkerSearch:
+    searcher = _worker_search
+    if searcher.search_id != search_id:
+        # A new move of the game, the tables of the previous one are aged
+        searcher.search_id = search_id
+        searcher.ordering.new_search()
+        searcher.transposition_table.new_search()
+    searcher.state_counter = 0
+    searcher._stop_requested = False
+    return searcher
+
+
+def _search_root_move(fen: str, move: int, max_depth: int, beta: float, principal_variation: List[int],
+                      is_first_move: bool, search_id: int, alpha: Optional[float] = None) -> RootMoveResult:
+    # Runs in a worker process. Without a fixed alpha the move is searched against the best bound found so far.
+    searcher = _new_worker_search(search_id)
+    if alpha is None:
+        alpha = _shared_alpha.value
+        # The shared bound is a double, the bounds of the search stay integers like the scores they can become
+        if alpha not in (float('-inf'), float('inf')):
+            alpha = int(alpha)
+    if alpha >= beta:
+        # Another root move already failed high, this one can't change the result
+        return RootMoveResult(move, None, False, 0, [])
+    position = Position.from_fen(fen)
+    position.make_move(move)
+    searcher.principal_variation = principal_variation
+    searcher._following_pv = bool(principal_variation) and principal_variation[0] == move
+    try:
+        score = searcher.search_move(position, 1, max_depth, alpha, beta, True, is_first_move)
+    except SearchAborted:
+        return RootMoveResult(move, None, False, searcher.state_counter, [])
+
+    if score > alpha:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    variation = [move] + searcher.read_principal_variation(position, max_depth - 1)
+    return RootMoveResult(move, score, score > alpha, searcher.state_counter, variation)
+
+
+def _lazy_smp_search(fen: str, max_depth: int, start_depth: int, age: int, search_id: int) -> int:
+    # Runs in a helper process until it is stopped or reaches max_depth, returns its node count. Only the
+    # transposition table entries it leaves behind are used.
+    searcher = _new_worker_search(search_id)
+    searcher.transposition_table.age = age
+    searcher.principal_variation = []
+    searcher.completed_depth = 0
+    position = Position.from_fen(fen)
+    score = None
+    try:
+        for depth in range(start_depth, max_depth + 1):
+            score, move = searcher.search_aspiration(position, depth, score)
+            if move is None:
+                break
+            searcher.completed_depth = depth
+            searcher.principal_variation = searcher.read_principal_variation(position, depth)
+    except SearchAborted:
+        pass
+    return searcher.state_counter
+
+
+class ParallelAlphaBeta(AlphaBeta):
+    # Iterations shallower than this are searched in the main process
+    PARALLEL_MIN_DEPTH = 3
+    # Seconds between two polls of the clock while the workers search
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, name: str, color, board, time: Optional[int], max_depth: Optional[int] = None,
+                 hash_size_mb: int = 16, increment: int = 0, pruning: PruningOptions = PruningOptions(),
+                 evaluation_cache_mb: int = 2, pawn_table_mb: int = 1, workers: Optional[int] = None,
+                 mode: ParallelMode = ParallelMode.ROOT_SPLIT):
+        super().__init__(name, color, board, time, max_depth, hash_size_mb, increment, pruning, evaluation_cache_mb,
+                         pawn_table_mb)
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.mode = mode
+        self.hash_size_mb = hash_size_mb
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shared_alpha = multiprocessing.Value('d', float('-inf'))
+        self._stop_flag = multiprocessing.Value('b', 0)
+        # Principal variation reported by the worker of the best root move, by the key of the root position
+        self._root_variation: Tuple[int, List[int]] = (0, [])
+        # Lazy SMP: while the pool runs the transposition table of the main process is the shared one
+        self._shared_table: Optional[SharedMemory] = None
+        self._helpers: List[Future] = []
+        self.helper_state_counter = 0
+
+    @property
+    def is_lazy_smp(self) -> bool:
+        return self.mode == ParallelMode.LAZY_SMP and self.workers > 1
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._shared_table is not None:
+            self._replace_transposition_table(TranspositionTable(self.hash_size_mb))
+            self._shared_table.close()
+            self._shared_table.unlink()
+            self._shared_table = None
+
+    def _replace_transposition_table(self, table: TranspositionTable) -> None:
+        # The entries are not carried over, the generation is
+        table.age = self.transposition_table.age
+        self.transposition_table.close()
+        self.transposition_table = table
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            if self.is_lazy_smp:
+                # The main process is one of the searching processes
+                max_workers = self.workers - 1
+                self._shared_table = SharedMemory(create=True, size=table_bytes(self.hash_size_mb))
+                self._replace_transposition_table(TranspositionTable(self.hash_size_mb, self._shared_table.buf))
+                shared_table_name = self._shared_table.name
+            else:
+                max_workers = self.workers
+                shared_table_name = None
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                             initargs=(self._shared_alpha, self._stop_flag, self.color,
+                                                       self.hash_size_mb, self.pruning, shared_table_name))
+        return self._pool
+
+    def choose_move(self, opponent):
+        try:
+            return super().choose_move(opponent)
+        finally:
+            self._stop_helpers()
+
+    def _start_helpers(self, position) -> None:
+        pool = self._get_pool()
+        self._stop_flag.value = 0
+        fen = position.to_fen()
+        # Every other helper starts one ply deeper
+        self._helpers = [pool.submit(_lazy_smp_search, fen, self.max_depth, 1 + index % 2,
+                                     self.transposition_table.age, self.moves_played)
+                         for index in range(1, self.workers)]
+
+    def _stop_helpers(self) -> None:
+        if not self._helpers:
+            return
+        self._stop_flag.value = 1
+        self.helper_state_counter = sum(helper.result() for helper in self._helpers)
+        self._helpers = []
+        print(f"Helper states: {self.helper_state_counter}")
+
+    def search_root(self, position, max_depth, alpha=float('-inf'),
+                    beta=float('inf')) -> Tuple[float, Optional[int]]:
+        self._root_variation = (0, [])
+        if self.is_lazy_smp:
+            # The helpers start with the first iteration of the main process, after the tables are aged
+            if not self._helpers:
+                self._start_helpers(position)
+            return super().search_root(position, max_depth, alpha, beta)
+        if self.workers <= 1 or max_depth < self.PARALLEL_MIN_DEPTH:
+            return super().search_root(position, max_depth, alpha, beta)
+
+        moves = self.root_moves(position)
+        if not moves:
+            return float('-inf'), None
+        pool = self._get_pool()
+        self._shared_alpha.value = alpha
+        self._stop_flag.value = 0
+        fen = position.to_fen()
+        search_id = self.moves_played
+
+        # The first move sets the bound, the others are only searched to prove they are worse
+        results: Dict[int, RootMoveResult] = {}
+        first_move = [pool.submit(_search_root_move, fen, moves[0], max_depth, beta, self.principal_variation,
+                                  True, search_id)]
+        self._collect(first_move, results, beta)
+        first_result = results.get(moves[0])
+        if first_result is not None and first_result.score is not None and first_result.score < beta:
+            other_moves = [pool.submit(_search_root_move, fen, move, max_depth, beta, [], False, search_id)
+                           for move in moves[1:]]
+            self._collect(other_moves, results, beta)
+
+        best_move, max_value, is_complete = self._merge(moves, results)
+        if best_move is not None and alpha < max_value < beta:
+            # The earlier moves with the same score are upper bounds, the score is exact only if they reach it
+            tied_moves = [move for move in moves[:moves.index(best_move)] if results[move].score == max_value]
+            if tied_moves:
+                self._collect([pool.submit(_search_root_move, fen, move, max_depth, beta, [], False, search_id,
+                                           max_value - 1) for move in tied_moves], results, beta)
+                best_move, max_value, is_complete = self._merge(moves, results)
+        if best_move is None or (not is_complete and max_value < beta):
+            raise SearchAborted()
+
+        self._root_variation = (position.zobrist_key, results[best_move].principal_variation)
+        self.store_root(position, max_depth, best_move, max_value, alpha, beta)
+        return max_value, best_move
+
+    @staticmethod
+    def _merge(moves: List[int], results: Dict[int, RootMoveResult]) -> Tuple[Optional[int], float, bool]:
+        # (best move, its score, whether every move has a score). Ties go to the earlier move, and an exact score
+        # beats an upper bound of the same value.
+        best_move = None
+        max_value = float('-inf')
+        best_exact = False
+        is_complete = True
+        for move in moves:
+            result = results.get(move)
+            if result is None or result.score is None:
+                is_complete = False
+                continue
+            if result.score > max_value or (result.score == max_value and result.exact and not best_exact):
+                best_move, max_value, best_exact = move, result.score, result.exact
+        return best_move, max_value, is_complete
+
+    def _collect(self, futures: Iterable[Future], results: Dict[int, RootMoveResult], beta: float) -> None:
+        # Waits for the workers, stops them on a fail high or when the clock or stop() says so
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self.POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                result = future.result()
+                self.state_counter += result.nodes
+                if result.score is not None or result.move not in results:
+                    results[result.move] = result
+                if result.score is not None and result.score >= beta:
+                    self._stop_flag.value = 1
+            if (self._stop_requested or
+                    (self.completed_depth and self.time_manager.is_hard_limit_reached())):
+                self._stop_flag.value = 1
+            if self._stop_flag.value:
+                for future in pending:
+                    future.cancel()
+
+    def read_principal_variation(self, position, max_length: int) -> List[int]:
+        # The lines below the root moves are in the tables of the workers
+        key, variation = self._root_variation
+        if variation and key == position.zobrist_key:
+            return variation[:max_length]
+        return super().read_principal_variation(position, max_length)
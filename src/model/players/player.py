@@ -1,6 +1,9 @@
 from typing import Optional, List, Tuple, Set
 from src.model.pieces.bishop import Bishop
 from src.model.board import Board
+from src.model.engine.bitboard import EMPTY_BOARD, SQUARE_BITS, color_index, coordinates_set
+from src.model.engine.move_generator import generate_legal_moves, is_in_check
+from src.model.engine.position import Position
 from src.model.pieces.king import King
 from src.model.pieces.knight import Knight
 from src.model.pieces.pawn import Pawn
@@ -23,45 +26,43 @@ class Player:
         self._last_moved_piece: Optional[Piece] = None
         self._king: Optional[King] = None
         self._king_is_checked: bool = False
-        self._last_move: Optional[Tuple[int, int, int, int]] = None
-        self._piece_coordinates: Set[Tuple[int, int]] = set()
+        # Encoded move, see engine/move.py
+        self._last_move: Optional[int] = None
+        self._color_index: int = color_index(color)
 
         self._pieces: List[Piece] = []
-        self._attacked_fields: Set[Tuple[int, int]] = set()
-        self._possible_fields: Set[Tuple[int, int]] = set()
+        # Square-indexed piece lookup (square = row * 8 + col), kept in sync with _pieces
+        self._square_to_piece: List[Optional[Piece]] = [None] * 64
 
     def init_pieces(self) -> None:
         color = self._color
 
         for i in range(8):
-            self._pieces.append(Pawn(color, 6 if color == Color.WHITE else 1, i))
+            self.add_piece(Pawn(color, 6 if color == Color.WHITE else 1, i))
 
-        self._pieces.append(Rook(color, 7 if color == Color.WHITE else 0, 0))
-        self._pieces.append(Knight(color, 7 if color == Color.WHITE else 0, 1))
-        self._pieces.append(Bishop(color, 7 if color == Color.WHITE else 0, 2))
-        self._pieces.append(Queen(color, 7 if color == Color.WHITE else 0, 3))
-
-        self._king = King(color, 7 if color == Color.WHITE else 0, 4)
-        self._pieces.append(self._king)
-
-        self._pieces.append(Bishop(color, 7 if color == Color.WHITE else 0, 5))
-        self._pieces.append(Knight(color, 7 if color == Color.WHITE else 0, 6))
-        self._pieces.append(Rook(color, 7 if color == Color.WHITE else 0, 7))
-
-    def update_piece_coordinates(self) -> None:
-        self._piece_coordinates = {piece.coordinates for piece in self._pieces}
-
-    def update_pieces_attacked_fields(self, opponent_piece_coordinates: Set[Tuple[int, int]]) -> None:
-        self._attacked_fields.clear()
-        for piece in self._pieces:
-            piece.update_attacked_fields(self.piece_coordinates, opponent_piece_coordinates)
-            for field in piece._attacked_fields:
-                self._attacked_fields.add(field)
+        self.add_piece(Rook(color, 7 if color == Color.WHITE else 0, 0))
+        self.add_piece(Knight(color, 7 if color == Color.WHITE else 0, 1))
+        self.add_piece(Bishop(color, 7 if color == Color.WHITE else 0, 2))
+        self.add_piece(Queen(color, 7 if color == Color.WHITE else 0, 3))
+        self.add_piece(King(color, 7 if color == Color.WHITE else 0, 4))
+        self.add_piece(Bishop(color, 7 if color == Color.WHITE else 0, 5))
+        self.add_piece(Knight(color, 7 if color == Color.WHITE else 0, 6))
+        self.add_piece(Rook(color, 7 if color == Color.WHITE else 0, 7))
 
     def update_pieces_possible_fields(self, opponent: 'Player') -> None:
-        self._possible_fields.clear()
+        # Legal moves come from the pin/check-mask move generator working on the shared position
         for piece in self._pieces:
-            piece.update_possible_fields(self, opponent)
+            piece.possible_mask = EMPTY_BOARD
+
+        position = self._board.position
+        square_to_piece = self._square_to_piece
+        for move in generate_legal_moves(position, self._color_index):
+            square_to_piece[move & 63].possible_mask |= SQUARE_BITS[(move >> 6) & 63]
+
+        if self._king is not None:
+            self._king.is_in_check = is_in_check(position, self._color_index)
+            if self._king.is_in_check:
+                print("King is in check")
 
     def reset_en_passant(self) -> None:
         if self._last_moved_piece is not None:
@@ -70,17 +71,33 @@ class Player:
                 # print("En passant reset.")
 
     def remove_piece_at(self, row: int, col: int) -> None:
-        # if (row, col) in self._piece_coordinates:
+        square = row * 8 + col
+        piece = self._square_to_piece[square]
+        if piece is not None:
+            self._square_to_piece[square] = None
+            self._pieces.remove(piece)
+            self._board.position.remove_piece_object(piece)
+
+    def clear_pieces(self) -> None:
+        position = self._board.position
         for piece in self._pieces:
-            if piece.coordinates == (row, col):
-                self._pieces.remove(piece)
-                break
+            position.remove_piece_object(piece)
+            self._square_to_piece[piece.row * 8 + piece.col] = None
+        self._pieces.clear()
+        self._king = None
+
+    def relocate_piece(self, piece: Piece, row: int, col: int) -> None:
+        # Moves one of the player's pieces without any game logic (captures, flags),
+        # keeping the square index and the position in sync
+        from_square = piece.row * 8 + piece.col
+        to_square = row * 8 + col
+        self._board.position.move_piece(self._color_index, piece.piece_index, from_square, to_square)
+        self._square_to_piece[from_square] = None
+        self._square_to_piece[to_square] = piece
+        piece.coordinates = (row, col)
 
     def get_piece_at(self, row: int, col: int) -> Optional[Piece]:
-        for piece in self._pieces:
-            if piece.coordinates == (row, col):
-                return piece
-        return None
+        return self._square_to_piece[row * 8 + col]
 
     def can_move(self) -> bool:
         for piece in self._pieces:
@@ -99,8 +116,30 @@ class Player:
 
     @property
     def piece_coordinates(self) -> Set[Tuple[int, int]]:
-        self.update_piece_coordinates()
-        return self._piece_coordinates
+        return coordinates_set(self.occupancy)
+
+    @property
+    def occupancy(self) -> int:
+        return self._board.position.occupancy(self._color_index)
+
+    @property
+    def position(self) -> Position:
+        return self._board.position
+
+    # Attacked squares are read from the attack map of the board position, which is updated on every move
+    @property
+    def attacked_mask(self) -> int:
+        return self._board.position.attack_map.attacked(self._color_index)
+
+    @property
+    def attacked_fields(self) -> Set[Tuple[int, int]]:
+        return coordinates_set(self.attacked_mask)
+
+    def is_attacking(self, row: int, col: int) -> bool:
+        return self._board.position.attack_map.is_attacked(self._color_index, row * 8 + col)
+
+    def attacker_count_at(self, row: int, col: int) -> int:
+        return self._board.position.attack_map.attack_count(self._color_index, row * 8 + col)
 
     @property
     def pieces(self) -> List[Piece]:
@@ -115,7 +154,7 @@ class Player:
         self._last_moved_piece = piece
 
     def has_piece_at(self, row: int, col: int) -> bool:
-        return (row, col) in self.piece_coordinates
+        return self._square_to_piece[row * 8 + col] is not None
 
     def is_selected_piece_at(self, row: int, col: int) -> bool:
         if self._selected_piece is not None:
@@ -125,7 +164,7 @@ class Player:
     def is_possible_move(self, row: int, col: int) -> bool:
         if self._selected_piece is None:
             return False
-        return (row, col) in self._selected_piece.possible_fields
+        return self._selected_piece.can_move_to(row, col)
 
     def set_selected_piece(self, row: int, col: int) -> None:
         if self.has_piece_at(row, col):
@@ -162,16 +201,25 @@ class Player:
     @color.setter
     def color(self, color: Color) -> None:
         self._color = color
+        self._color_index = color_index(color)
+
+    @property
+    def color_index(self) -> int:
+        return self._color_index
 
     def add_piece(self, piece: Piece) -> None:
         self._pieces.append(piece)
+        self._square_to_piece[piece.row * 8 + piece.col] = piece
+        self._board.position.put_piece_object(piece)
+        if isinstance(piece, King):
+            self._king = piece
 
     @property
-    def last_move(self) -> Tuple[int, int, int, int]:
+    def last_move(self) -> Optional[int]:
         return self._last_move
 
     @last_move.setter
-    def last_move(self, move: Tuple[int, int, int, int]) -> None:
+    def last_move(self, move: Optional[int]) -> None:
         self._last_move = move
 
     def do_castling(self, to_row: int, to_col: int) -> None:
@@ -179,17 +227,17 @@ class Player:
         if to_col == 2:
             rook = self.get_piece_at(row=to_row, col=0)
             if rook is not None:
-                rook.coordinates = (to_row, 3)
+                self.relocate_piece(rook, to_row, 3)
                 rook.is_moved = True
         elif to_col == 6:
             rook = self.get_piece_at(to_row, 7)
             if rook is not None:
-                rook.coordinates = (to_row, 5)
+                self.relocate_piece(rook, to_row, 5)
                 rook.is_moved = True
 
         king = self.king
         if king is not None:
-            king.coordinates = (to_row, to_col)
+            self.relocate_piece(king, to_row, to_col)
             king.is_moved = True
         self._last_moved_piece = king
         self.reset_en_passant()
@@ -209,19 +257,17 @@ class Player:
             new_piece = Knight(self.color, to_row, to_col)
         else:
             raise ValueError("Invalid piece type.")
-        self._pieces.append(new_piece)
+        self.add_piece(new_piece)
         self.last_moved_piece = new_piece
         self.reset_en_passant()
 
     def do_en_passant(self, to_row: int, to_col: int) -> None:
-        from_row, from_col = self.selected_piece.coordinates
-        self.selected_piece.coordinates = (to_row, to_col)
+        self.relocate_piece(self.selected_piece, to_row, to_col)
         self.reset_en_passant()
         self._last_moved_piece = self.selected_piece
 
     def move_piece(self, to_row: int, to_col: int) -> None:
-        from_row, from_col = self.selected_piece.coordinates
-        self.selected_piece.coordinates = (to_row, to_col)
+        self.relocate_piece(self.selected_piece, to_row, to_col)
         self.selected_piece.is_moved = True
         self._last_moved_piece = self.selected_piece
 
@@ -1,6 +1,9 @@
 import random
 from typing import Tuple, Optional, List
 
+from src.model.engine.bitboard import SQUARE_COORDINATES
+from src.model.engine.move import move_from
+from src.model.engine.move_generator import generate_legal_moves
 from src.model.enums.color import Color
 from src.model.pieces.piece import Piece
 from src.model.players.player import Player
@@ -10,12 +13,13 @@ class RandomPlayer(Player):
     def __init__(self, name: str, color: Color, board, time: int):
         super().__init__(name, color, board, time)
 
-    def choose_move(self, opponent) -> Optional[Piece]:
-        movable_pieces = self.get_movable_pieces()
-        if len(movable_pieces) == 0:
+    def choose_move(self, opponent) -> Optional[int]:
+        moves = generate_legal_moves(self._board.position, self._color_index)
+        if len(moves) == 0:
             return None
-        self.selected_piece = random.choice(movable_pieces)
-        return random.choice(list(self.selected_piece.possible_fields))
+        move = random.choice(moves)
+        self.selected_piece = self.get_piece_at(*SQUARE_COORDINATES[move_from(move)])
+        return move
 
     def get_movable_pieces(self) -> List[Piece]:
         return [piece for piece in self._pieces if piece.is_movable()]
\ No newline at end of file
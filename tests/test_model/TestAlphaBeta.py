@@ -0,0 +1,171 @@
+import unittest
+
+from src.model.board import Board
+from src.model.engine.bitboard import square_of
+from src.model.engine.move import CAPTURE, encode_move
+from src.model.enums.color import Color
+from src.model.pieces.king import King
+from src.model.pieces.pawn import Pawn
+from src.model.pieces.rook import Rook
+from src.model.engine.move_ordering import MAX_PLY
+from src.model.players.alpha_beta_player import AlphaBeta, PruningOptions
+from src.model.players.player import Player
+
+
+class TestAlphaBeta(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.white_player = AlphaBeta("White", Color.WHITE, self.board, None, max_depth=3)
+        self.black_player = Player("Black", Color.BLACK, self.board, None)
+
+    def test_finds_back_rank_mate_and_leaves_the_pieces_untouched(self):
+        self.white_player.add_piece(King(Color.WHITE, 7, 6))
+        self.white_player.add_piece(Rook(Color.WHITE, 7, 0))
+        self.black_player.add_piece(King(Color.BLACK, 0, 6))
+        for col in (5, 6, 7):
+            self.black_player.add_piece(Pawn(Color.BLACK, 1, col))
+        self.board.position.update_state(self.white_player, self.black_player)
+        position_before = self.board.position.copy()
+
+        move = self.white_player.choose_move(self.black_player)
+
+        self.assertEqual(move, encode_move(square_of(7, 0), square_of(0, 0)))
+        self.assertEqual(self.white_player.selected_piece.coordinates, (7, 0))
+        self.assertEqual(self.board.position, position_before)
+
+    def test_quiescence_search_sees_the_recapture(self):
+        # Rxd5 wins a pawn at depth 1 but loses the rook to exd5
+        white_player = AlphaBeta("White", Color.WHITE, self.board, None, max_depth=1)
+        white_player.add_piece(King(Color.WHITE, 7, 0))
+        white_player.add_piece(Rook(Color.WHITE, 7, 3))
+        self.black_player.add_piece(King(Color.BLACK, 0, 7))
+        for row, col in ((1, 6), (1, 7), (3, 3), (2, 4)):
+            self.black_player.add_piece(Pawn(Color.BLACK, row, col))
+        self.board.position.update_state(white_player, self.black_player)
+
+        move = white_player.choose_move(self.black_player)
+
+        self.assertNotEqual(move, encode_move(square_of(7, 3), square_of(3, 3), CAPTURE))
+
+    def test_transposition_table_is_reused_by_the_next_search(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        self.board.position.update_state(self.white_player, self.black_player)
+
+        first_move = self.white_player.choose_move(self.black_player)
+        first_nodes = self.white_player.state_counter
+        second_move = self.white_player.choose_move(self.black_player)
+
+        self.assertEqual(second_move, first_move)
+        self.assertGreater(self.white_player.transposition_table.hits, 0)
+        self.assertLess(self.white_player.state_counter, first_nodes)
+
+    def test_evaluation_cache_is_kept_for_the_game_and_cleared_for_a_new_one(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        self.board.position.update_state(self.white_player, self.black_player)
+
+        self.white_player.choose_move(self.black_player)
+        self.white_player.choose_move(self.black_player)
+        cache = self.white_player.evaluation_cache
+        self.assertGreater(cache.hit_rate, 0.5)
+
+        key = self.board.position.zobrist_key
+        cache.store(key, 0)
+        self.white_player.new_game()
+        self.assertIsNone(cache.probe(key))
+        self.assertEqual(self.white_player.moves_played, 0)
+
+    def test_iterative_deepening_reports_the_principal_variation(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        self.board.position.update_state(self.white_player, self.black_player)
+
+        move = self.white_player.choose_move(self.black_player)
+
+        self.assertEqual(self.white_player.completed_depth, 3)
+        self.assertEqual(self.white_player.principal_variation[0], move)
+        self.assertEqual(len(self.white_player.principal_variation), 3)
+
+    def test_stopped_search_plays_the_move_of_the_last_completed_iteration(self):
+        class StoppedAlphaBeta(AlphaBeta):
+            def alpha_beta(self, position, *args):
+                # Stops within the third iteration
+                if self.completed_depth == 2:
+                    self.stop()
+                return super().alpha_beta(position, *args)
+
+        board = Board()
+        white_player = StoppedAlphaBeta("White", Color.WHITE, board, None, max_depth=5)
+        black_player = Player("Black", Color.BLACK, board, None)
+        white_player.init_pieces()
+        black_player.init_pieces()
+        board.position.update_state(white_player, black_player)
+        position_before = board.position.copy()
+
+        move = white_player.choose_move(black_player)
+
+        self.assertEqual(white_player.completed_depth, 2)
+        self.assertEqual(move, white_player.principal_variation[0])
+        self.assertEqual(board.position, position_before)
+
+    def test_pruning_searches_fewer_nodes_and_each_technique_can_be_switched_off(self):
+        all_off = PruningOptions(null_move=False, late_move_reductions=False, futility=False)
+        node_counts = {}
+        for pruning in (PruningOptions(), all_off, all_off._replace(null_move=True),
+                        all_off._replace(late_move_reductions=True), all_off._replace(futility=True)):
+            board = Board()
+            white_player = AlphaBeta("White", Color.WHITE, board, None, max_depth=4, pruning=pruning)
+            black_player = Player("Black", Color.BLACK, board, None)
+            white_player.add_piece(King(Color.WHITE, 7, 6))
+            white_player.add_piece(Rook(Color.WHITE, 7, 0))
+            white_player.add_piece(Pawn(Color.WHITE, 6, 1))
+            black_player.add_piece(King(Color.BLACK, 0, 6))
+            for col in (5, 6, 7):
+                black_player.add_piece(Pawn(Color.BLACK, 1, col))
+            board.position.update_state(white_player, black_player)
+
+            move = white_player.choose_move(black_player)
+
+            # The back rank mate is found whatever is pruned
+            self.assertEqual(move, encode_move(square_of(7, 0), square_of(0, 0)))
+            node_counts[pruning] = white_player.state_counter
+        self.assertLess(node_counts[PruningOptions()], node_counts[all_off])
+
+    def test_aspiration_window_is_widened_until_the_score_fits(self):
+        # Rxd5 exd5 leaves white a rook for two pawns, far from a previous score of zero
+        scores = []
+        for previous_score in (None, 0):
+            board = Board()
+            white_player = AlphaBeta("White", Color.WHITE, board, None, max_depth=3)
+            black_player = Player("Black", Color.BLACK, board, None)
+            white_player.add_piece(King(Color.WHITE, 7, 0))
+            white_player.add_piece(Rook(Color.WHITE, 7, 3))
+            black_player.add_piece(King(Color.BLACK, 0, 7))
+            for row, col in ((1, 6), (1, 7), (3, 3), (2, 4)):
+                black_player.add_piece(Pawn(Color.BLACK, row, col))
+            board.position.update_state(white_player, black_player)
+
+            score, move = white_player.search_aspiration(board.position.copy(), 3, previous_score)
+
+            self.assertIsNotNone(move)
+            scores.append(score)
+        self.assertEqual(scores[0], scores[1])
+        self.assertNotEqual(scores[1], 0)
+
+    def test_depth_is_limited_to_the_plies_of_the_killer_table(self):
+        white_player = AlphaBeta("White", Color.WHITE, self.board, None, max_depth=70)
+        self.assertEqual(white_player.max_depth, MAX_PLY - 1)
+        white_player.add_piece(King(Color.WHITE, 7, 4))
+        self.black_player.add_piece(King(Color.BLACK, 0, 4))
+        self.board.position.update_state(white_player, self.black_player)
+
+        # The deepest node of a full depth search, searched on its own
+        position = self.board.position.copy()
+        score = white_player.alpha_beta(position, white_player.max_depth - 1, white_player.max_depth,
+                                        float('-inf'), float('inf'), True)
+        self.assertIsInstance(score, int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+from src.model.engine.attack_map import AttackMap
+from src.model.engine.bitboard import WHITE, BLACK, ROOK, QUEEN, BISHOP, square_of, coordinates_set
+from src.model.engine.move_generator import attackers_to, generate_legal_moves
+from src.model.engine.position import Position
+
+
+class TestAttackMap(unittest.TestCase):
+    def setUp(self):
+        self.position = Position()
+        self.attack_map = self.position.enable_attack_map()
+
+    def assert_matches_rebuilt_map(self):
+        rebuilt_map = AttackMap(self.position)
+        occupancy = self.position.all_occupancy
+        for color_idx in (WHITE, BLACK):
+            self.assertEqual(self.attack_map.attacked(color_idx), rebuilt_map.attacked(color_idx))
+            for square in range(64):
+                attackers = attackers_to(self.position, square, color_idx, occupancy)
+                self.assertEqual(self.attack_map.attack_count(color_idx, square), attackers.bit_count())
+
+    def test_slider_rays_follow_blockers(self):
+        self.position.put_piece(WHITE, ROOK, square_of(7, 0))
+        self.assertTrue(self.attack_map.is_attacked(WHITE, square_of(0, 0)))
+        self.position.put_piece(BLACK, BISHOP, square_of(4, 0))
+        self.assertFalse(self.attack_map.is_attacked(WHITE, square_of(3, 0)))
+        self.assertTrue(self.attack_map.is_attacked(WHITE, square_of(4, 0)))
+        self.position.move_piece(BLACK, BISHOP, square_of(4, 0), square_of(3, 1))
+        self.assertTrue(self.attack_map.is_attacked(WHITE, square_of(0, 0)))
+        self.assertEqual(coordinates_set(self.attack_map.piece_attacks(square_of(3, 1))),
+                         {(2, 0), (4, 0), (2, 2), (1, 3), (0, 4), (4, 2), (5, 3), (6, 4), (7, 5)})
+
+    def test_attacker_counts(self):
+        self.position.put_piece(WHITE, ROOK, square_of(7, 3))
+        self.position.put_piece(WHITE, QUEEN, square_of(6, 3))
+        self.assertEqual(self.attack_map.attack_count(WHITE, square_of(5, 3)), 1)
+        self.position.move_piece(WHITE, QUEEN, square_of(6, 3), square_of(5, 4))
+        self.assertEqual(self.attack_map.attack_count(WHITE, square_of(5, 3)), 2)
+        self.position.remove_piece(WHITE, ROOK, square_of(7, 3))
+        self.assertEqual(self.attack_map.attack_count(WHITE, square_of(5, 3)), 1)
+        self.assert_matches_rebuilt_map()
+
+    def test_incremental_map_matches_rebuilt_map_during_random_play(self):
+        for row, pieces in ((0, (1, 2, 3, 4, 5, 3, 2, 1)), (7, (1, 2, 3, 4, 5, 3, 2, 1))):
+            color_idx = BLACK if row == 0 else WHITE
+            for col, piece_idx in enumerate(pieces):
+                self.position.put_piece(color_idx, piece_idx, square_of(row, col))
+                self.position.put_piece(color_idx, 0, square_of(1 if row == 0 else 6, col))
+
+        generator = random.Random(7)
+        for _ in range(60):
+            moves = generate_legal_moves(self.position)
+            if not moves:
+                break
+            self.position.make_move(generator.choice(moves))
+            self.assert_matches_rebuilt_map()
+
+        while self.position.ply:
+            self.position.unmake_move()
+        self.assert_matches_rebuilt_map()
+
+
+if __name__ == '__main__':
+    unittest.main()
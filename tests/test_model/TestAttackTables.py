@@ -0,0 +1,37 @@
+import unittest
+from src.model.engine.attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+from src.model.engine.bitboard import WHITE, BLACK, coordinates_set, square_of
+
+
+def pattern_fields(row, col, pattern):
+    return {(row + d_row, col + d_col) for d_row, d_col in pattern
+            if 0 <= row + d_row <= 7 and 0 <= col + d_col <= 7}
+
+
+class TestAttackTables(unittest.TestCase):
+
+    def test_knight_attacks_match_move_pattern(self):
+        pattern = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+        for row in range(8):
+            for col in range(8):
+                self.assertEqual(coordinates_set(KNIGHT_ATTACKS[square_of(row, col)]),
+                                 pattern_fields(row, col, pattern))
+
+    def test_king_attacks_match_move_pattern(self):
+        pattern = [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1) if (d_row, d_col) != (0, 0)]
+        for row in range(8):
+            for col in range(8):
+                self.assertEqual(coordinates_set(KING_ATTACKS[square_of(row, col)]),
+                                 pattern_fields(row, col, pattern))
+
+    def test_pawn_attacks_match_move_pattern(self):
+        for row in range(8):
+            for col in range(8):
+                self.assertEqual(coordinates_set(PAWN_ATTACKS[WHITE][square_of(row, col)]),
+                                 pattern_fields(row, col, [(-1, -1), (-1, 1)]))
+                self.assertEqual(coordinates_set(PAWN_ATTACKS[BLACK][square_of(row, col)]),
+                                 pattern_fields(row, col, [(1, -1), (1, 1)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
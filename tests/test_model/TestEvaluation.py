@@ -0,0 +1,70 @@
+import unittest
+from src.model.engine.evaluation import MAX_PHASE, compute_scores, evaluate, taper
+from src.model.engine.move_generator import generate_legal_moves
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position, START_FEN
+
+
+def mirror_fen(fen):
+    # The board flipped vertically with the colors swapped
+    board, side, castling, en_passant, *counters = fen.split()
+    board = '/'.join(reversed(board.split('/'))).swapcase()
+    side = 'b' if side == 'w' else 'w'
+    castling = castling.swapcase()
+    if en_passant != '-':
+        en_passant = en_passant[0] + str(9 - int(en_passant[1]))
+    return ' '.join([board, side, castling, en_passant, *counters])
+
+
+class TestEvaluation(unittest.TestCase):
+    def test_incremental_scores_match_the_scores_from_scratch(self):
+        # Two plies of every standard position cover castling, en passant and (capturing) promotions
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            start_scores = compute_scores(position)
+            self.assertEqual((position.middlegame_score, position.endgame_score, position.phase), start_scores)
+            for move in generate_legal_moves(position):
+                position.make_move(move)
+                for reply in generate_legal_moves(position):
+                    position.make_move(reply)
+                    self.assertEqual((position.middlegame_score, position.endgame_score, position.phase),
+                                     compute_scores(position))
+                    position.unmake_move()
+                position.unmake_move()
+            self.assertEqual((position.middlegame_score, position.endgame_score, position.phase), start_scores)
+
+    def test_mirrored_positions_evaluate_to_opposite_scores(self):
+        start = Position.from_fen(START_FEN)
+        self.assertEqual(evaluate(start), 0)
+        self.assertEqual(start.phase, MAX_PHASE)
+
+        # The kiwipete position with the colors swapped and the board flipped
+        white = Position.from_fen(PERFT_POSITIONS['kiwipete'][0])
+        black = Position.from_fen("r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R b KQkq - 0 1")
+        self.assertNotEqual(evaluate(white), 0)
+        self.assertEqual(evaluate(black), -evaluate(white))
+
+    def test_tapered_scores_of_mirrored_positions_are_opposite(self):
+        # The phase of the middlegame positions is between the two ends, the blend has to be rounded
+        self.assertEqual(taper(-1, -1, 12), -taper(1, 1, 12))
+        self.assertEqual(taper(5, 0, 12), -taper(-5, 0, 12))
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            for move in generate_legal_moves(position):
+                position.make_move(move)
+                mirrored = Position.from_fen(mirror_fen(position.to_fen()))
+                self.assertEqual(evaluate(mirrored), -evaluate(position))
+                position.unmake_move()
+
+    def test_king_is_centralized_in_the_endgame_and_sheltered_in_the_middlegame(self):
+        endgame_center = Position.from_fen("4k3/pppppppp/8/8/3K4/8/PPPPPPPP/8 w - - 0 1")
+        endgame_corner = Position.from_fen("4k3/pppppppp/8/8/8/8/PPPPPPPP/6K1 w - - 0 1")
+        self.assertGreater(evaluate(endgame_center), evaluate(endgame_corner))
+
+        middlegame_center = Position.from_fen("rnbqkbnr/pppppppp/8/8/3K4/8/PPPPPPPP/RNBQ1R2 w kq - 0 1")
+        middlegame_corner = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQ1RK1 w kq - 0 1")
+        self.assertLess(evaluate(middlegame_center), evaluate(middlegame_corner))
+
+
+if __name__ == '__main__':
+    unittest.main()
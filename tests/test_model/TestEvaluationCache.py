@@ -0,0 +1,35 @@
+import unittest
+from src.model.engine.evaluation_cache import EvaluationCache, ENTRY_BYTES
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = EvaluationCache(1)
+
+    def test_size_is_a_power_of_two_within_the_budget(self):
+        self.assertLessEqual(self.cache.size_bytes, 1024 * 1024)
+        self.assertEqual(self.cache.size_bytes, self.cache.entry_count * ENTRY_BYTES)
+        self.assertEqual(self.cache.entry_count & (self.cache.entry_count - 1), 0)
+
+    def test_store_probe_and_replace(self):
+        self.assertIsNone(self.cache.probe(0x1234_5678_9ABC_DEF0))
+        self.cache.store(0x1234_5678_9ABC_DEF0, -250)
+        self.assertEqual(self.cache.probe(0x1234_5678_9ABC_DEF0), -250)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+        # Direct-mapped: a key of the same slot replaces the entry
+        other_key = 0x1234_5678_9ABC_DEF0 + self.cache.entry_count
+        self.cache.store(other_key, 30)
+        self.assertIsNone(self.cache.probe(0x1234_5678_9ABC_DEF0))
+        self.assertEqual(self.cache.probe(other_key), 30)
+
+    def test_clear(self):
+        self.cache.store(42, 7)
+        self.cache.clear()
+        self.assertIsNone(self.cache.probe(42))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import random
+import unittest
+from src.model.engine.bitboard import ROOK_DIRECTIONS, BISHOP_DIRECTIONS, QUEEN_DIRECTIONS, ray_attacks
+from src.model.engine.magic_bitboards import rook_attacks, bishop_attacks, queen_attacks
+
+
+class TestMagicBitboards(unittest.TestCase):
+    def setUp(self):
+        self.random = random.Random(42)
+
+    def random_occupancies(self, count):
+        return [self.random.getrandbits(64) & self.random.getrandbits(64) for _ in range(count)]
+
+    def test_empty_board_attacks_match_ray_walk(self):
+        for square in range(64):
+            self.assertEqual(rook_attacks(square, 0), ray_attacks(square, 0, ROOK_DIRECTIONS))
+            self.assertEqual(bishop_attacks(square, 0), ray_attacks(square, 0, BISHOP_DIRECTIONS))
+
+    def test_random_occupancies_match_ray_walk(self):
+        for square in range(64):
+            for occupancy in self.random_occupancies(50):
+                self.assertEqual(rook_attacks(square, occupancy), ray_attacks(square, occupancy, ROOK_DIRECTIONS))
+                self.assertEqual(bishop_attacks(square, occupancy),
+                                 ray_attacks(square, occupancy, BISHOP_DIRECTIONS))
+                self.assertEqual(queen_attacks(square, occupancy),
+                                 ray_attacks(square, occupancy, QUEEN_DIRECTIONS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+from src.model.board import Board
+from src.model.engine.bitboard import WHITE, BLACK, PAWN, ROOK, BISHOP, KNIGHT, QUEEN, KING, SQUARE_BITS, square_of
+from src.model.engine.move import (CAPTURE, EN_PASSANT, KING_CASTLE, DOUBLE_PAWN_PUSH, encode_move, move_from,
+                                   move_to, promotion_flags)
+from src.model.engine.move_generator import (generate_legal_moves, generate_pseudo_legal_moves, pinned_pieces,
+                                             checkers_of, try_make_move, is_legal)
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position, WHITE_KINGSIDE, WHITE_QUEENSIDE
+from src.model.enums.color import Color
+from src.model.players.player import Player
+
+
+def targets_from(moves, row, col):
+    from_square = square_of(row, col)
+    return {divmod(move_to(move), 8) for move in moves if move_from(move) == from_square}
+
+
+class TestMoveGenerator(unittest.TestCase):
+    def setUp(self):
+        self.position = Position()
+
+    def put(self, color, piece, row, col):
+        self.position.put_piece(color, piece, square_of(row, col))
+
+    def test_start_position_has_twenty_moves(self):
+        board = Board()
+        white_player = Player("White", Color.WHITE, board, None)
+        black_player = Player("Black", Color.BLACK, board, None)
+        white_player.init_pieces()
+        black_player.init_pieces()
+        board.position.update_state(white_player, black_player)
+        self.assertEqual(len(generate_legal_moves(board.position)), 20)
+
+    def test_pinned_rook_moves_only_along_the_pin_line(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, ROOK, 5, 4)
+        self.put(BLACK, QUEEN, 1, 4)
+        self.put(BLACK, KING, 0, 0)
+        self.assertEqual(pinned_pieces(self.position, WHITE), SQUARE_BITS[square_of(5, 4)])
+        moves = generate_legal_moves(self.position, WHITE)
+        self.assertEqual(targets_from(moves, 5, 4), {(6, 4), (4, 4), (3, 4), (2, 4), (1, 4)})
+
+    def test_pinned_knight_can_not_move(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, KNIGHT, 6, 3)
+        self.put(BLACK, BISHOP, 4, 1)
+        self.put(BLACK, KING, 0, 0)
+        self.assertEqual(targets_from(generate_legal_moves(self.position, WHITE), 6, 3), set())
+
+    def test_single_check_can_be_blocked_or_captured(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, ROOK, 5, 0)
+        self.put(WHITE, KNIGHT, 5, 5)
+        self.put(BLACK, ROOK, 2, 4)
+        self.put(BLACK, KING, 0, 0)
+        self.assertEqual(checkers_of(self.position, WHITE), SQUARE_BITS[square_of(2, 4)])
+        moves = generate_legal_moves(self.position, WHITE)
+        self.assertEqual(targets_from(moves, 5, 0), {(5, 4)})
+        self.assertEqual(targets_from(moves, 5, 5), {(3, 4)})
+        self.assertEqual(targets_from(moves, 7, 4), {(7, 3), (7, 5), (6, 3), (6, 5)})
+
+    def test_double_check_allows_only_king_moves(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, QUEEN, 7, 0)
+        self.put(BLACK, ROOK, 2, 4)
+        self.put(BLACK, KNIGHT, 5, 3)
+        self.put(BLACK, KING, 0, 0)
+        moves = generate_legal_moves(self.position, WHITE)
+        self.assertTrue(all(move_from(move) == square_of(7, 4) for move in moves))
+
+    def test_castling_is_not_allowed_through_an_attacked_square(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, ROOK, 7, 7)
+        self.put(WHITE, ROOK, 7, 0)
+        self.put(BLACK, ROOK, 2, 5)
+        self.put(BLACK, KING, 0, 0)
+        self.position.castling_rights = WHITE_KINGSIDE | WHITE_QUEENSIDE
+        king_targets = targets_from(generate_legal_moves(self.position, WHITE), 7, 4)
+        self.assertNotIn((7, 6), king_targets)
+        self.assertIn((7, 2), king_targets)
+
+    def test_en_passant_that_exposes_the_king_is_illegal(self):
+        self.put(WHITE, KING, 3, 0)
+        self.put(WHITE, PAWN, 3, 3)
+        self.put(BLACK, PAWN, 3, 4)
+        self.put(BLACK, ROOK, 3, 7)
+        self.put(BLACK, KING, 0, 7)
+        self.position.en_passant_square = square_of(2, 4)
+        self.assertEqual(targets_from(generate_legal_moves(self.position, WHITE), 3, 3), {(2, 3)})
+
+        self.position.remove_piece(BLACK, ROOK, square_of(3, 7))
+        self.assertEqual(targets_from(generate_legal_moves(self.position, WHITE), 3, 3), {(2, 3), (2, 4)})
+
+    def test_moves_carry_their_flags(self):
+        self.put(WHITE, KING, 7, 4)
+        self.put(WHITE, ROOK, 7, 7)
+        self.put(WHITE, PAWN, 1, 1)
+        self.put(WHITE, PAWN, 6, 0)
+        self.put(WHITE, PAWN, 3, 3)
+        self.put(BLACK, PAWN, 3, 4)
+        self.put(BLACK, KNIGHT, 0, 0)
+        self.put(BLACK, KING, 0, 7)
+        self.position.castling_rights = WHITE_KINGSIDE
+        self.position.en_passant_square = square_of(2, 4)
+        moves = set(generate_legal_moves(self.position, WHITE))
+        for piece_idx in (QUEEN, ROOK, BISHOP, KNIGHT):
+            self.assertIn(encode_move(square_of(1, 1), square_of(0, 0), CAPTURE | promotion_flags(piece_idx)), moves)
+            self.assertIn(encode_move(square_of(1, 1), square_of(0, 1), promotion_flags(piece_idx)), moves)
+        self.assertIn(encode_move(square_of(7, 4), square_of(7, 6), KING_CASTLE), moves)
+        self.assertIn(encode_move(square_of(6, 0), square_of(4, 0), DOUBLE_PAWN_PUSH), moves)
+        self.assertIn(encode_move(square_of(3, 3), square_of(2, 4), EN_PASSANT), moves)
+
+    def test_pseudo_legal_moves_filtered_by_try_make_move_are_the_legal_moves(self):
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            legal_moves = []
+            for move in generate_pseudo_legal_moves(position):
+                if try_make_move(position, move):
+                    position.unmake_move()
+                    legal_moves.append(move)
+            self.assertEqual(sorted(legal_moves), sorted(generate_legal_moves(position)))
+            self.assertEqual(position.to_fen().split()[:4], fen.split()[:4])
+
+    def test_is_legal_agrees_with_try_make_move(self):
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            # One ply deeper as well, so positions in check are covered
+            for first_move in generate_legal_moves(position):
+                position.make_move(first_move)
+                color_idx = position.side_to_move
+                pinned = pinned_pieces(position, color_idx)
+                checkers = checkers_of(position, color_idx)
+                for move in generate_pseudo_legal_moves(position):
+                    legal = try_make_move(position, move)
+                    if legal:
+                        position.unmake_move()
+                    self.assertEqual(is_legal(position, move, pinned, checkers), legal)
+                position.unmake_move()
+
+
+if __name__ == '__main__':
+    unittest.main()
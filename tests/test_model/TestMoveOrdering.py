@@ -0,0 +1,63 @@
+import unittest
+from src.model.engine.bitboard import WHITE, BLACK
+from src.model.engine.move import CAPTURE, DOUBLE_PAWN_PUSH, encode_move, move_to_uci
+from src.model.engine.move_ordering import HISTORY_LIMIT, MoveOrdering, capture_score
+from src.model.engine.move_picker import pick_moves
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def test_captures_are_picked_by_mvv_lva(self):
+        # White can take the queen on d5 with a pawn or the knight, or a pawn with the bishop
+        position = Position.from_fen("4k3/8/8/3q4/4P3/2N5/6p1/4K2B w - - 0 1")
+        captures = [move for move in pick_moves(position) if move & CAPTURE << 12]
+        self.assertEqual([move_to_uci(move) for move in captures], ['e4d5', 'c3d5', 'h1g2'])
+        squares = position.squares
+        self.assertGreater(capture_score(squares, captures[0]), capture_score(squares, captures[1]))
+
+    def test_cutoffs_feed_killers_history_and_counter_moves(self):
+        ordering = MoveOrdering()
+        previous_move = encode_move(12, 28)
+        cutoff_move = encode_move(62, 45)
+        failed_move = encode_move(57, 42)
+        ordering.on_cutoff(WHITE, 3, 4, cutoff_move, previous_move, [failed_move])
+
+        self.assertEqual(ordering.killers_at(3)[0], cutoff_move)
+        self.assertEqual(ordering.counter_move(previous_move), cutoff_move)
+        self.assertEqual(ordering.history_score(WHITE, cutoff_move), 16)
+        self.assertEqual(ordering.history_score(WHITE, failed_move), -16)
+        self.assertEqual(ordering.history_score(BLACK, cutoff_move), 0)
+
+        # Captures are ordered by MVV-LVA and not remembered
+        ordering.on_cutoff(WHITE, 3, 4, encode_move(1, 2, CAPTURE), previous_move, [])
+        self.assertEqual(ordering.killers_at(3)[0], cutoff_move)
+
+        ordering.new_search()
+        self.assertEqual(ordering.killers_at(3), [0, 0])
+        self.assertEqual(ordering.counter_move(previous_move), 0)
+        self.assertEqual(ordering.history_score(WHITE, cutoff_move), 8)
+
+    def test_history_is_aged_on_both_sides(self):
+        ordering = MoveOrdering()
+        cutoff_move = encode_move(62, 45)
+        failed_move = encode_move(57, 42)
+        ordering.history[failed_move & 0xFFF] = -HISTORY_LIMIT
+        ordering.history[encode_move(52, 36) & 0xFFF] = -1
+        # A failure past the negative limit halves the table, towards zero
+        ordering.on_cutoff(WHITE, 0, 1, cutoff_move, 0, [failed_move])
+        self.assertEqual(ordering.history_score(WHITE, failed_move), -((HISTORY_LIMIT + 1) // 2))
+        self.assertEqual(ordering.history_score(WHITE, cutoff_move), 0)
+        self.assertEqual(ordering.history_score(WHITE, encode_move(52, 36)), 0)
+
+    def test_quiet_moves_are_picked_by_history(self):
+        position = Position.from_fen(PERFT_POSITIONS['start'][0])
+        ordering = MoveOrdering()
+        preferred_move = encode_move(51, 35, DOUBLE_PAWN_PUSH)
+        ordering.on_cutoff(WHITE, 0, 5, preferred_move, 0, [])
+        ordering.killers_at(0)[0] = 0
+        self.assertEqual(next(pick_moves(position, ordering=ordering)), preferred_move)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from src.model.engine.move import CAPTURE, PROMOTION, encode_move
+from src.model.engine.move_generator import generate_pseudo_legal_moves, generate_quiet_moves, is_pseudo_legal
+from src.model.engine.move_picker import pick_moves
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position
+
+
+def is_tactical(move):
+    return bool(move & (CAPTURE | PROMOTION) << 12)
+
+
+class TestMovePicker(unittest.TestCase):
+    def test_stages_hand_out_every_pseudo_legal_move_once(self):
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            moves = list(generate_pseudo_legal_moves(position))
+            quiet_moves = list(generate_quiet_moves(position))
+            hash_move = quiet_moves[-1]
+            killers = quiet_moves[:2]
+            picked = list(pick_moves(position, hash_move, killers))
+
+            self.assertEqual(sorted(picked), sorted(moves))
+            self.assertEqual(picked[0], hash_move)
+            tactical = [is_tactical(move) for move in picked[1:]]
+            # Captures first, then the killers, then the rest of the quiet moves
+            self.assertEqual(tactical, sorted(tactical, reverse=True))
+            self.assertEqual(picked[tactical.count(True) + 1:tactical.count(True) + 3], killers)
+
+    def test_moves_of_other_positions_are_rejected(self):
+        positions = [Position.from_fen(fen) for fen, _ in PERFT_POSITIONS.values()]
+        for position in positions:
+            own_moves = set(generate_pseudo_legal_moves(position))
+            for other in positions:
+                for move in generate_pseudo_legal_moves(other):
+                    self.assertEqual(is_pseudo_legal(position, move), move in own_moves)
+
+        position = Position.from_fen(PERFT_POSITIONS['start'][0])
+        # e2e5 and g1f3 flagged as a capture
+        bogus_moves = [encode_move(52, 28), encode_move(62, 45, CAPTURE)]
+        self.assertEqual(list(pick_moves(position, bogus_moves[0], bogus_moves[1:])),
+                         list(pick_moves(position)))
+
+    def test_moves_with_undefined_flags_are_rejected(self):
+        # Every from and to square with every flag value, only the generated moves are pseudo-legal
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            own_moves = set(generate_pseudo_legal_moves(position))
+            for move in range(1 << 16):
+                self.assertEqual(is_pseudo_legal(position, move), move in own_moves)
+
+        # b7xa6 with the flags 6 and 7 as a corrupt hash move
+        position = Position.from_fen("4k3/1p6/N7/8/8/8/8/4K3 b - - 0 1")
+        capture = encode_move(9, 16, CAPTURE)
+        self.assertTrue(is_pseudo_legal(position, capture))
+        for flags in (6, 7):
+            hash_move = encode_move(9, 16, flags)
+            self.assertFalse(is_pseudo_legal(position, hash_move))
+            self.assertEqual(list(pick_moves(position, hash_move)), list(pick_moves(position)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import multiprocessing
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from src.model.board import Board
+from src.model.engine.bitboard import square_of
+from src.model.engine.move import encode_move
+from src.model.engine.move_generator import generate_legal_moves
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position, START_FEN
+from src.model.enums.color import Color
+from src.model.enums.parallel_mode import ParallelMode
+from src.model.pieces.king import King
+from src.model.pieces.pawn import Pawn
+from src.model.pieces.rook import Rook
+from src.model.players.alpha_beta_player import AlphaBeta, PruningOptions
+from src.model.players import parallel_alpha_beta
+from src.model.players.parallel_alpha_beta import ParallelAlphaBeta, _init_worker, _search_root_move
+from src.model.players.player import Player
+
+
+class OrderedExecutor:
+    # Runs the tasks in the main process when the search waits for them, the tasks of a batch in submission or in
+    # reverse order, as if the workers finished in that order
+    def __init__(self, reverse: bool):
+        self.reverse = reverse
+        self.tasks = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.tasks.append((future, fn, args))
+        return future
+
+    def run(self):
+        tasks, self.tasks = self.tasks, []
+        for future, fn, args in (reversed(tasks) if self.reverse else tasks):
+            future.set_result(fn(*args))
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestParallelAlphaBeta(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.white_player = ParallelAlphaBeta("White", Color.WHITE, self.board, None, max_depth=3, workers=2)
+        self.black_player = Player("Black", Color.BLACK, self.board, None)
+
+    def tearDown(self):
+        self.white_player.close()
+
+    def test_finds_back_rank_mate_and_leaves_the_pieces_untouched(self):
+        self.white_player.add_piece(King(Color.WHITE, 7, 6))
+        self.white_player.add_piece(Rook(Color.WHITE, 7, 0))
+        self.black_player.add_piece(King(Color.BLACK, 0, 6))
+        for col in (5, 6, 7):
+            self.black_player.add_piece(Pawn(Color.BLACK, 1, col))
+        self.board.position.update_state(self.white_player, self.black_player)
+        position_before = self.board.position.copy()
+
+        move = self.white_player.choose_move(self.black_player)
+
+        self.assertEqual(move, encode_move(square_of(7, 0), square_of(0, 0)))
+        self.assertEqual(self.white_player.principal_variation[0], move)
+        self.assertEqual(self.board.position, position_before)
+
+    def test_plays_the_move_and_score_of_the_serial_search(self):
+        board = Board()
+        serial_player = AlphaBeta("White", Color.WHITE, board, None, max_depth=3)
+        black_player = Player("Black", Color.BLACK, board, None)
+        for player, opponent, player_board in ((self.white_player, self.black_player, self.board),
+                                               (serial_player, black_player, board)):
+            player.init_pieces()
+            opponent.init_pieces()
+            player_board.position.update_state(player, opponent)
+
+        serial_move = serial_player.choose_move(black_player)
+        serial_score, _ = serial_player.search_root(board.position.copy(), 3)
+        parallel_move = self.white_player.choose_move(self.black_player)
+        parallel_score, _ = self.white_player.search_root(self.board.position.copy(), 3)
+
+        self.assertEqual(parallel_move, serial_move)
+        self.assertEqual(parallel_score, serial_score)
+        self.assertEqual(self.white_player.completed_depth, 3)
+
+    def test_best_move_does_not_depend_on_the_completion_order(self):
+        # Several root moves of the start position score the same at depth 3
+        real_wait = parallel_alpha_beta.wait
+        results = []
+        for reverse in (False, True):
+            player = ParallelAlphaBeta("White", Color.WHITE, Board(), None, max_depth=3, workers=2)
+            executor = OrderedExecutor(reverse)
+            player._pool = executor
+            _init_worker(player._shared_alpha, player._stop_flag, player.color, player.hash_size_mb, player.pruning)
+
+            def wait(futures, **kwargs):
+                executor.run()
+                return real_wait(futures, **kwargs)
+
+            with mock.patch.object(parallel_alpha_beta, 'wait', wait):
+                results.append(player.search_root(Position.from_fen(START_FEN), 3))
+        self.assertEqual(results[0], results[1])
+
+    def test_worker_searches_with_integer_bounds_from_the_shared_alpha(self):
+        # A bound that ends up as a score is stored in the transposition table, which packs integers only
+        shared_alpha = multiprocessing.Value('d', 38.0)
+        _init_worker(shared_alpha, multiprocessing.Value('b', 0), Color.WHITE, 1, PruningOptions())
+        searcher = parallel_alpha_beta._worker_search
+        bounds = []
+        alpha_beta = searcher.alpha_beta
+
+        def record_bounds(position, depth, max_depth, alpha, beta, *args):
+            bounds.extend((alpha, beta))
+            return alpha_beta(position, depth, max_depth, alpha, beta, *args)
+
+        fen = PERFT_POSITIONS['kiwipete'][0]
+        position = Position.from_fen(fen)
+        with mock.patch.object(searcher, 'alpha_beta', record_bounds):
+            for move in generate_legal_moves(position)[:5]:
+                result = _search_root_move(fen, move, 3, float('inf'), [], False, 0)
+                self.assertIsInstance(result.score, int)
+        self.assertTrue(bounds)
+        self.assertTrue(all(isinstance(bound, int) or bound in (float('-inf'), float('inf')) for bound in bounds))
+
+    def test_lazy_smp_helpers_fill_the_shared_transposition_table(self):
+        board = Board()
+        white_player = ParallelAlphaBeta("White", Color.WHITE, board, None, max_depth=3, workers=3,
+                                         mode=ParallelMode.LAZY_SMP)
+        black_player = Player("Black", Color.BLACK, board, None)
+        try:
+            white_player.add_piece(King(Color.WHITE, 7, 6))
+            white_player.add_piece(Rook(Color.WHITE, 7, 0))
+            black_player.add_piece(King(Color.BLACK, 0, 6))
+            for col in (5, 6, 7):
+                black_player.add_piece(Pawn(Color.BLACK, 1, col))
+            board.position.update_state(white_player, black_player)
+            position_before = board.position.copy()
+
+            move = white_player.choose_move(black_player)
+
+            self.assertEqual(move, encode_move(square_of(7, 0), square_of(0, 0)))
+            self.assertGreater(white_player.helper_state_counter, 0)
+            self.assertEqual(board.position, position_before)
+        finally:
+            white_player.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
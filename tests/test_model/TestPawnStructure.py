@@ -0,0 +1,92 @@
+import unittest
+from src.model.engine.bitboard import PAWN, square_of
+from src.model.engine.evaluation import evaluate
+from src.model.engine.move_generator import generate_legal_moves
+from src.model.engine.pawn_structure import (PawnTable, DOUBLED_PENALTY, ISOLATED_PENALTY, BACKWARD_PENALTY,
+                                             PASSED_BONUS_MIDDLEGAME, PASSED_BONUS_ENDGAME, evaluate_pawns,
+                                             pawn_shield)
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position
+from src.model.engine.zobrist import compute_pawn_key
+
+
+def pawns(*coordinates):
+    bitboard = 0
+    for row, col in coordinates:
+        bitboard |= 1 << square_of(row, col)
+    return bitboard
+
+
+class TestPawnStructure(unittest.TestCase):
+    def test_incremental_pawn_key_matches_the_key_from_scratch(self):
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            start_key = position.pawn_key
+            self.assertEqual(start_key, compute_pawn_key(position))
+            for move in generate_legal_moves(position):
+                position.make_move(move)
+                self.assertEqual(position.pawn_key, compute_pawn_key(position))
+                position.unmake_move()
+            self.assertEqual(position.pawn_key, start_key)
+
+    def test_doubled_and_isolated_pawns(self):
+        # a2 a3 c2 against a7 c7: three isolated white pawns against two, the a-pawns are doubled, nothing is passed
+        white_pawns = pawns((6, 0), (5, 0), (6, 2))
+        black_pawns = pawns((1, 2), (1, 0))
+        middlegame, endgame = evaluate_pawns(white_pawns, black_pawns)
+        self.assertEqual(middlegame, -DOUBLED_PENALTY[0] - ISOLATED_PENALTY[0])
+        self.assertEqual(endgame, -DOUBLED_PENALTY[1] - ISOLATED_PENALTY[1])
+
+    def test_passed_pawns_are_worth_more_the_further_they_advanced(self):
+        # A lone white pawn against a black pawn on the other wing, both are passed and isolated
+        black_pawns = pawns((1, 7))
+        scores = [evaluate_pawns(pawns((row, 0)), black_pawns) for row in (6, 5, 4, 3, 2, 1)]
+        self.assertEqual(scores[4], (PASSED_BONUS_MIDDLEGAME[5] - PASSED_BONUS_MIDDLEGAME[1],
+                                     PASSED_BONUS_ENDGAME[5] - PASSED_BONUS_ENDGAME[1]))
+        self.assertEqual(scores, sorted(scores))
+        self.assertEqual(scores[0], (0, 0))
+
+        # A black pawn on the adjacent file in front stops it
+        self.assertEqual(evaluate_pawns(pawns((2, 0)), pawns((1, 1))), (0, 0))
+
+    def test_backward_pawn(self):
+        # d3 cannot be supported by e4 and its stop square d4 is attacked by c5
+        white_pawns = pawns((5, 3), (4, 4))
+        backward = evaluate_pawns(white_pawns, pawns((3, 2)))
+        # With the black pawn on c6 d4 is safe, nothing else changes
+        safe = evaluate_pawns(white_pawns, pawns((2, 2)))
+        self.assertEqual(backward, (safe[0] - BACKWARD_PENALTY[0], safe[1] - BACKWARD_PENALTY[1]))
+
+    def test_pawn_shield_counts_the_pawns_in_front_of_a_castled_king(self):
+        # White king g1 behind f2 g2 h3, black king g8 without pawns
+        white_pawns = pawns((6, 5), (6, 6), (5, 7))
+        self.assertEqual(pawn_shield(white_pawns, 0, square_of(7, 6), square_of(0, 6)), 10 + 10 + 5)
+        # A king in the center of the board has no shield
+        self.assertEqual(pawn_shield(white_pawns, 0, square_of(4, 6), square_of(0, 6)), 0)
+
+    def test_pawn_table_caches_by_pawn_key(self):
+        table = PawnTable(1)
+        position = Position.from_fen(PERFT_POSITIONS['kiwipete'][0])
+        self.assertEqual(evaluate(position, table), evaluate(position))
+        self.assertEqual((table.hits, table.misses), (0, 1))
+
+        # A king move keeps the pawn key, the structure comes from the table
+        for move in generate_legal_moves(position):
+            if position.squares[move & 63] % 6 != PAWN:
+                position.make_move(move)
+                break
+        self.assertEqual(evaluate(position, table), evaluate(position))
+        self.assertEqual((table.hits, table.misses), (1, 1))
+        table.clear()
+        self.assertIsNone(table.probe(position.pawn_key))
+
+    def test_mirrored_pawn_structures_score_opposite(self):
+        white_pawns = pawns((6, 0), (5, 0), (4, 3), (6, 5), (2, 6))
+        black_pawns = pawns((1, 1), (3, 3), (1, 7))
+        mirror = lambda bitboard: int.from_bytes(bitboard.to_bytes(8, 'little'), 'big')
+        middlegame, endgame = evaluate_pawns(white_pawns, black_pawns)
+        self.assertEqual(evaluate_pawns(mirror(black_pawns), mirror(white_pawns)), (-middlegame, -endgame))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from src.model.engine.bitboard import WHITE, BLACK, KING, square_of
+from src.model.engine.move import move_to_uci
+from src.model.engine.perft import PERFT_POSITIONS, perft, divide, run_perft
+from src.model.engine.position import Position, START_FEN, ALL_CASTLING_RIGHTS
+
+
+class TestPerft(unittest.TestCase):
+    def test_fen_round_trip(self):
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            self.assertEqual(position.to_fen().split()[:4], fen.split()[:4])
+
+        position = Position.from_fen(START_FEN)
+        self.assertEqual(position.piece_at(square_of(7, 4)), (WHITE, KING))
+        self.assertEqual(position.piece_at(square_of(0, 4)), (BLACK, KING))
+        self.assertEqual(position.castling_rights, ALL_CASTLING_RIGHTS)
+
+    def test_standard_positions_match_published_counts(self):
+        for name, (fen, expected_counts) in PERFT_POSITIONS.items():
+            position = Position.from_fen(fen)
+            for depth, expected_nodes in enumerate(expected_counts[:3], start=1):
+                self.assertEqual(perft(position, depth), expected_nodes, f"{name} depth {depth}")
+
+    def test_divide_and_hash_table_agree_with_perft(self):
+        position = Position.from_fen(PERFT_POSITIONS['kiwipete'][0])
+        root_counts = divide(position, 2)
+        self.assertEqual(len(root_counts), 48)
+        self.assertEqual(sum(root_counts.values()), 2039)
+        self.assertIn('e1g1', {move_to_uci(move) for move in root_counts})
+        self.assertEqual(perft(position, 3, {}), 97862)
+
+    def test_parallel_root_split(self):
+        position = Position.from_fen(PERFT_POSITIONS['position4'][0])
+        result = run_perft(position, 3, workers=2)
+        self.assertEqual(result.nodes, 9467)
+        self.assertEqual(list(result.divide), list(divide(position, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
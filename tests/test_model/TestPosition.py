@@ -0,0 +1,256 @@
+import unittest
+from src.controller.game_saver import GameSaver
+from src.model.board import Board
+from src.model.engine.bitboard import (WHITE, BLACK, PAWN, ROOK, QUEEN, KING, NO_SQUARE, SQUARE_BITS, square_of,
+                                       coordinates_set, iter_squares, knight_attacks, ray_attacks, ROOK_DIRECTIONS)
+from src.model.engine.move import (CAPTURE, DOUBLE_PAWN_PUSH, EN_PASSANT, KING_CASTLE, encode_move,
+                                   promotion_flags)
+from src.model.engine.position import Position, WHITE_KINGSIDE, WHITE_QUEENSIDE, ALL_CASTLING_RIGHTS
+from src.model.engine.zobrist import compute_key
+from src.model.enums.color import Color
+from src.model.enums.piece_type import PieceType
+from src.model.pieces.pawn import Pawn
+from src.model.players.player import Player
+
+"""
+                            Black player's side
+            -----------------------------------------------------------------------------
+
+            Grid layout                       Square indices                      Chess notation
+
+[00][01][02][03][04][05][06][07]   [ 0][ 1][ 2][ 3][ 4][ 5][ 6][ 7]   [A8][B8][C8][D8][E8][F8][G8][H8]
+[10][11][12][13][14][15][16][17]   [ 8][ 9][10][11][12][13][14][15]   [A7][B7][C7][D7][E7][F7][G7][H7]
+[20][21][22][23][24][25][26][27]   [16][17][18][19][20][21][22][23]   [A6][B6][C6][D6][E6][F6][G6][H6]
+[30][31][32][33][34][35][36][37]   [24][25][26][27][28][29][30][31]   [A5][B5][C5][D5][E5][F5][G5][H5]
+[40][41][42][43][44][45][46][47]   [32][33][34][35][36][37][38][39]   [A4][B4][C4][D4][E4][F4][G4][H4]
+[50][51][52][53][54][55][56][57]   [40][41][42][43][44][45][46][47]   [A3][B3][C3][D3][E3][F3][G3][H3]
+[60][61][62][63][64][65][66][67]   [48][49][50][51][52][53][54][55]   [A2][B2][C2][D2][E2][F2][G2][H2]
+[70][71][72][73][74][75][76][77]   [56][57][58][59][60][61][62][63]   [A1][B1][C1][D1][E1][F1][G1][H1]
+
+            -----------------------------------------------------------------------------
+                                             White player's side
+"""
+
+
+class TestPosition(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.white_player = Player("White", Color.WHITE, self.board, None)
+        self.black_player = Player("Black", Color.BLACK, self.board, None)
+
+    def test_iter_squares_and_coordinates_set(self):
+        bitboard = SQUARE_BITS[0] | SQUARE_BITS[27] | SQUARE_BITS[63]
+        self.assertEqual(list(iter_squares(bitboard)), [0, 27, 63])
+        self.assertEqual(coordinates_set(bitboard), {(0, 0), (3, 3), (7, 7)})
+
+    def test_knight_attacks_do_not_wrap_around_the_board(self):
+        self.assertEqual(coordinates_set(knight_attacks(SQUARE_BITS[square_of(0, 0)])), {(1, 2), (2, 1)})
+        self.assertEqual(coordinates_set(knight_attacks(SQUARE_BITS[square_of(4, 7)])),
+                         {(2, 6), (3, 5), (5, 5), (6, 6)})
+
+    def test_ray_attacks_stop_at_first_blocker(self):
+        occupancy = SQUARE_BITS[square_of(3, 5)] | SQUARE_BITS[square_of(1, 3)]
+        expected_result = {(2, 3), (1, 3), (3, 4), (3, 5), (3, 2), (3, 1), (3, 0),
+                           (4, 3), (5, 3), (6, 3), (7, 3)}
+        self.assertEqual(coordinates_set(ray_attacks(square_of(3, 3), occupancy, ROOK_DIRECTIONS)), expected_result)
+
+    def test_put_move_and_remove_piece(self):
+        position = Position()
+        position.put_piece(WHITE, ROOK, square_of(7, 0))
+        self.assertEqual(position.piece_at(square_of(7, 0)), (WHITE, ROOK))
+        position.move_piece(WHITE, ROOK, square_of(7, 0), square_of(3, 0))
+        self.assertIsNone(position.piece_at(square_of(7, 0)))
+        self.assertTrue(position.is_occupied_by(WHITE, square_of(3, 0)))
+        position.remove_piece(WHITE, ROOK, square_of(3, 0))
+        self.assertEqual(position.all_occupancy, 0)
+
+    def test_players_keep_the_board_position_in_sync(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        position = self.board.position
+        self.assertEqual(position.occupancy(WHITE), 0xFFFF << 48)
+        self.assertEqual(position.occupancy(BLACK), 0xFFFF)
+        self.assertEqual(position.king_square(WHITE), square_of(7, 4))
+        self.assertTrue(self.white_player.has_piece_at(6, 3))
+        self.assertFalse(self.white_player.has_piece_at(1, 3))
+
+        self.white_player.selected_piece = self.white_player.get_piece_at(6, 4)
+        self.white_player.move_piece(4, 4)
+        self.assertTrue(self.white_player.has_piece_at(4, 4))
+        self.assertFalse(self.white_player.has_piece_at(6, 4))
+        self.assertEqual(Position.from_players(self.white_player, self.black_player).bitboard(WHITE, PAWN),
+                         position.bitboard(WHITE, PAWN))
+
+        self.black_player.remove_piece_at(1, 0)
+        self.assertFalse(position.is_occupied(square_of(1, 0)))
+
+    def test_update_state_castling_rights_and_en_passant(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        position = self.board.position
+        position.update_state(self.white_player, self.black_player)
+        self.assertEqual(position.side_to_move, WHITE)
+        self.assertEqual(position.castling_rights, ALL_CASTLING_RIGHTS)
+        self.assertEqual(position.en_passant_square, NO_SQUARE)
+
+        self.white_player.get_piece_at(7, 7).is_moved = True
+        self.black_player.king.is_moved = True
+        pawn = self.white_player.get_piece_at(6, 4)
+        self.white_player.selected_piece = pawn
+        self.white_player.move_piece(4, 4)
+        pawn.is_en_passant = True
+
+        position.update_state(self.black_player, self.white_player)
+        self.assertEqual(position.side_to_move, BLACK)
+        self.assertEqual(position.castling_rights, WHITE_QUEENSIDE)
+        # No black pawn can take e4 en passant, the square is not set and not hashed
+        self.assertEqual(position.en_passant_square, NO_SQUARE)
+        self.assertEqual(position.zobrist_key, compute_key(position))
+
+        self.black_player.add_piece(Pawn(Color.BLACK, 4, 3))
+        position.update_state(self.black_player, self.white_player)
+        self.assertEqual(position.en_passant_square, square_of(5, 4))
+        self.assertEqual(position.zobrist_key, compute_key(position))
+
+    def test_square_index_follows_castling_promotion_and_en_passant(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        for col in (5, 6):
+            self.white_player.remove_piece_at(7, col)
+        self.white_player.selected_piece = self.white_player.king
+        self.white_player.do_castling(7, 6)
+        self.assertIs(self.white_player.get_piece_at(7, 6), self.white_player.king)
+        self.assertEqual(self.white_player.get_piece_at(7, 5).type, PieceType.ROOK)
+        self.assertIsNone(self.white_player.get_piece_at(7, 7))
+        self.assertIsNone(self.white_player.get_piece_at(7, 4))
+
+        self.black_player.remove_piece_at(0, 0)
+        pawn = self.white_player.get_piece_at(6, 0)
+        self.white_player.relocate_piece(pawn, 1, 0)
+        self.white_player.selected_piece = pawn
+        self.white_player.do_promotion(0, 0, PieceType.QUEEN)
+        self.assertEqual(self.white_player.get_piece_at(0, 0).type, PieceType.QUEEN)
+        self.assertFalse(self.white_player.has_piece_at(1, 0))
+
+        pawn = self.white_player.get_piece_at(6, 3)
+        self.white_player.relocate_piece(pawn, 3, 3)
+        self.white_player.selected_piece = pawn
+        self.white_player.do_en_passant(2, 4)
+        self.assertIs(self.white_player.get_piece_at(2, 4), pawn)
+        self.assertFalse(self.white_player.has_piece_at(3, 3))
+
+        for player in (self.white_player, self.black_player):
+            for piece in player.pieces:
+                self.assertIs(player.get_piece_at(piece.row, piece.col), piece)
+        self.assertEqual(Position.from_players(self.white_player, self.black_player).occupancy(WHITE),
+                         self.board.position.occupancy(WHITE))
+
+    def test_attacked_mask_is_read_from_the_live_attack_map(self):
+        self.white_player.add_piece(Pawn(Color.WHITE, 6, 4))
+        self.black_player.add_piece(Pawn(Color.BLACK, 5, 3))
+        self.white_player.add_piece(Pawn(Color.WHITE, 5, 5))
+        self.assertEqual(self.white_player.attacked_fields, {(5, 3), (5, 5), (4, 4), (4, 6)})
+        self.assertTrue(self.white_player.is_attacking(5, 3))
+        self.assertFalse(self.white_player.is_attacking(6, 4))
+        self.white_player.remove_piece_at(6, 4)
+        self.assertEqual(self.white_player.attacked_fields, {(4, 4), (4, 6)})
+
+    def test_make_and_unmake_move_restore_the_position(self):
+        position = Position()
+        position.put_piece(WHITE, KING, square_of(7, 4))
+        position.put_piece(WHITE, ROOK, square_of(7, 7))
+        position.put_piece(WHITE, PAWN, square_of(1, 1))
+        position.put_piece(WHITE, PAWN, square_of(3, 4))
+        position.put_piece(BLACK, KING, square_of(0, 4))
+        position.put_piece(BLACK, ROOK, square_of(0, 0))
+        position.put_piece(BLACK, PAWN, square_of(1, 3))
+        position.castling_rights = ALL_CASTLING_RIGHTS
+        position.side_to_move = BLACK
+        start = position.copy()
+
+        position.make_move(encode_move(square_of(1, 3), square_of(3, 3), DOUBLE_PAWN_PUSH))
+        self.assertEqual(position.en_passant_square, square_of(2, 3))
+        position.make_move(encode_move(square_of(3, 4), square_of(2, 3), EN_PASSANT))
+        self.assertIsNone(position.piece_at(square_of(3, 3)))
+        position.make_move(encode_move(square_of(0, 4), square_of(0, 3)))
+        position.make_move(encode_move(square_of(1, 1), square_of(0, 0), CAPTURE | promotion_flags(QUEEN)))
+        self.assertEqual(position.piece_at(square_of(0, 0)), (WHITE, QUEEN))
+        self.assertEqual(position.castling_rights, WHITE_KINGSIDE | WHITE_QUEENSIDE)
+        position.make_move(encode_move(square_of(0, 3), square_of(1, 3)))
+        position.make_move(encode_move(square_of(7, 4), square_of(7, 6), KING_CASTLE))
+        self.assertEqual(position.piece_at(square_of(7, 5)), (WHITE, ROOK))
+        self.assertEqual(position.castling_rights, 0)
+
+        for _ in range(6):
+            position.unmake_move()
+        self.assertEqual(position, start)
+        self.assertEqual(position.squares, start.squares)
+
+    def test_en_passant_square_is_only_set_when_a_pawn_can_capture(self):
+        # e2e4 with and without a black pawn on d4 to take it
+        for fen, en_passant_square in (("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1", NO_SQUARE),
+                                       ("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1", square_of(5, 4))):
+            position = Position.from_fen(fen)
+            position.make_move(encode_move(square_of(6, 4), square_of(4, 4), DOUBLE_PAWN_PUSH))
+            self.assertEqual(position.en_passant_square, en_passant_square)
+            self.assertEqual(position.zobrist_key, compute_key(position))
+        self.assertEqual(Position.from_fen("4k3/8/8/8/4P3/8/8/4K3 b - e3 0 1").en_passant_square, NO_SQUARE)
+
+    def test_null_move_passes_the_turn_and_is_undone(self):
+        position = Position()
+        position.put_piece(WHITE, KING, square_of(7, 4))
+        position.put_piece(WHITE, PAWN, square_of(6, 4))
+        position.put_piece(BLACK, KING, square_of(0, 4))
+        position.put_piece(BLACK, ROOK, square_of(0, 0))
+        position.make_move(encode_move(square_of(6, 4), square_of(4, 4), DOUBLE_PAWN_PUSH))
+        start = position.copy()
+
+        position.make_null_move()
+        self.assertEqual(position.side_to_move, WHITE)
+        self.assertEqual(position.en_passant_square, NO_SQUARE)
+        self.assertNotEqual(position.zobrist_key, start.zobrist_key)
+        position.unmake_null_move()
+
+        self.assertEqual(position, start)
+        self.assertEqual(position.zobrist_key, start.zobrist_key)
+        self.assertFalse(position.has_non_pawn_material(WHITE))
+        self.assertTrue(position.has_non_pawn_material(BLACK))
+
+    def test_pieces_are_slotted_and_keep_integer_codes(self):
+        pawn = Pawn(Color.BLACK, 1, 4)
+        self.assertFalse(hasattr(pawn, '__dict__'))
+        self.assertEqual((pawn.color_index, pawn.piece_index, pawn.square), (BLACK, PAWN, square_of(1, 4)))
+        pawn.color = Color.WHITE
+        self.assertEqual(pawn.color_index, WHITE)
+
+    def test_game_saver_restores_pieces_and_flags(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        game_saver = GameSaver()
+        game_saver.save_game(self.white_player, self.black_player)
+        pawn = self.white_player.get_piece_at(6, 4)
+        self.white_player.selected_piece = pawn
+        self.white_player.move_piece(4, 4)
+        pawn.is_en_passant = True
+        game_saver.save_game(self.black_player, self.white_player)
+
+        game_saver.load_previous_state(self.white_player, self.black_player)
+        self.assertIsNotNone(self.white_player.get_piece_at(6, 4))
+        game_saver.load_next_state(self.black_player, self.white_player)
+        restored_pawn = self.white_player.get_piece_at(4, 4)
+        self.assertTrue(restored_pawn.is_moved and restored_pawn.is_en_passant)
+        self.assertEqual(Position.from_players(self.black_player, self.white_player).bitboards,
+                         self.board.position.bitboards)
+
+    def test_piece_board_is_driven_from_position(self):
+        self.white_player.init_pieces()
+        self.black_player.init_pieces()
+        self.board.update_piece_board()
+        piece_board = self.board.get_piece_board()
+        self.assertEqual(piece_board[7][4], KING + 1)
+        self.assertEqual(piece_board[0][0], -(ROOK + 1))
+        self.assertEqual(piece_board[4][4], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import time
+import unittest
+from src.model.board import Board
+from src.model.engine.time_manager import TimeManager, MIN_MOVES_TO_GO, MOVE_OVERHEAD
+from src.model.enums.color import Color
+from src.model.players.alpha_beta_player import AlphaBeta
+from src.model.players.player import Player
+
+
+class TestTimeManager(unittest.TestCase):
+    def test_deadlines_follow_the_clock(self):
+        time_manager = TimeManager()
+        time_manager.start(None)
+        self.assertEqual(time_manager.hard_limit, float('inf'))
+        self.assertTrue(time_manager.can_start_iteration())
+
+        time_manager.start(600, moves_played=0)
+        early_soft_limit = time_manager.soft_limit
+        self.assertLess(early_soft_limit, time_manager.hard_limit)
+        self.assertLess(time_manager.hard_limit, 600)
+
+        time_manager.start(600, moves_played=100)
+        self.assertAlmostEqual(time_manager._soft_limit, (600 - MOVE_OVERHEAD) / MIN_MOVES_TO_GO)
+        time_manager.start(600, increment=10, moves_played=100)
+        self.assertGreater(time_manager._soft_limit, (600 - MOVE_OVERHEAD) / MIN_MOVES_TO_GO)
+
+    def test_stable_best_move_shrinks_the_soft_deadline(self):
+        time_manager = TimeManager()
+        time_manager.start(600)
+        time_manager.on_iteration_complete(1)
+        unstable_limit = time_manager.soft_limit
+        for _ in range(3):
+            time_manager.on_iteration_complete(1)
+        self.assertLess(time_manager.soft_limit, unstable_limit)
+        time_manager.on_iteration_complete(2)
+        self.assertEqual(time_manager.soft_limit, unstable_limit)
+
+    def test_soft_deadline_does_not_pass_the_hard_one(self):
+        # Little time left and a large increment, the scaled soft deadline would be later than the hard one
+        time_manager = TimeManager()
+        time_manager.start(5, increment=10)
+        self.assertLessEqual(time_manager.soft_limit, time_manager.hard_limit)
+        time_manager.start(600)
+        self.assertLess(time_manager.soft_limit, time_manager.hard_limit)
+
+    def test_timed_search_stops_at_the_hard_deadline(self):
+        board = Board()
+        white_player = AlphaBeta("White", Color.WHITE, board, 3)
+        black_player = Player("Black", Color.BLACK, board, None)
+        white_player.init_pieces()
+        black_player.init_pieces()
+        board.position.update_state(white_player, black_player)
+
+        start_time = time.perf_counter()
+        move = white_player.choose_move(black_player)
+
+        self.assertIsNotNone(move)
+        self.assertGreaterEqual(white_player.completed_depth, 1)
+        self.assertLess(white_player.completed_depth, white_player.max_depth)
+        self.assertLess(time.perf_counter() - start_time, white_player.time_manager.hard_limit + 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
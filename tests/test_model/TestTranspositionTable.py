@@ -0,0 +1,79 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+from src.model.engine.move import encode_move
+from src.model.engine.transposition_table import (TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND,
+                                                  BUCKET_BYTES, table_bytes)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(1)
+
+    def test_size_is_a_power_of_two_within_the_budget(self):
+        self.assertLessEqual(self.table.size_bytes, 1024 * 1024)
+        self.assertEqual(self.table.size_bytes, self.table.bucket_count * BUCKET_BYTES)
+        self.assertEqual(self.table.bucket_count & (self.table.bucket_count - 1), 0)
+
+    def test_store_and_probe(self):
+        move = encode_move(52, 36)
+        self.table.store(0x1234_5678_9ABC_DEF0, move, -99990, 5, UPPER_BOUND)
+        self.assertEqual(self.table.probe(0x1234_5678_9ABC_DEF0), (move, -99990, 5, UPPER_BOUND))
+        self.assertIsNone(self.table.probe(0x0FED_CBA9_8765_4321))
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))
+
+        # A search that found no move keeps the stored one
+        self.table.store(0x1234_5678_9ABC_DEF0, 0, 10, 6, LOWER_BOUND)
+        self.assertEqual(self.table.probe(0x1234_5678_9ABC_DEF0), (move, 10, 6, LOWER_BOUND))
+
+    def test_depth_preferred_and_always_replace_slots(self):
+        stride = self.table.bucket_count
+        deep, shallow, newer = 1 + stride, 1 + 2 * stride, 1 + 3 * stride
+        self.table.store(deep, encode_move(1, 2), 1, 8, EXACT)
+        self.table.store(shallow, encode_move(3, 4), 2, 2, EXACT)
+        self.table.store(newer, encode_move(5, 6), 3, 1, EXACT)
+        # The deep entry stays, the always-replace slot holds the latest shallow entry
+        self.assertIsNotNone(self.table.probe(deep))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertIsNotNone(self.table.probe(newer))
+        self.assertEqual(self.table.collisions, 1)
+
+        # Entries of an earlier search are replaced even if they are deeper
+        self.table.new_search()
+        self.table.store(shallow, encode_move(3, 4), 2, 2, EXACT)
+        self.assertIsNone(self.table.probe(deep))
+        self.assertIsNotNone(self.table.probe(shallow))
+
+    def test_clear(self):
+        self.table.store(42, encode_move(1, 2), 1, 1, EXACT)
+        self.assertGreater(self.table.usage(), 0)
+        self.table.clear()
+        self.assertIsNone(self.table.probe(42))
+        self.assertEqual(self.table.usage(), 0)
+
+    def test_tables_share_a_buffer_and_reject_torn_entries(self):
+        shared_memory = SharedMemory(create=True, size=table_bytes(1))
+        try:
+            writer = TranspositionTable(1, shared_memory.buf)
+            reader = TranspositionTable(1, shared_memory.buf)
+            # Both keys go to the first bucket
+            first, second = writer.bucket_count, 2 * writer.bucket_count
+            writer.store(first, encode_move(1, 2), 7, 3, EXACT)
+            writer.store(second, encode_move(3, 4), 8, 2, LOWER_BOUND)
+            self.assertEqual(reader.probe(first), (encode_move(1, 2), 7, 3, EXACT))
+
+            # The data word of the second entry under the key word of the first one, as a concurrent write can
+            # leave it
+            table = writer._table
+            table[1] = table[3]
+            self.assertIsNone(reader.probe(first))
+            self.assertEqual(reader.probe(second), (encode_move(3, 4), 8, 2, LOWER_BOUND))
+            writer.close()
+            reader.close()
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
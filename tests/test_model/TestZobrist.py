@@ -0,0 +1,79 @@
+import unittest
+from src.controller.game_saver import GameSaver
+from src.model.board import Board
+from src.model.engine.move import DOUBLE_PAWN_PUSH, encode_move
+from src.model.engine.move_generator import generate_legal_moves
+from src.model.engine.perft import PERFT_POSITIONS
+from src.model.engine.position import Position, START_FEN
+from src.model.engine.zobrist import compute_key
+from src.model.enums.color import Color
+from src.model.players.player import Player
+
+
+class TestZobrist(unittest.TestCase):
+    def test_incremental_key_matches_the_key_from_scratch(self):
+        # Two plies of every standard position cover castling, en passant and (capturing) promotions
+        for fen, _ in PERFT_POSITIONS.values():
+            position = Position.from_fen(fen)
+            start_key = position.zobrist_key
+            self.assertEqual(start_key, compute_key(position))
+            for move in generate_legal_moves(position):
+                position.make_move(move)
+                self.assertEqual(position.zobrist_key, compute_key(position))
+                for reply in generate_legal_moves(position):
+                    position.make_move(reply)
+                    self.assertEqual(position.zobrist_key, compute_key(position))
+                    position.unmake_move()
+                position.unmake_move()
+            self.assertEqual(position.zobrist_key, start_key)
+
+    def test_transpositions_share_a_key_and_the_state_is_part_of_it(self):
+        position = Position.from_fen(START_FEN)
+        start_key = position.zobrist_key
+        # g1f3 g8f6 f3g1 f6g8
+        for move in (encode_move(62, 45), encode_move(6, 21), encode_move(45, 62), encode_move(21, 6)):
+            position.make_move(move)
+        self.assertEqual(position.zobrist_key, start_key)
+
+        position.side_to_move ^= 1
+        self.assertNotEqual(position.zobrist_key, start_key)
+        position.side_to_move ^= 1
+        position.castling_rights = 0
+        self.assertNotEqual(position.zobrist_key, start_key)
+
+        # e2e4 can be taken en passant by the pawn on d4
+        with_en_passant = Position.from_fen("rnbqkbnr/ppp1pppp/8/8/3p4/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        with_en_passant.make_move(encode_move(52, 36, DOUBLE_PAWN_PUSH))
+        without_en_passant = Position.from_fen("rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")
+        self.assertNotEqual(with_en_passant.zobrist_key, without_en_passant.zobrist_key)
+        self.assertEqual(with_en_passant.zobrist_key, compute_key(with_en_passant))
+
+        # An en passant square no pawn can use is not part of the key
+        no_capture = Position.from_fen(START_FEN)
+        no_capture.make_move(encode_move(52, 36, DOUBLE_PAWN_PUSH))
+        self.assertEqual(no_capture.zobrist_key,
+                         Position.from_fen("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").zobrist_key)
+
+    def test_game_saver_detects_threefold_repetition(self):
+        board = Board()
+        white_player = Player("White", Color.WHITE, board, None)
+        black_player = Player("Black", Color.BLACK, board, None)
+        white_player.init_pieces()
+        black_player.init_pieces()
+        game_saver = GameSaver()
+        game_saver.save_game(white_player, black_player)
+
+        current_player, opponent = white_player, black_player
+        # Both knights go out and back twice, the start position occurs for the third time
+        for from_square, to_square in ((62, 45), (6, 21), (45, 62), (21, 6)) * 2:
+            self.assertFalse(game_saver.is_threefold_repetition)
+            current_player.selected_piece = current_player.get_piece_at(from_square >> 3, from_square & 7)
+            current_player.move_piece(to_square >> 3, to_square & 7)
+            current_player.last_move = encode_move(from_square, to_square)
+            current_player, opponent = opponent, current_player
+            game_saver.save_game(current_player, opponent)
+        self.assertTrue(game_saver.is_threefold_repetition)
+
+
+if __name__ == '__main__':
+    unittest.main()